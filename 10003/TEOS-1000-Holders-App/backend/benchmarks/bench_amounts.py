@@ -0,0 +1,183 @@
+"""Compare FLOAT and integer base-unit storage for SOL/TEOS amounts.
+
+Builds one SQLite database per mode from the same generated rows. In
+``float`` the amounts are stored in SOL/TEOS as REAL, which is the old
+schema. In ``integer`` they are stored as lamports and TEOS base units. The
+benchmark times the aggregation queries behind reconciliation, bulk
+delete, contribution trends and holder distribution. Runs of the two modes
+are interleaved to spread out machine noise. It also reports:
+
+- table size, from the dbstat virtual table
+- the error of each float SUM against the exact decimal total
+
+Contribution SOL amounts carry nine decimals and holder balances two, so
+float sums drift the way they do with real transfer amounts.
+
+Usage:
+    python benchmarks/bench_amounts.py --rows 200000
+    python benchmarks/bench_amounts.py --rows 1000000 --repeats 5
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.amounts import LAMPORTS_PER_SOL, TEOS_BASE_UNITS
+from datetime import datetime, timedelta
+from decimal import Decimal
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+INSERT_CHUNK = 50000
+MODES = ('float', 'integer')
+BALANCE_RANGES = ((0, 1000), (1000, 5000), (5000, 10000), (10000, 50000), (50000, 100000), (100000, None))
+
+QUERIES = {
+    # reconcile.aggregate_contributions / bulk_delete._aggregate
+    'contribution_totals': (
+        'SELECT COUNT(id), COALESCE(SUM(verified), 0), COALESCE(SUM(sol_amount), 0), '
+        'COALESCE(SUM(teos_amount), 0) FROM contributions'
+    ),
+    # analytics.get_contribution_trends
+    'daily_trends': (
+        'SELECT DATE(created_at), COUNT(id), SUM(sol_amount), SUM(teos_amount) FROM contributions '
+        'GROUP BY DATE(created_at) ORDER BY 1'
+    ),
+    'holder_balance_sum': 'SELECT SUM(teos_balance) FROM holders',
+}
+
+
+def generate_rows(rows, seed):
+    """Return (contributions, holders) as exact integer base units"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    contributions, holders = [], []
+    for i in range(rows):
+        created = (start + timedelta(seconds=rng.randrange(90 * 86400))).strftime('%Y-%m-%d %H:%M:%S.000000')
+        sol = rng.randrange(1, 100 * LAMPORTS_PER_SOL)
+        contributions.append((sol, 10000 * TEOS_BASE_UNITS, rng.random() < 0.8, created))
+        cents = int(min(100 * rng.paretovariate(1.16), 1_000_000) * 100)
+        holders.append((cents * (TEOS_BASE_UNITS // 100), rng.random() < 0.7))
+    return contributions, holders
+
+
+def build(path, mode, contributions, holders):
+    amount_type = 'FLOAT' if mode == 'float' else 'BIGINT'
+    if mode == 'float':
+        sol_of, teos_of = (lambda v: v / LAMPORTS_PER_SOL), (lambda v: v / TEOS_BASE_UNITS)
+    else:
+        sol_of = teos_of = int
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute(f'CREATE TABLE contributions (id INTEGER PRIMARY KEY, sol_amount {amount_type} NOT NULL, '
+                 f'teos_amount {amount_type} NOT NULL, verified BOOLEAN, created_at DATETIME)')
+    conn.execute(f'CREATE TABLE holders (id INTEGER PRIMARY KEY, teos_balance {amount_type} NOT NULL, '
+                 'verified BOOLEAN)')
+    for offset in range(0, len(contributions), INSERT_CHUNK):
+        conn.executemany(
+            'INSERT INTO contributions (sol_amount, teos_amount, verified, created_at) VALUES (?, ?, ?, ?)',
+            ((sol_of(sol), teos_of(teos), verified, created)
+             for sol, teos, verified, created in contributions[offset:offset + INSERT_CHUNK])
+        )
+        conn.executemany(
+            'INSERT INTO holders (teos_balance, verified) VALUES (?, ?)',
+            ((teos_of(balance), verified) for balance, verified in holders[offset:offset + INSERT_CHUNK])
+        )
+        conn.commit()
+    sizes = dict(conn.execute(
+        "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN ('contributions', 'holders') GROUP BY name"
+    ).fetchall())
+    conn.close()
+    return {'contributions_bytes': sizes.get('contributions', 0), 'holders_bytes': sizes.get('holders', 0)}
+
+
+def distribution_queries(mode):
+    """The six holder-distribution range counts, with bounds in the mode's units"""
+    scale = 1 if mode == 'float' else TEOS_BASE_UNITS
+    statements = []
+    for low, high in BALANCE_RANGES:
+        if high is None:
+            statements.append((f'SELECT COUNT(id) FROM holders WHERE teos_balance >= ? AND verified = 1',
+                               (low * scale,)))
+        else:
+            statements.append(('SELECT COUNT(id) FROM holders WHERE teos_balance >= ? AND teos_balance < ? '
+                               'AND verified = 1', (low * scale, high * scale)))
+    return statements
+
+
+def time_queries(conn, mode):
+    timings = {}
+    for name, sql in QUERIES.items():
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        timings[name] = time.perf_counter() - start
+    start = time.perf_counter()
+    for sql, params in distribution_queries(mode):
+        conn.execute(sql, params).fetchall()
+    timings['holder_distribution'] = time.perf_counter() - start
+    return timings
+
+
+def sum_errors(conn, contributions, holders):
+    """Absolute error of each float SUM against the exact total, in base units"""
+    exact_sol = sum(sol for sol, _, _, _ in contributions)
+    exact_balance = sum(balance for balance, _ in holders)
+    float_sol, = conn.execute('SELECT SUM(sol_amount) FROM contributions').fetchone()
+    float_balance, = conn.execute('SELECT SUM(teos_balance) FROM holders').fetchone()
+    return {
+        'sol_sum_error_lamports': int(abs(Decimal(repr(float_sol)) * LAMPORTS_PER_SOL - exact_sol)),
+        'teos_balance_sum_error_units': int(abs(Decimal(repr(float_balance)) * TEOS_BASE_UNITS - exact_balance))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FLOAT vs integer amount storage')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=46)
+    args = parser.parse_args()
+
+    contributions, holders = generate_rows(args.rows, args.seed)
+    with tempfile.TemporaryDirectory(prefix='teos_amounts_') as workdir:
+        paths = {mode: os.path.join(workdir, f'{mode}.db') for mode in MODES}
+        sizes = {mode: build(paths[mode], mode, contributions, holders) for mode in MODES}
+        conns = {mode: sqlite3.connect(paths[mode]) for mode in MODES}
+        for mode in MODES:
+            time_queries(conns[mode], mode)  # warm the page cache
+
+        samples = {mode: [] for mode in MODES}
+        for _ in range(args.repeats):
+            for mode in MODES:
+                samples[mode].append(time_queries(conns[mode], mode))
+        errors = sum_errors(conns['float'], contributions, holders)
+        for conn in conns.values():
+            conn.close()
+
+    results = {}
+    for mode in MODES:
+        medians = {name: statistics.median(run[name] for run in samples[mode]) * 1000 for name in samples[mode][0]}
+        results[mode] = {
+            'query_ms': {name: round(value, 2) for name, value in medians.items()},
+            'total_ms': round(sum(medians.values()), 2),
+            **sizes[mode]
+        }
+    print(json.dumps({
+        'rows': args.rows,
+        'repeats': args.repeats,
+        'results': results,
+        'speedup': {
+            name: round(results['float']['query_ms'][name] / results['integer']['query_ms'][name], 2)
+            for name in results['float']['query_ms']
+        },
+        'float_sum_errors': errors
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Compare SQLite and PostgreSQL throughput as client concurrency grows.
+
+For each backend the script boots ``src/main.py`` through the load test's
+server runner and seeds it the same way. It then runs the closed-loop load
+test at every ``--concurrency`` level for every ``--mix``. SQLite is a
+temporary file in WAL mode. PostgreSQL is started locally with
+``benchmarks/local_postgres.py`` unless ``--postgres-url`` names a scratch
+database to use instead; that database's tables are dropped.
+
+The ``write`` mix is where SQLite's single writer shows: contributions,
+verifications and sign-ups queue on one lock, so throughput stops growing
+with concurrency while latency climbs. A per-level table goes to stderr and
+the full results to stdout as JSON.
+
+Usage:
+    python benchmarks/bench_backends.py --concurrency 1,4,16 --mix write,mixed
+    PG_BIN=/usr/lib/postgresql/16/bin python benchmarks/bench_backends.py --duration 20
+    python benchmarks/bench_backends.py --backends postgresql --postgres-url postgresql://localhost/teos_bench
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest import Workload, start_server, run_closed, summarize
+from benchmarks.local_postgres import LocalPostgres
+from tools.mock_solana_rpc import MockSolanaRpcServer
+import contextlib
+import argparse
+import tempfile
+import shutil
+import json
+import time
+
+BACKENDS = ('sqlite', 'postgresql')
+
+
+def csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+@contextlib.contextmanager
+def database_url(backend, postgres_url):
+    """Yield the DATABASE_URL for a backend; None lets the load test use its temporary SQLite file"""
+    if backend == 'sqlite':
+        yield None
+    elif postgres_url:
+        yield postgres_url
+    else:
+        with LocalPostgres() as url:
+            yield url
+
+
+def sweep(backend, args, rpc_url):
+    workdir = tempfile.mkdtemp(prefix=f'teos_backends_{backend}_')
+    results = {}
+    try:
+        with database_url(backend, args.postgres_url) as url:
+            process, base_url = start_server(args.rows, args.seed, rpc_url, workdir, url)
+            try:
+                for mix in args.mix:
+                    workload = Workload(args.rows, mix, args.seed)
+                    for concurrency in args.concurrency:
+                        recorder, _ = run_closed(base_url, workload, concurrency, args.warmup,
+                                                 args.duration, args.seed, args.timeout)
+                        summary = summarize(recorder.samples, args.duration)
+                        results.setdefault(mix, {})[concurrency] = summary
+                        print(f"{backend:<11} {mix:<7} c={concurrency:<4} {summary['throughput_rps']:>9,.1f} rps  "
+                              f"p50 {summary['latency_ms']['p50']:>8.2f} ms  p95 {summary['latency_ms']['p95']:>8.2f} ms  "
+                              f"errors {summary['errors']}", file=sys.stderr)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def scaling(results):
+    """Throughput at each level relative to the lowest concurrency level"""
+    ratios = {}
+    for mix, levels in results.items():
+        lowest = levels[min(levels)]['throughput_rps']
+        ratios[mix] = {level: round(summary['throughput_rps'] / lowest, 2) if lowest else None
+                       for level, summary in levels.items()}
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQLite vs PostgreSQL under concurrent load')
+    parser.add_argument('--backends', type=csv_list, default=list(BACKENDS))
+    parser.add_argument('--concurrency', type=lambda v: [int(c) for c in csv_list(v)], default=[1, 4, 16])
+    parser.add_argument('--mix', type=csv_list, default=['write', 'mixed'])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--rows', type=int, default=20000, help='Seeded contributions and holders')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--rpc-latency-ms', type=float, default=20.0)
+    parser.add_argument('--postgres-url', help='Scratch PostgreSQL database instead of starting a local server')
+    args = parser.parse_args()
+    unknown = set(args.backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(sorted(unknown))}")
+
+    rpc = MockSolanaRpcServer(latency_ms=args.rpc_latency_ms).start()
+    try:
+        results = {backend: sweep(backend, args, rpc.url) for backend in args.backends}
+    finally:
+        rpc.stop()
+
+    print(json.dumps({
+        'config': {
+            'concurrency': args.concurrency, 'mix': args.mix, 'duration_seconds': args.duration,
+            'warmup_seconds': args.warmup, 'rows': args.rows, 'seed': args.seed,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'results': results,
+        'scaling': {backend: scaling(backend_results) for backend, backend_results in results.items()}
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark online backup throughput and its impact on write latency.
+
+Creates a scratch SQLite database of --size-mb, then measures single-row
+commit latency of a concurrent writer with no backup running and while an
+online backup copies the database with the given step size.
+
+Usage:
+    python benchmarks/bench_backup.py --size-mb 2048 --pages-per-step 1024 --step-pause 0.005
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.backup import online_backup, integrity_check, gzip_file
+import argparse
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+
+ROW_BYTES = 4000
+
+
+def build(path, size_mb):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('CREATE TABLE filler (id INTEGER PRIMARY KEY, payload BLOB)')
+    conn.execute('CREATE TABLE writes (id INTEGER PRIMARY KEY, created REAL)')
+    rows = size_mb * 1024 * 1024 // ROW_BYTES
+    payload = os.urandom(ROW_BYTES)
+    for offset in range(0, rows, 10000):
+        conn.executemany('INSERT INTO filler (payload) VALUES (?)',
+                         ((payload,) for _ in range(min(10000, rows - offset))))
+        conn.commit()
+    conn.close()
+
+
+def write_latencies(path, stop, results):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode = WAL')
+    while not stop.is_set():
+        start = time.perf_counter()
+        conn.execute('INSERT INTO writes (created) VALUES (?)', (time.time(),))
+        conn.commit()
+        results.append(time.perf_counter() - start)
+        time.sleep(0.001)
+    conn.close()
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+
+    def pct(p):
+        return round(samples[min(int(len(samples) * p), len(samples) - 1)] * 1000, 3)
+
+    return {'writes': len(samples), 'p50_ms': pct(0.5), 'p99_ms': pct(0.99), 'max_ms': pct(1.0)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the online backup engine')
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--pages-per-step', type=int, default=1024)
+    parser.add_argument('--step-pause', type=float, default=0.005)
+    parser.add_argument('--baseline-seconds', type=float, default=3.0)
+    parser.add_argument('--compress', action='store_true')
+    parser.add_argument('--dir', default=None, help='Scratch directory (default: system temp)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        source = os.path.join(tmp, 'source.db')
+        build(source, args.size_mb)
+        size = os.path.getsize(source)
+
+        stop, baseline = threading.Event(), []
+        writer = threading.Thread(target=write_latencies, args=(source, stop, baseline))
+        writer.start()
+        time.sleep(args.baseline_seconds)
+        stop.set()
+        writer.join()
+
+        stop, during = threading.Event(), []
+        writer = threading.Thread(target=write_latencies, args=(source, stop, during))
+        writer.start()
+        started = time.perf_counter()
+        dest = os.path.join(tmp, 'backup.db')
+        online_backup(source, dest, args.pages_per_step, args.step_pause)
+        backup_seconds = time.perf_counter() - started
+        stop.set()
+        writer.join()
+
+        verify_started = time.perf_counter()
+        problems = integrity_check(dest)
+        verify_seconds = time.perf_counter() - verify_started
+
+        report = {
+            'database_mb': round(size / 1024 / 1024, 1),
+            'pages_per_step': args.pages_per_step,
+            'step_pause': args.step_pause,
+            'backup_seconds': round(backup_seconds, 2),
+            'backup_mb_per_second': round(size / 1024 / 1024 / backup_seconds, 1),
+            'integrity_check_seconds': round(verify_seconds, 2),
+            'integrity': 'ok' if not problems else problems[:5],
+            'write_latency_idle': summarize(baseline),
+            'write_latency_during_backup': summarize(during)
+        }
+        if args.compress:
+            compress_started = time.perf_counter()
+            gzip_file(dest, dest + '.gz')
+            report['compress_seconds'] = round(time.perf_counter() - compress_started, 2)
+            report['compressed_mb'] = round(os.path.getsize(dest + '.gz') / 1024 / 1024, 1)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
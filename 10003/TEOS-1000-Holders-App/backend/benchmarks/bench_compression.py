@@ -0,0 +1,237 @@
+"""Response sizes and costs with compression, and static serving from the manifest.
+
+``api`` seeds a temporary SQLite database with ``--rows`` contributions and
+holders. It then requests list endpoints, the dashboard and the full
+export through the Flask test client, once per encoding (identity, gzip,
+br, zstd), and reports body bytes and median request time. For the
+streamed export it also reports time to first byte, and the peak Python
+memory allocated while the body is produced next to what building the
+whole document at once allocates.
+
+``static`` builds a Vite-like static folder: an index page, a hashed
+``--bundle-kb`` JavaScript bundle and a stylesheet. It precompresses the
+folder with ``tools/precompress_static.py`` and compares the manifest with
+the previous ``send_from_directory`` handler: time per request, and the
+``os.stat``/``os.path.exists`` calls each one makes.
+
+A summary goes to stderr and the full results to stdout as JSON.
+
+Usage:
+    python benchmarks/bench_compression.py --rows 20000
+    python benchmarks/bench_compression.py --only static --requests 2000
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.compression import available_encodings
+import statistics
+import tracemalloc
+import argparse
+import tempfile
+import shutil
+import random
+import json
+import time
+
+API_PATHS = {
+    'contributions_page': '/api/contributions?page=1&per_page=100',
+    'holders_page': '/api/holders?page=1&per_page=100',
+    'dashboard': '/api/analytics/dashboard',
+    'export': '/api/analytics/export/contributions',
+}
+STATIC_PATHS = {
+    'index': '/',
+    'bundle': '/assets/index-Bx3f1kQa.js',
+    'stylesheet': '/assets/index-C9d2eF1z.css',
+}
+
+
+def timed_requests(client, path, headers, requests):
+    times = []
+    body = b''
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        body = response.get_data()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), response, body
+
+
+def bench_api(args, workdir):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    from src.main import create_app
+    from src.models.schema import ensure_schema
+    from benchmarks.loadtest import seed_database
+
+    app = create_app({'COMPRESSION_MIN_SIZE': args.min_size})
+    with app.app_context():
+        ensure_schema()
+        seed_database(args.rows, args.seed)
+    client = app.test_client()
+
+    results = {}
+    for name, path in API_PATHS.items():
+        requests = 3 if name == 'export' else args.requests
+        for encoding in ('identity',) + available_encodings():
+            median_ms, response, body = timed_requests(client, path, {'Accept-Encoding': encoding}, requests)
+            results.setdefault(name, {})[encoding] = {
+                'bytes': len(body), 'median_ms': round(median_ms, 3),
+                'content_encoding': response.headers.get('Content-Encoding')
+            }
+        identity = results[name]['identity']['bytes']
+        for summary in results[name].values():
+            summary['ratio'] = round(identity / summary['bytes'], 2) if summary['bytes'] else None
+
+    streaming = {}
+    for encoding in ('identity', 'gzip'):
+        started = time.perf_counter()
+        response = client.get(API_PATHS['export'], headers={'Accept-Encoding': encoding}, buffered=False)
+        chunks = iter(response.response)
+        first = next(chunks)
+        first_byte_ms = (time.perf_counter() - started) * 1000
+        total = len(first) + sum(len(chunk) for chunk in chunks)
+        total_ms = (time.perf_counter() - started) * 1000
+        response.close()
+        tracemalloc.start()
+        client.get(API_PATHS['export'], headers={'Accept-Encoding': encoding}).close()
+        streaming[encoding] = {
+            'first_byte_ms': round(first_byte_ms, 3),
+            'total_ms': round(total_ms, 3),
+            'bytes': total,
+            'peak_python_mib': round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        }
+        tracemalloc.stop()
+
+    # What the export held in memory when it built the whole document before sending it
+    with app.test_request_context():
+        from flask import jsonify
+        from src.models.contribution import Contribution
+
+        tracemalloc.start()
+        contributions = Contribution.query.order_by(Contribution.created_at.desc()).all()
+        jsonify({'success': True, 'data': [contrib.to_dict() for contrib in contributions], 'format': 'json',
+                 'total_records': len(contributions)})
+        streaming['buffered_reference'] = {'peak_python_mib': round(tracemalloc.get_traced_memory()[1] / 2**20, 2)}
+        tracemalloc.stop()
+    return {'endpoints': results, 'export_streaming': streaming}
+
+
+def build_static(root, bundle_kb, seed):
+    """A Vite-shaped build: index.html plus content-hashed bundles under assets/"""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, 'assets'))
+    names = [f'{rng.choice("abcdefghij")}{rng.randrange(10**6)}' for _ in range(200)]
+    lines, size = [], 0
+    while size < bundle_kb * 1024:
+        line = f'function {rng.choice(names)}(e,t){{return e.{rng.choice(names)}(t,{rng.randrange(1000)})}}\n'
+        lines.append(line)
+        size += len(line)
+    with open(os.path.join(root, 'assets', 'index-Bx3f1kQa.js'), 'w') as f:
+        f.write(''.join(lines))
+    with open(os.path.join(root, 'assets', 'index-C9d2eF1z.css'), 'w') as f:
+        f.write(''.join(f'.c{i}{{margin:{i % 16}px;color:#{rng.randrange(16**6):06x}}}\n' for i in range(3000)))
+    with open(os.path.join(root, 'index.html'), 'w') as f:
+        f.write('<!doctype html><html lang="en"><head><meta charset="UTF-8"><title>TEOS</title>'
+                '<script type="module" src="/assets/index-Bx3f1kQa.js"></script>'
+                '<link rel="stylesheet" href="/assets/index-C9d2eF1z.css"></head>'
+                '<body><div id="root"></div></body></html>\n' * 4)
+
+
+def legacy_serve(path):
+    """The handler before the manifest: two filesystem checks per request"""
+    from flask import current_app, send_from_directory
+
+    static_folder_path = current_app.static_folder
+    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+        return send_from_directory(static_folder_path, path)
+    return send_from_directory(static_folder_path, 'index.html')
+
+
+def static_app(root, handler, manifest):
+    from flask import Flask
+    from src.services.static_assets import init_static_manifest
+
+    app = Flask(__name__, static_folder=root, static_url_path='/_static')
+    app.add_url_rule('/', 'serve', handler, defaults={'path': ''})
+    app.add_url_rule('/<path:path>', 'serve', handler)
+    if manifest:
+        init_static_manifest(app)
+    return app
+
+
+def bench_static(args, workdir):
+    from src.main import serve
+    from tools.precompress_static import precompress
+
+    root = os.path.join(workdir, 'static')
+    build_static(root, args.bundle_kb, args.seed)
+    precompress_started = time.perf_counter()
+    precompress(root, available_encodings())
+    precompress_seconds = time.perf_counter() - precompress_started
+
+    results = {}
+    for mode, handler in (('legacy', legacy_serve), ('manifest', serve)):
+        client = static_app(root, handler, mode == 'manifest').test_client()
+        for name, path in STATIC_PATHS.items():
+            for accept in ('identity', 'gzip, deflate, br, zstd'):
+                counted = []
+                real_stat, real_exists = os.stat, os.path.exists
+                os.stat = lambda *a, **k: (counted.append(1), real_stat(*a, **k))[1]
+                os.path.exists = lambda p: (counted.append(1), real_exists(p))[1]
+                try:
+                    client.get(path, headers={'Accept-Encoding': accept})
+                    stat_calls = len(counted)
+                finally:
+                    os.stat, os.path.exists = real_stat, real_exists
+                median_ms, response, body = timed_requests(client, path, {'Accept-Encoding': accept}, args.requests)
+                results.setdefault(mode, {}).setdefault(name, {})['compressed' if accept != 'identity' else 'identity'] = {
+                    'bytes': len(body), 'median_ms': round(median_ms, 3), 'stat_calls': stat_calls,
+                    'content_encoding': response.headers.get('Content-Encoding'),
+                    'cache_control': response.headers.get('Cache-Control')
+                }
+    return {'precompress_seconds': round(precompress_seconds, 3), 'serving': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark response compression and static serving')
+    parser.add_argument('--only', choices=('api', 'static'))
+    parser.add_argument('--rows', type=int, default=20000, help='Seeded contributions and holders')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and encoding')
+    parser.add_argument('--min-size', type=int, default=1024)
+    parser.add_argument('--bundle-kb', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='teos_compression_')
+    results = {}
+    try:
+        if args.only in (None, 'api'):
+            results['api'] = bench_api(args, workdir)
+        if args.only in (None, 'static'):
+            results['static'] = bench_static(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, encodings in results.get('api', {}).get('endpoints', {}).items():
+        print(f"{name:<19} " + '  '.join(f"{encoding} {summary['bytes']:>9,} B {summary['median_ms']:>8.2f} ms"
+                                          for encoding, summary in encodings.items()), file=sys.stderr)
+    for mode, assets in results.get('static', {}).get('serving', {}).items():
+        for name, variants in assets.items():
+            print(f"{mode:<8} {name:<10} " + '  '.join(
+                f"{variant} {summary['bytes']:>8,} B {summary['median_ms']:>6.3f} ms {summary['stat_calls']} stats"
+                for variant, summary in variants.items()), file=sys.stderr)
+
+    print(json.dumps({
+        'config': {
+            'rows': args.rows, 'requests': args.requests, 'min_size': args.min_size, 'bundle_kb': args.bundle_kb,
+            'encodings': list(available_encodings()),
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Throughput benchmark for the on-chain eligibility engine.
+
+Runs the engine against the local mock RPC server with artificial latency and
+reports wallets verified per second for each concurrency level.
+
+Usage:
+    python benchmarks/bench_eligibility.py --wallets 5000 --latency-ms 80
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.eligibility import EligibilityEngine
+from src.services.solana_rpc import SolanaRpcClient
+from src.models.types import b58encode
+from tools.mock_solana_rpc import MockSolanaRpcServer
+import argparse
+import hashlib
+import json
+import time
+
+
+def synthetic_address(i):
+    return b58encode(hashlib.sha256(str(i).encode()).digest())
+
+
+def run(server_url, wallets, concurrency, batch_size):
+    engine = EligibilityEngine(
+        SolanaRpcClient(server_url, pool_size=concurrency),
+        max_concurrency=concurrency, batch_size=batch_size, max_queue=len(wallets)
+    )
+    start = time.perf_counter()
+    futures = [engine.submit(address) for address in wallets]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the eligibility engine')
+    parser.add_argument('--wallets', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    wallets = [synthetic_address(i) for i in range(args.wallets)]
+    results = []
+    with MockSolanaRpcServer(latency_ms=args.latency_ms) as server:
+        for concurrency in args.concurrency:
+            elapsed = run(server.url, wallets, concurrency, args.batch_size)
+            results.append({
+                'concurrency': concurrency,
+                'batch_size': args.batch_size,
+                'wallets': args.wallets,
+                'seconds': round(elapsed, 3),
+                'wallets_per_second': round(args.wallets / elapsed, 1)
+            })
+        results.append({'http_requests': server.http_requests, 'rpc_calls': server.rpc_calls})
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Measure per-request logging overhead: synchronous stream handler vs queue handler.
+
+"before" mirrors the old basicConfig setup (a StreamHandler writing on the
+request thread); "after" is configure_logging() (QueueHandler on the request
+thread, stream + ring buffer on a listener thread). Output goes to a
+temporary file; --sink-latency-us adds a delay to every write to model a
+stderr pipe under backpressure (container log drivers, journald), which is
+where the synchronous handler stalls request threads.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 100000 --sink-latency-us 0
+    python benchmarks/bench_logging.py --sink-latency-us 50
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+import argparse
+import json
+import logging
+import tempfile
+import time
+
+
+class SlowSink:
+    """File wrapper whose writes take at least ``latency`` seconds"""
+
+    def __init__(self, raw, latency):
+        self.raw = raw
+        self.latency = latency
+
+    def write(self, data):
+        if self.latency:
+            deadline = time.perf_counter() + self.latency
+            while time.perf_counter() < deadline:
+                time.sleep(0)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def time_calls(logger, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        logger.info(f"Contribution processed for wallet {i}")
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def time_requests(requests):
+    app = Flask(__name__)
+    route_logger = logging.getLogger('bench.route')
+
+    @app.route('/ping')
+    def ping():
+        route_logger.info("Ping handled")
+        return 'ok'
+
+    client = app.test_client()
+    for _ in range(200):
+        client.get('/ping')
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/ping')
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark logging overhead')
+    parser.add_argument('--calls', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--sink-latency-us', type=float, default=0)
+    args = parser.parse_args()
+
+    logger = logging.getLogger('bench')
+    report = {'sink_latency_us': args.sink_latency_us}
+    with tempfile.TemporaryFile('w') as raw:
+        sink = SlowSink(raw, args.sink_latency_us / 1e6)
+        # Before: one synchronous StreamHandler on the root logger
+        reset_root()
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().setLevel(logging.INFO)
+        report['before'] = {
+            'log_call_us': round(time_calls(logger, args.calls), 2),
+            'request_us': round(time_requests(args.requests), 2)
+        }
+
+        # After: queue handler with a listener thread feeding stream + ring buffer
+        reset_root()
+        from src.services import log_buffer
+        sys.stderr, real_stderr = sink, sys.stderr
+        try:
+            log_buffer.configure_logging()
+            report['after'] = {
+                'log_call_us': round(time_calls(logger, args.calls), 2),
+                'request_us': round(time_requests(args.requests), 2)
+            }
+        finally:
+            log_buffer.shutdown_logging()
+            sys.stderr = real_stderr
+
+    report['log_call_speedup'] = round(report['before']['log_call_us'] / report['after']['log_call_us'], 2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Contribution latency under growing analytics load, with and without read routing.
+
+Boots ``src/main.py`` through the load test's server runner twice: once with
+``READ_ROUTING_ENABLED=false``, where every query shares the primary
+engine, and once with read-only routes on the read engine. At every
+``--analytics`` level, ``--contribute-rate`` contributions per second
+arrive as a Poisson stream. At the same time that many closed-loop clients
+hammer the ``analytics`` mix: dashboard, trends, distribution, listings
+and search. Contribution latency counts from the scheduled arrival, so
+waiting for a connection or the write lock is included.
+
+With routing, analytics requests hold connections from the read engine's
+pool, and the contribution path keeps the primary's pool to itself. A
+per-level table goes to stderr and the full results to stdout as JSON.
+
+Usage:
+    python benchmarks/bench_read_routing.py --analytics 0,4,16,32
+    python benchmarks/bench_read_routing.py --database-url postgresql://localhost/teos_bench \\
+        --read-url postgresql://replica/teos_bench
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest import Workload, start_server, run_closed, run_open, summarize
+from tools.mock_solana_rpc import MockSolanaRpcServer
+import threading
+import argparse
+import tempfile
+import shutil
+import json
+import time
+
+MODES = ('shared', 'routed')
+
+
+def measure_level(base_url, args, analytics_clients):
+    """Run the contribution stream alongside ``analytics_clients`` analytics clients"""
+    results = {}
+
+    def contributions():
+        recorder, extra = run_open(base_url, Workload(args.rows, 'contribute', args.seed), args.contribute_clients,
+                                   args.warmup, args.duration, args.seed, args.timeout, args.contribute_rate)
+        results['contribute'] = dict(summarize(recorder.samples, args.duration), **extra)
+
+    def analytics():
+        recorder, _ = run_closed(base_url, Workload(args.rows, 'analytics', args.seed), analytics_clients,
+                                 args.warmup, args.duration, args.seed + 1, args.timeout)
+        results['analytics'] = summarize(recorder.samples, args.duration)
+
+    threads = [threading.Thread(target=contributions)]
+    if analytics_clients:
+        threads.append(threading.Thread(target=analytics))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def sweep(mode, args, rpc_url):
+    workdir = tempfile.mkdtemp(prefix=f'teos_routing_{mode}_')
+    extra_env = {'READ_ROUTING_ENABLED': 'true' if mode == 'routed' else 'false'}
+    if args.read_url:
+        extra_env['DATABASE_READ_URL'] = args.read_url
+    levels = {}
+    try:
+        process, base_url = start_server(args.rows, args.seed, rpc_url, workdir, args.database_url, extra_env)
+        try:
+            for level in args.analytics:
+                levels[level] = result = measure_level(base_url, args, level)
+                contribute = result['contribute']
+                analytics_rps = result['analytics']['throughput_rps'] if level else 0.0
+                print(f"{mode:<7} analytics={level:<4} contribute p50 {contribute['latency_ms']['p50']:>8.2f} ms  "
+                      f"p95 {contribute['latency_ms']['p95']:>8.2f} ms  errors {contribute['errors']:<3} "
+                      f"analytics {analytics_rps:>7,.1f} rps", file=sys.stderr)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark contribution latency under analytics load')
+    parser.add_argument('--analytics', type=lambda v: [int(c) for c in v.split(',')], default=[0, 4, 16, 32],
+                        help='Comma-separated numbers of concurrent analytics clients')
+    parser.add_argument('--contribute-rate', type=float, default=5.0, help='Contribution arrivals per second')
+    parser.add_argument('--contribute-clients', type=int, default=4)
+    parser.add_argument('--modes', type=lambda v: v.split(','), default=list(MODES))
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--rows', type=int, default=20000, help='Seeded contributions and holders')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--database-url', help='Scratch database; its tables are dropped (default: temporary SQLite)')
+    parser.add_argument('--read-url', help='Read engine URL (default: mode=ro on the SQLite file)')
+    args = parser.parse_args()
+
+    rpc = MockSolanaRpcServer().start()
+    try:
+        results = {mode: sweep(mode, args, rpc.url) for mode in args.modes}
+    finally:
+        rpc.stop()
+
+    print(json.dumps({
+        'config': {
+            'analytics': args.analytics, 'contribute_rate': args.contribute_rate,
+            'contribute_clients': args.contribute_clients, 'duration_seconds': args.duration,
+            'warmup_seconds': args.warmup, 'rows': args.rows, 'seed': args.seed,
+            'database': 'postgresql' if args.database_url else 'sqlite',
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
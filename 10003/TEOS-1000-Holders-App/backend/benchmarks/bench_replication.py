@@ -0,0 +1,247 @@
+"""Replica lag and convergence with the primary and a replica as two local processes.
+
+Boots ``src/main.py`` with CHANGE_FEED_ENABLED=true through the load
+test's server runner, then starts ``tools/replicate.py`` against it with a
+fresh SQLite copy. Once the copy is seeded, ``--rate`` writes per second
+(the ``write`` mix: contributions, verifications, sign-ups) arrive as a
+Poisson stream for ``--duration`` seconds. Every ``--sample-interval``
+seconds the script compares the replica's ``teos_replica_last_applied_seq``
+with the newest change in the primary's file, and records its
+``teos_replica_lag_seconds`` gauge. With ``--restart-at`` the
+replica is stopped with SIGTERM that many seconds into the run and
+started again, which shows it resumes from its stored cursor without
+re-seeding.
+
+After the load the script waits for the replica to catch up and compares
+every replicated table in both files row by row. It also measures what
+the capture triggers cost the write path, by running the same write load
+with CHANGE_FEED_ENABLED=false. A summary goes to stderr and the full
+results to stdout as JSON.
+
+Usage:
+    python benchmarks/bench_replication.py --rate 50 --duration 20
+    python benchmarks/bench_replication.py --rate 100 --restart-at 10 --interval 0.5
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest import Workload, start_server, run_open, summarize, percentile
+from benchmarks.local_postgres import free_port
+from tools.mock_solana_rpc import MockSolanaRpcServer
+from urllib.request import urlopen
+import subprocess
+import threading
+import argparse
+import tempfile
+import sqlite3
+import shutil
+import json
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLICATED_TABLES = ('contributions', 'holders', 'pool_stats')
+
+
+class ReplicaProcess:
+    """``tools/replicate.py`` running as a child process with its metrics on a local port"""
+
+    def __init__(self, primary_url, db_path, interval, log_path):
+        self.command = [sys.executable, os.path.join(BACKEND_DIR, 'tools', 'replicate.py'),
+                        '--primary', primary_url, '--db', db_path, '--interval', str(interval)]
+        self.log_path = log_path
+        self.process = None
+        self.metrics_url = None
+
+    def start(self):
+        port = free_port()
+        self.metrics_url = f'http://127.0.0.1:{port}/metrics'
+        with open(self.log_path, 'a') as log:
+            self.process = subprocess.Popen(self.command + ['--metrics-port', str(port)],
+                                            stdout=subprocess.DEVNULL, stderr=log)
+        return self
+
+    def metrics(self):
+        """teos_replica_* gauge values, or None while the metrics server is not up"""
+        try:
+            text = urlopen(self.metrics_url, timeout=2).read().decode()
+        except OSError:
+            return None
+        values = {}
+        for line in text.splitlines():
+            if line.startswith('teos_replica_'):
+                name, _, value = line.partition(' ')
+                values[name[len('teos_replica_'):]] = float(value)
+        return values
+
+    def wait_applied(self, seq, timeout):
+        """Seconds until the replica has applied change ``seq``, or None on timeout.
+
+        The lag gauges compare with the head seen at the replica's last poll,
+        so waiting for a known sequence number is what proves it caught up.
+        """
+        started = time.perf_counter()
+        while time.perf_counter() - started < timeout:
+            values = self.metrics()
+            if values and values['last_applied_seq'] >= seq:
+                return time.perf_counter() - started
+            time.sleep(0.05)
+        return None
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+def head_seq(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute('SELECT COALESCE(MAX(id), 0) FROM change_log').fetchone()[0]
+
+
+def table_rows(path):
+    with sqlite3.connect(path) as conn:
+        return {table: conn.execute(f'SELECT * FROM {table} ORDER BY id').fetchall() for table in REPLICATED_TABLES}
+
+
+def compare(primary_path, replica_path):
+    primary, replica = table_rows(primary_path), table_rows(replica_path)
+    return {table: {'primary_rows': len(primary[table]), 'replica_rows': len(replica[table]),
+                    'identical': primary[table] == replica[table]} for table in REPLICATED_TABLES}
+
+
+def distribution(values):
+    values = sorted(v for v in values if v == v)
+    if not values:
+        return None
+    return {'p50': round(percentile(values, 0.5), 3), 'p95': round(percentile(values, 0.95), 3),
+            'p99': round(percentile(values, 0.99), 3), 'max': round(values[-1], 3)}
+
+
+def write_load(base_url, args):
+    recorder, extra = run_open(base_url, Workload(args.rows, 'write', args.seed), args.clients,
+                               0, args.duration, args.seed, args.timeout, args.rate)
+    return dict(summarize(recorder.samples, args.duration), **extra)
+
+
+def replicate(args, rpc_url):
+    workdir = tempfile.mkdtemp(prefix='teos_replication_')
+    try:
+        process, base_url = start_server(args.rows, args.seed, rpc_url, workdir,
+                                         extra_env={'CHANGE_FEED_ENABLED': 'true'})
+        primary_path = os.path.join(workdir, 'loadtest.db')
+        replica = ReplicaProcess(base_url, os.path.join(workdir, 'replica.db'), args.interval,
+                                 os.path.join(workdir, 'replica.log'))
+        try:
+            seed_started = time.perf_counter()
+            replica.start()
+            seeded = replica.wait_applied(head_seq(primary_path), args.timeout)
+            seed_seconds = round(time.perf_counter() - seed_started, 3) if seeded is not None else None
+
+            samples = []
+            load = {}
+            loader = threading.Thread(target=lambda: load.update(write_load(base_url, args)))
+            started = time.perf_counter()
+            loader.start()
+            restarted = False
+            while loader.is_alive():
+                if args.restart_at is not None and not restarted and time.perf_counter() - started >= args.restart_at:
+                    replica.stop()
+                    replica.start()
+                    restarted = True
+                values = replica.metrics()
+                if values:
+                    # Changes actually behind the primary right now, not as of the replica's last poll
+                    values['behind'] = max(head_seq(primary_path) - values['last_applied_seq'], 0)
+                    samples.append(values)
+                time.sleep(args.sample_interval)
+            loader.join()
+
+            catch_up_seconds = replica.wait_applied(head_seq(primary_path), args.timeout)
+            final = replica.metrics() or {}
+            replica.stop()
+            convergence = compare(primary_path, os.path.join(workdir, 'replica.db'))
+        finally:
+            if replica.process and replica.process.poll() is None:
+                replica.stop()
+            process.terminate()
+            process.wait(timeout=10)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'seed_seconds': seed_seconds,
+        'write_load': load,
+        'lag_changes': distribution(s['behind'] for s in samples),
+        'lag_seconds': distribution(s['lag_seconds'] for s in samples),
+        'catch_up_seconds': round(catch_up_seconds, 3) if catch_up_seconds is not None else None,
+        # After a restart these count the second process only; snapshots stays 0 when it resumed
+        'final_metrics': final,
+        'restarted': args.restart_at is not None,
+        'convergence': convergence,
+        'converged': all(table['identical'] for table in convergence.values())
+    }
+
+
+def capture_overhead(args, rpc_url):
+    """Write-load latency with the capture triggers off and on"""
+    results = {}
+    for enabled in ('false', 'true'):
+        workdir = tempfile.mkdtemp(prefix='teos_capture_')
+        try:
+            process, base_url = start_server(args.rows, args.seed, rpc_url, workdir,
+                                             extra_env={'CHANGE_FEED_ENABLED': enabled})
+            try:
+                results['on' if enabled == 'true' else 'off'] = write_load(base_url, args)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark change-feed replica lag and convergence')
+    parser.add_argument('--rate', type=float, default=50.0, help='Write requests per second')
+    parser.add_argument('--clients', type=int, default=8, help='Connections serving the write stream')
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--interval', type=float, default=1.0, help="Replica's poll interval once caught up")
+    parser.add_argument('--sample-interval', type=float, default=0.25)
+    parser.add_argument('--restart-at', type=float, help='Restart the replica this many seconds into the load')
+    parser.add_argument('--rows', type=int, default=20000, help='Seeded contributions and holders')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--skip-overhead', action='store_true', help='Skip the trigger overhead comparison')
+    args = parser.parse_args()
+
+    rpc = MockSolanaRpcServer().start()
+    try:
+        results = {'replication': replicate(args, rpc.url)}
+        if not args.skip_overhead:
+            results['capture_overhead'] = capture_overhead(args, rpc.url)
+    finally:
+        rpc.stop()
+
+    replication = results['replication']
+    lag_changes, lag_seconds = replication['lag_changes'] or {}, replication['lag_seconds'] or {}
+    print(f"seeded {args.rows:,} rows in {replication['seed_seconds']} s; "
+          f"lag p50 {lag_changes.get('p50')} / p99 {lag_changes.get('p99')} / max {lag_changes.get('max')} changes, "
+          f"p99 {lag_seconds.get('p99')} s; caught up {replication['catch_up_seconds']} s after load; "
+          f"converged {replication['converged']}", file=sys.stderr)
+    for mode, summary in results.get('capture_overhead', {}).items():
+        print(f"capture {mode:<3} writes {summary['throughput_rps']:>7,.1f} rps  p50 {summary['latency_ms']['p50']:>7.2f} ms  "
+              f"p95 {summary['latency_ms']['p95']:>7.2f} ms  errors {summary['errors']}", file=sys.stderr)
+
+    print(json.dumps({
+        'config': {
+            'rate': args.rate, 'clients': args.clients, 'duration_seconds': args.duration,
+            'interval_seconds': args.interval, 'restart_at': args.restart_at, 'rows': args.rows,
+            'seed': args.seed, 'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Measure cold start: import, ``create_app()`` and the first request.
+
+Every sample is a fresh interpreter, so nothing is cached in
+``sys.modules``. Each child reports four phases:
+
+- ``framework_ms``: importing Flask, Flask-SQLAlchemy and SQLAlchemy, which
+  the app cannot avoid
+- ``import_ms``: ``import src.main``
+- ``create_app_ms``: ``create_app()``
+- ``first_request_ms``: ``GET /api/pool/stats`` through the test client,
+  which opens the first database connection
+
+``startup_ms`` is everything the application owns: import, factory and
+first request. The exit status is 1 when its median exceeds ``--budget-ms``,
+so the script can gate CI. The schema is created once before sampling,
+the way ``flask init-db`` would.
+
+Usage:
+    python benchmarks/bench_startup.py --samples 10
+    python benchmarks/bench_startup.py --budget-ms 150
+"""
+import time
+_T0 = time.perf_counter()
+
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+
+PHASES = ('framework_ms', 'import_ms', 'create_app_ms', 'first_request_ms', 'startup_ms', 'process_ms')
+
+
+def probe():
+    """Child process: time each startup phase and print them as JSON"""
+    marks = [_T0]
+    import flask
+    import flask_sqlalchemy
+    import sqlalchemy
+    marks.append(time.perf_counter())
+    from src.main import create_app
+    marks.append(time.perf_counter())
+    app = create_app()
+    marks.append(time.perf_counter())
+    response = app.test_client().get('/api/pool/stats')
+    marks.append(time.perf_counter())
+    if response.status_code != 200:
+        raise SystemExit(f"First request failed with {response.status_code}: {response.get_data(as_text=True)}")
+
+    framework, imported, created, first = (
+        (marks[i + 1] - marks[i]) * 1000 for i in range(4)
+    )
+    print(json.dumps({
+        'framework_ms': framework,
+        'import_ms': imported,
+        'create_app_ms': created,
+        'first_request_ms': first,
+        'startup_ms': (marks[4] - marks[1]) * 1000
+    }))
+
+
+def prepare(database_url):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    subprocess.run(
+        [sys.executable, '-c', 'from src.main import create_app\n'
+         'from src.models.schema import ensure_schema\n'
+         'with create_app().app_context():\n    ensure_schema()'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env, check=True,
+        stderr=subprocess.DEVNULL
+    )
+    return env
+
+
+def sample(env):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--probe'],
+        env=env, capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    phases['process_ms'] = elapsed
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark application cold start')
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='Maximum median startup_ms (import + create_app + first request)')
+    parser.add_argument('--probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe()
+        return
+
+    with tempfile.TemporaryDirectory(prefix='teos_startup_') as workdir:
+        env = prepare(f"sqlite:///{os.path.join(workdir, 'startup.db')}")
+        samples = [sample(env) for _ in range(args.samples)]
+
+    summary = {
+        phase: {
+            'median': round(statistics.median(s[phase] for s in samples), 2),
+            'min': round(min(s[phase] for s in samples), 2),
+            'max': round(max(s[phase] for s in samples), 2)
+        }
+        for phase in PHASES
+    }
+    within_budget = summary['startup_ms']['median'] <= args.budget_ms
+    print(json.dumps({
+        'samples': args.samples,
+        'budget_ms': args.budget_ms,
+        'within_budget': within_budget,
+        'phases': summary
+    }, indent=2))
+    if not within_budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Compare base58 text and 32-byte BLOB wallet address storage.
+
+Builds one SQLite database per mode with the same random addresses and
+reports table and unique-index size (from the dbstat virtual table), the
+share of the index that fits in a page cache of --cache-mb (a proxy for the
+buffer-cache hit rate of uniformly random lookups) and point-lookup latency.
+Blob lookups include the base58 decode done at the serialization edge.
+
+Usage:
+    python benchmarks/bench_wallet_storage.py --rows 1000000
+    python benchmarks/bench_wallet_storage.py --rows 10000000 --cache-mb 64
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.types import b58encode, decode_address
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+PAGE_SIZE = 4096
+INSERT_CHUNK = 50000
+
+
+def build(path, mode, keys):
+    column_type = 'BLOB' if mode == 'blob' else 'VARCHAR(44)'
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA page_size = {PAGE_SIZE}')
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute(f'CREATE TABLE holders (id INTEGER PRIMARY KEY, wallet_address {column_type} NOT NULL UNIQUE, '
+                 'teos_balance FLOAT NOT NULL)')
+    for offset in range(0, len(keys), INSERT_CHUNK):
+        chunk = keys[offset:offset + INSERT_CHUNK]
+        conn.executemany(
+            'INSERT INTO holders (wallet_address, teos_balance) VALUES (?, ?)',
+            ((key if mode == 'blob' else b58encode(key), 1000.0) for key in chunk)
+        )
+        conn.commit()
+    sizes = dict(conn.execute(
+        "SELECT CASE WHEN name LIKE 'sqlite_autoindex%' THEN 'index' ELSE name END, SUM(pgsize) "
+        "FROM dbstat WHERE name IN ('holders') OR name LIKE 'sqlite_autoindex_holders%' GROUP BY 1"
+    ).fetchall())
+    conn.close()
+    return {
+        'file_bytes': os.path.getsize(path),
+        'table_bytes': sizes.get('holders', 0),
+        'index_bytes': sizes.get('index', 0)
+    }
+
+
+def lookups(path, mode, probes, cache_mb):
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA cache_size = -{cache_mb * 1024}')
+    timings = []
+    for address in probes:
+        start = time.perf_counter()
+        key = decode_address(address) if mode == 'blob' else address
+        row = conn.execute('SELECT id, teos_balance FROM holders WHERE wallet_address = ?', (key,)).fetchone()
+        timings.append(time.perf_counter() - start)
+        assert row is not None
+    conn.close()
+    timings.sort()
+
+    def pct(p):
+        return round(timings[min(int(len(timings) * p), len(timings) - 1)] * 1e6, 2)
+
+    return {'p50_us': pct(0.50), 'p95_us': pct(0.95), 'p99_us': pct(0.99),
+            'mean_us': round(statistics.fmean(timings) * 1e6, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark wallet address storage modes')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--probes', type=int, default=20000)
+    parser.add_argument('--cache-mb', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dir', default=None, help='Scratch directory (default: system temp)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = [rng.getrandbits(256).to_bytes(32, 'big') for _ in range(args.rows)]
+    probes = [b58encode(keys[rng.randrange(args.rows)]) for _ in range(args.probes)]
+
+    report = {'rows': args.rows, 'cache_mb': args.cache_mb, 'modes': {}}
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for mode in ('text', 'blob'):
+            path = os.path.join(tmp, f'{mode}.db')
+            started = time.perf_counter()
+            sizes = build(path, mode, keys)
+            build_seconds = time.perf_counter() - started
+            cache_bytes = args.cache_mb * 1024 * 1024
+            report['modes'][mode] = {
+                **sizes,
+                'index_bytes_per_row': round(sizes['index_bytes'] / args.rows, 1),
+                'index_cache_coverage': round(min(1.0, cache_bytes / max(sizes['index_bytes'], 1)), 3),
+                'build_seconds': round(build_seconds, 1),
+                'lookup': lookups(path, mode, probes, args.cache_mb)
+            }
+            os.remove(path)
+
+    text, blob = report['modes']['text'], report['modes']['blob']
+    report['index_size_ratio'] = round(blob['index_bytes'] / text['index_bytes'], 3)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Start a throwaway PostgreSQL server for benchmarks.
+
+Runs ``initdb`` into a temporary directory and starts the server on a free
+127.0.0.1 port with an empty ``teos`` database. Everything is removed on
+exit. The server binaries are found through ``PG_BIN``, then
+``pg_config --bindir``, then ``PATH``. PostgreSQL refuses to run as root,
+so under root the server runs as ``PG_USER`` (default: postgres, or nobody
+if that account doesn't exist).
+
+``synchronous_commit`` is off by default so commits are as durable as
+SQLite's WAL with synchronous=NORMAL: safe across application crashes,
+but the last transactions can be lost on power failure. Pass
+``--setting synchronous_commit=on`` to measure full durability.
+
+Usage:
+    python benchmarks/local_postgres.py        # prints the URL; stops on Ctrl-C or SIGTERM
+    python benchmarks/loadtest.py run --database-url postgresql://postgres@127.0.0.1:PORT/teos
+"""
+import argparse
+import os
+import pwd
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+
+DATABASE_NAME = 'teos'
+SUPERUSER = 'postgres'
+DEFAULT_SETTINGS = {'synchronous_commit': 'off'}
+
+
+def find_bindir():
+    """Directory holding initdb and pg_ctl, or raise RuntimeError"""
+    candidates = [os.environ.get('PG_BIN')]
+    pg_config = shutil.which('pg_config')
+    if pg_config:
+        candidates.append(subprocess.run([pg_config, '--bindir'], capture_output=True, text=True).stdout.strip())
+    initdb = shutil.which('initdb')
+    if initdb:
+        candidates.append(os.path.dirname(initdb))
+    for bindir in candidates:
+        if bindir and os.path.isfile(os.path.join(bindir, 'initdb')) and os.path.isfile(os.path.join(bindir, 'pg_ctl')):
+            return bindir
+    raise RuntimeError('PostgreSQL server binaries not found; set PG_BIN to the directory holding initdb and pg_ctl')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class LocalPostgres:
+    """Context manager yielding the URL of a fresh local PostgreSQL database"""
+
+    def __init__(self, settings=None, bindir=None):
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        self.bindir = bindir or find_bindir()
+        self.workdir = None
+        self.port = None
+        self.run_as = None
+
+    def _run(self, program, *args):
+        command = [os.path.join(self.bindir, program), *args]
+        if self.run_as:
+            command = ['runuser', '-u', self.run_as, '--', *command]
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    @property
+    def url(self):
+        return f'postgresql://{SUPERUSER}@127.0.0.1:{self.port}/{DATABASE_NAME}'
+
+    def start(self):
+        self.workdir = tempfile.mkdtemp(prefix='teos_postgres_')
+        data_dir = os.path.join(self.workdir, 'data')
+        if os.geteuid() == 0:
+            self.run_as = os.environ.get('PG_USER') or ('postgres' if _user_exists('postgres') else 'nobody')
+            account = pwd.getpwnam(self.run_as)
+            os.chown(self.workdir, account.pw_uid, account.pw_gid)
+        self.port = free_port()
+        options = ' '.join([f'-p {self.port}', '-h 127.0.0.1', f'-k {self.workdir}'] +
+                           [f'-c {name}={value}' for name, value in self.settings.items()])
+        try:
+            self._run('initdb', '-D', data_dir, '-U', SUPERUSER, '-A', 'trust', '-E', 'UTF8', '--no-sync')
+            self._run('pg_ctl', '-D', data_dir, '-o', options, '-l', os.path.join(self.workdir, 'server.log'),
+                      '-w', 'start')
+            self._run('createdb', '-h', '127.0.0.1', '-p', str(self.port), '-U', SUPERUSER, DATABASE_NAME)
+        except subprocess.CalledProcessError as e:
+            self.stop()
+            raise RuntimeError(f'PostgreSQL failed to start: {e.stderr.decode().strip()}')
+        return self
+
+    def stop(self):
+        if self.workdir is None:
+            return
+        data_dir = os.path.join(self.workdir, 'data')
+        if os.path.exists(os.path.join(data_dir, 'postmaster.pid')):
+            self._run('pg_ctl', '-D', data_dir, '-m', 'fast', '-w', 'stop')
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        self.workdir = None
+
+    def __enter__(self):
+        self.start()
+        return self.url
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _user_exists(name):
+    try:
+        pwd.getpwnam(name)
+        return True
+    except KeyError:
+        return False
+
+
+def parse_settings(values):
+    settings = {}
+    for value in values:
+        name, _, setting = value.partition('=')
+        settings[name] = setting
+    return settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a throwaway local PostgreSQL server')
+    parser.add_argument('--setting', action='append', default=[], metavar='NAME=VALUE',
+                        help='Server setting, e.g. synchronous_commit=on (repeatable)')
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with LocalPostgres(parse_settings(args.setting)) as url:
+        print(url, flush=True)
+        try:
+            signal.pause()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
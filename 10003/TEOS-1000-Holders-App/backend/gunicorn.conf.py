@@ -0,0 +1,84 @@
+"""Gunicorn settings for running the API in production.
+
+The app is built once in the master by ``create_app()`` and forked into ``workers``
+processes, each serving requests on ``threads`` threads (gthread worker).
+With SQLite in WAL mode every worker reads concurrently while writers take
+turns on the database lock, so a few processes with several threads each
+beat many single-threaded processes. Background services started by the
+factory (the confirmation worker and scheduled reconciliation) stay in the
+master, so they run once no matter how many workers there are. The schema
+is not created on startup; run ``flask --app src.main init-db`` first.
+
+``kill -HUP <master pid>`` starts fresh workers and lets the old ones
+finish their in-flight requests within ``graceful_timeout``. Because the
+app is preloaded, new code needs a full restart (or ``USR2`` followed by
+``WINCH``/``QUIT`` on the old master). Every setting can be overridden from
+the environment.
+
+Usage:
+    cd backend && flask --app src.main init-db && gunicorn -c gunicorn.conf.py
+    GUNICORN_WORKERS=4 GUNICORN_THREADS=16 gunicorn -c gunicorn.conf.py
+"""
+import os
+import shutil
+
+wsgi_app = 'src.main:create_app()'
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', str(max(os.cpu_count() or 1, 2))))
+# gevent also works (pip install gevent), but SQLite calls block its event loop
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# Build the app once before forking
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+backlog = int(os.environ.get('GUNICORN_BACKLOG', '2048'))
+
+# Recycle workers after this many requests (0 disables); background jobs
+# running in a recycled worker are cancelled and recorded as such
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+proc_name = 'teos-api'
+
+
+def on_starting(server):
+    # Stale files from a previous run would be merged into the new metrics
+    multiprocess_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiprocess_dir and os.path.isdir(multiprocess_dir):
+        for name in os.listdir(multiprocess_dir):
+            path = os.path.join(multiprocess_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+
+def post_fork(server, worker):
+    # SQLite connections must not cross fork(); give the worker its own pool
+    from src.models.user import db
+
+    with server.app.wsgi().app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Record running jobs as cancelled rather than leaving them for recovery
+    runner = server.app.wsgi().extensions.get('job_runner')
+    if runner is not None:
+        runner.shutdown(wait=True)
+
+
+def child_exit(server, worker):
+    from src.services.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
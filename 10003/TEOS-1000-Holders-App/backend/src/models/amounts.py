@@ -0,0 +1,58 @@
+from decimal import Decimal, InvalidOperation
+
+# SOL has 9 decimals (lamports); the TEOS mint also has 9, as in lib.rs where
+# 10,000 TEOS is transferred as 10_000_000_000 base units
+LAMPORTS_PER_SOL = 1_000_000_000
+TEOS_BASE_UNITS = 1_000_000_000
+
+# Amount columns are signed 64-bit integers
+MAX_BASE_UNITS = 2 ** 63 - 1
+
+
+def _to_base_units(value, scale, name):
+    """Parse a decimal amount exactly into integer base units.
+
+    Accepts numbers and numeric strings. Raises ValueError for non-numeric
+    input, for more precision than one base unit, and for values outside
+    the 64-bit column range.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f'Invalid {name} amount: {value!r}')
+    try:
+        # str() first so a JSON float like 0.1 is read as written, not as its binary expansion
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f'Invalid {name} amount: {value!r}')
+    if not amount.is_finite():
+        raise ValueError(f'Invalid {name} amount: {value!r}')
+    units = amount * scale
+    if units != units.to_integral_value():
+        raise ValueError(f'{name} amount {value} is more precise than one base unit')
+    units = int(units)
+    if abs(units) > MAX_BASE_UNITS:
+        raise ValueError(f'{name} amount {value} is out of range')
+    return units
+
+
+def sol_to_lamports(value):
+    """Convert an API SOL amount to integer lamports"""
+    return _to_base_units(value, LAMPORTS_PER_SOL, 'SOL')
+
+
+def teos_to_base_units(value):
+    """Convert an API TEOS amount to integer base units"""
+    return _to_base_units(value, TEOS_BASE_UNITS, 'TEOS')
+
+
+def lamports_to_sol(lamports):
+    """Convert stored lamports to a SOL number for API responses; None stays None"""
+    if lamports is None:
+        return None
+    return int(lamports) / LAMPORTS_PER_SOL
+
+
+def base_units_to_teos(units):
+    """Convert stored TEOS base units to a TEOS number for API responses; None stays None"""
+    if units is None:
+        return None
+    return int(units) / TEOS_BASE_UNITS
@@ -0,0 +1,86 @@
+from src.models.user import db
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables whose inserts, updates and deletes are recorded for replicas
+REPLICATED_TABLES = ('contributions', 'holders', 'pool_stats')
+OPERATIONS = ('insert', 'update', 'delete')
+
+class ChangeLog(db.Model):
+    """Outbox of row changes to replicated tables, written by database triggers.
+
+    ``id`` is the feed sequence number. SQLite allows one writer at a time,
+    so ids are handed out in commit order and a reader that has seen id N
+    has seen every change committed before it. AUTOINCREMENT keeps ids from
+    being reused after old entries are pruned.
+    """
+    __tablename__ = 'change_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(32), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    # insert, update or delete
+    operation = db.Column(db.String(6), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_change_log_created_at', 'created_at'),
+        {'sqlite_autoincrement': True},
+    )
+
+
+def _trigger_name(table, operation):
+    return f'change_log_{table}_{operation}'
+
+
+def change_capture_statements():
+    """Return the CREATE TRIGGER statements for every replicated table and operation"""
+    statements = []
+    for table in REPLICATED_TABLES:
+        for operation in OPERATIONS:
+            row = 'OLD' if operation == 'delete' else 'NEW'
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, operation)} "
+                f"AFTER {operation.upper()} ON {table} BEGIN "
+                f"INSERT INTO change_log (table_name, row_id, operation, created_at) "
+                f"VALUES ('{table}', {row}.id, '{operation}', strftime('%Y-%m-%d %H:%M:%f', 'now')); "
+                f"END"
+            )
+    return statements
+
+
+def has_change_capture(conn):
+    """True when any change capture trigger exists; ``conn`` is a sqlite3 connection"""
+    names = {_trigger_name(table, operation) for table in REPLICATED_TABLES for operation in OPERATIONS}
+    return any(name in names for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'"))
+
+
+def install_change_capture(engine):
+    """Create the triggers that record replicated-table changes in change_log.
+
+    Triggers run inside the writing transaction, so ORM writes, Core bulk
+    statements and manual SQL are all captured and a change is logged if
+    and only if it commits. Only SQLite is supported: on PostgreSQL,
+    concurrent transactions can commit out of sequence order, and its own
+    streaming replication is the better tool there. Returns False when
+    nothing was installed.
+    """
+    if engine.dialect.name != 'sqlite':
+        logger.error(f"Change capture requires SQLite; not installed on {engine.dialect.name}")
+        return False
+    with engine.begin() as conn:
+        for statement in change_capture_statements():
+            conn.exec_driver_sql(statement)
+    return True
+
+
+def remove_change_capture(engine):
+    """Drop the change capture triggers; the change_log table and its entries are kept"""
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.begin() as conn:
+        for table in REPLICATED_TABLES:
+            for operation in OPERATIONS:
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {_trigger_name(table, operation)}")
@@ -1,39 +1,82 @@
 from src.models.user import db
+from src.models.types import WalletAddress
+from src.models.amounts import lamports_to_sol, base_units_to_teos
 from datetime import datetime
 
 class Contribution(db.Model):
     __tablename__ = 'contributions'
     
     id = db.Column(db.Integer, primary_key=True)
-    wallet_address = db.Column(db.String(44), nullable=False, unique=True)
-    sol_amount = db.Column(db.Float, nullable=False)
-    teos_amount = db.Column(db.Float, nullable=False)
+    wallet_address = db.Column(WalletAddress(), nullable=False, unique=True)
+    # Amounts are integer base units (lamports, TEOS base units); to_dict converts them
+    sol_amount = db.Column(db.BigInteger, nullable=False)
+    teos_amount = db.Column(db.BigInteger, nullable=False)
     transaction_hash = db.Column(db.String(88), nullable=True)
     verified = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # One contribution per on-chain transaction; NULL hashes are left out of the index.
+    # Other databases also treat NULLs as distinct in a unique index, and naming
+    # another dialect's options here would import that dialect on every startup
+    __table_args__ = (
+        db.Index(
+            'uq_contributions_transaction_hash', 'transaction_hash', unique=True,
+            sqlite_where=db.text('transaction_hash IS NOT NULL')
+        ),
+        # Let reconciliation and trend queries read only recently changed rows
+        db.Index('ix_contributions_created_at', 'created_at'),
+        db.Index('ix_contributions_updated_at', 'updated_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'wallet_address': self.wallet_address,
-            'sol_amount': self.sol_amount,
-            'teos_amount': self.teos_amount,
+            'sol_amount': lamports_to_sol(self.sol_amount),
+            'teos_amount': base_units_to_teos(self.teos_amount),
             'transaction_hash': self.transaction_hash,
             'verified': self.verified,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class ContributionFailure(db.Model):
+    """Contribution whose transaction the confirmation worker gave up on.
+
+    Keyed by contribution id and signature together, so a reused id or a
+    corrected transaction_hash is checked again.
+    """
+    __tablename__ = 'contribution_failures'
+
+    contribution_id = db.Column(db.Integer, primary_key=True)
+    transaction_hash = db.Column(db.String(88), primary_key=True)
+    # failed: the transaction failed on-chain; timed_out: not confirmed within the attempt limit
+    reason = db.Column(db.String(20), nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'contribution_id': self.contribution_id,
+            'transaction_hash': self.transaction_hash,
+            'reason': self.reason,
+            'error': self.error,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
 class PoolStats(db.Model):
     __tablename__ = 'pool_stats'
     
     id = db.Column(db.Integer, primary_key=True)
     total_contributors = db.Column(db.Integer, default=0)
     verified_contributors = db.Column(db.Integer, default=0)
-    total_sol_contributed = db.Column(db.Float, default=0.0)
-    total_sol_locked = db.Column(db.Float, default=0.0)
-    total_teos_distributed = db.Column(db.Float, default=0.0)
+    # Lamports and TEOS base units
+    total_sol_contributed = db.Column(db.BigInteger, default=0)
+    total_sol_locked = db.Column(db.BigInteger, default=0)
+    total_teos_distributed = db.Column(db.BigInteger, default=0)
     trading_unlocked = db.Column(db.Boolean, default=False)
     sol_unlocked = db.Column(db.Boolean, default=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -43,9 +86,9 @@ class PoolStats(db.Model):
             'id': self.id,
             'total_contributors': self.total_contributors,
             'verified_contributors': self.verified_contributors,
-            'total_sol_contributed': self.total_sol_contributed,
-            'total_sol_locked': self.total_sol_locked,
-            'total_teos_distributed': self.total_teos_distributed,
+            'total_sol_contributed': lamports_to_sol(self.total_sol_contributed),
+            'total_sol_locked': lamports_to_sol(self.total_sol_locked),
+            'total_teos_distributed': base_units_to_teos(self.total_teos_distributed),
             'trading_unlocked': self.trading_unlocked,
             'sol_unlocked': self.sol_unlocked,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -55,8 +98,9 @@ class Holder(db.Model):
     __tablename__ = 'holders'
     
     id = db.Column(db.Integer, primary_key=True)
-    wallet_address = db.Column(db.String(44), nullable=False, unique=True)
-    teos_balance = db.Column(db.Float, nullable=False, default=0.0)
+    wallet_address = db.Column(WalletAddress(), nullable=False, unique=True)
+    # TEOS base units
+    teos_balance = db.Column(db.BigInteger, nullable=False, default=0)
     verified = db.Column(db.Boolean, default=False)
     verification_method = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -66,7 +110,7 @@ class Holder(db.Model):
         return {
             'id': self.id,
             'wallet_address': self.wallet_address,
-            'teos_balance': self.teos_balance,
+            'teos_balance': base_units_to_teos(self.teos_balance),
             'verified': self.verified,
             'verification_method': self.verification_method,
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -0,0 +1,45 @@
+from sqlalchemy import Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Dialects whose INSERT construct supports on_conflict_do_update()
+UPSERT_DIALECTS = ('sqlite', 'postgresql')
+
+
+def upsert_insert(dialect_name):
+    """Return the INSERT construct with ``on_conflict_do_update`` for a dialect.
+
+    SQLite and PostgreSQL share the ``ON CONFLICT ... DO UPDATE`` syntax and
+    the ``excluded`` pseudo-table, so callers build the same statement for
+    both. The PostgreSQL module is only imported when it is used.
+    """
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise ValueError(f'Upserts are supported on {", ".join(UPSERT_DIALECTS)}, not {dialect_name}')
+    return insert
+
+
+class day_bucket(FunctionElement):
+    """Calendar day of a DateTime column, for GROUP BY day.
+
+    SQLite stores DateTime as text, and ``CAST(... AS DATE)`` there yields
+    a number. So SQLite uses ``DATE()``, which returns a 'YYYY-MM-DD'
+    string, and other databases cast to a real date.
+    """
+
+    type = Date()
+    inherit_cache = True
+    name = 'day_bucket'
+
+
+@compiles(day_bucket)
+def _day_bucket_default(element, compiler, **kw):
+    return f'CAST({compiler.process(element.clauses, **kw)} AS DATE)'
+
+
+@compiles(day_bucket, 'sqlite')
+def _day_bucket_sqlite(element, compiler, **kw):
+    return f'DATE({compiler.process(element.clauses, **kw)})'
@@ -0,0 +1,114 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from urllib.parse import quote
+import weakref
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_MODE = 'WAL'
+DEFAULT_SYNCHRONOUS = 'NORMAL'
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+# Read-only routes share a small pool, so only this many of them query at once
+DEFAULT_READ_POOL_SIZE = 2
+DEFAULT_READ_MAX_OVERFLOW = 0
+
+_configured = weakref.WeakSet()
+
+
+def configure_sqlite(engine, journal_mode=DEFAULT_JOURNAL_MODE, synchronous=DEFAULT_SYNCHRONOUS,
+                     busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS, query_only=False):
+    """Apply journal, sync and lock-wait PRAGMAs to every new SQLite connection.
+
+    WAL lets readers in every worker process run alongside the single
+    writer, synchronous=NORMAL stays durable across application crashes in
+    WAL mode, and the busy timeout makes a writer wait for the lock instead
+    of failing with "database is locked". ``query_only`` rejects writes on
+    the connection. Other dialects are left untouched.
+    """
+    if engine.dialect.name != 'sqlite' or engine in _configured:
+        return
+    _configured.add(engine)
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'PRAGMA busy_timeout = {int(busy_timeout_ms)}')
+            if journal_mode:
+                cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+            if synchronous:
+                cursor.execute(f'PRAGMA synchronous = {synchronous}')
+            if query_only:
+                cursor.execute('PRAGMA query_only = ON')
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+    # Connections opened before the listener was attached don't have the settings
+    engine.dispose()
+
+    if journal_mode and engine.url.database not in (None, '', ':memory:'):
+        with engine.connect() as conn:
+            mode = conn.exec_driver_sql('PRAGMA journal_mode').scalar()
+        if mode.lower() != journal_mode.lower():
+            logger.error(f"SQLite journal_mode is {mode}, expected {journal_mode}")
+
+
+def normalize_database_url(url):
+    """Accept the ``postgres://`` scheme many hosts hand out; SQLAlchemy only knows ``postgresql://``"""
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def pool_options(url, pool_size=DEFAULT_POOL_SIZE, max_overflow=DEFAULT_MAX_OVERFLOW,
+                 pool_timeout=DEFAULT_POOL_TIMEOUT, pool_recycle=DEFAULT_POOL_RECYCLE):
+    """Return SQLALCHEMY_ENGINE_OPTIONS for a server database; SQLite keeps SQLAlchemy's defaults.
+
+    Each process holds up to ``pool_size + max_overflow`` connections, so
+    size the server's max_connections for workers x threads. Connections
+    are checked before use and recycled after ``pool_recycle`` seconds,
+    which survives server restarts and idle timeouts in proxies.
+    """
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': True,
+    }
+
+
+def readonly_sqlite_url(url):
+    """Return a ``mode=ro`` URL for the same SQLite file, or None for in-memory and non-SQLite URLs"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != 'sqlite' or parsed.database in (None, '', ':memory:') or parsed.query.get('uri'):
+        return None
+    return f'sqlite:///file:{quote(parsed.database)}?mode=ro&uri=true'
+
+
+def read_bind_options(url, pool_size=DEFAULT_READ_POOL_SIZE, max_overflow=DEFAULT_READ_MAX_OVERFLOW,
+                      pool_timeout=DEFAULT_POOL_TIMEOUT, pool_recycle=DEFAULT_POOL_RECYCLE):
+    """Return the SQLALCHEMY_BINDS entry for the read engine behind read-only routes.
+
+    The engine has its own pool, on SQLite too. Its size caps how many
+    read-only requests query at once; the others wait for a connection
+    without using CPU, so analytics load can't crowd out the write path.
+    PostgreSQL sessions default to read-only transactions, the way
+    ``mode=ro`` and ``query_only`` refuse writes on SQLite.
+    """
+    options = {'url': url, 'pool_size': pool_size, 'max_overflow': max_overflow, 'pool_timeout': pool_timeout}
+    if make_url(url).get_backend_name() != 'sqlite':
+        options.update(pool_options(url, pool_size=pool_size, max_overflow=max_overflow,
+                                    pool_timeout=pool_timeout, pool_recycle=pool_recycle))
+    if make_url(url).get_backend_name() == 'postgresql':
+        options['connect_args'] = {'options': '-c default_transaction_read_only=on'}
+    return options
@@ -0,0 +1,57 @@
+from src.models.user import db
+from datetime import datetime
+import json
+
+OPEN_STATUSES = ('queued', 'running')
+
+# At most one open job per kind. Partial indexes need dialect-specific options
+# (and an import of every dialect named), so the same DDL is run on each
+OPEN_JOB_INDEX = 'uq_jobs_open_kind'
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    params = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    # hostname:pid of the process running the job, used to detect jobs orphaned by a restart
+    owner = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status_kind', 'status', 'kind'),
+        db.Index('ix_jobs_created_at', 'created_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': json.loads(self.params) if self.params else {},
+            'progress': json.loads(self.progress) if self.progress else {},
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+def create_open_job_index(engine):
+    """Create the unique index that allows one queued or running job per kind"""
+    statuses = ', '.join(f"'{status}'" for status in OPEN_STATUSES)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {OPEN_JOB_INDEX} ON jobs (kind) WHERE status IN ({statuses})"
+        )
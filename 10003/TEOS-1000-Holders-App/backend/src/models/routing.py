@@ -0,0 +1,38 @@
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from functools import wraps
+
+# SQLALCHEMY_BINDS key of the engine that serves read-only routes
+READ_BIND = 'read'
+
+
+class RoutingSession(Session):
+    """``db.session`` that sends read-only requests to the read engine.
+
+    Requests marked with :func:`use_read_engine` (or :func:`read_only`)
+    run every statement on the ``read`` bind when one is configured.
+    Everything else, including background jobs outside a request, uses the
+    primary. The read engine refuses writes, so a read-only route that
+    tries to flush fails instead of writing somewhere unexpected.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and g.get('use_read_engine'):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_read_engine():
+    """Route the rest of this request's queries to the read engine; usable as a before_request hook"""
+    g.use_read_engine = True
+
+
+def read_only(view):
+    """Decorator for views that only read: their queries go to the read engine"""
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        use_read_engine()
+        return view(*args, **kwargs)
+    return decorated_function
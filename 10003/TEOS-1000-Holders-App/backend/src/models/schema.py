@@ -0,0 +1,89 @@
+from src.models.user import db
+from src.models.types import get_storage_mode
+from src.models.change_log import install_change_capture, remove_change_capture
+from src.models.job import create_open_job_index, OPEN_JOB_INDEX
+from flask import current_app
+from sqlalchemy import inspect, Float, LargeBinary
+from sqlalchemy.exc import IntegrityError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AmountStorageError(Exception):
+    """Raised at startup while amount columns still hold floating-point SOL/TEOS values"""
+
+
+def ensure_schema():
+    """Create missing tables and any indexes added to existing tables.
+
+    ``create_all`` only emits indexes together with a new table, so indexes
+    declared later on an existing table are created here, along with the
+    partial index on open jobs. Change capture
+    triggers are installed or removed to match CHANGE_FEED_ENABLED. Raises
+    AmountStorageError, before changing anything, on a database whose
+    amounts have not been migrated. Must be called inside an app context.
+    """
+    check_amount_storage(db.engine)
+    db.create_all()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(db.engine, checkfirst=True)
+            except IntegrityError as e:
+                # Existing rows violate a new unique index; keep serving and surface it
+                logger.error(f"Could not create index {index.name}: {str(e.orig)}")
+    try:
+        create_open_job_index(db.engine)
+    except IntegrityError as e:
+        logger.error(f"Could not create index {OPEN_JOB_INDEX}: {str(e.orig)}")
+    if current_app.config.get('CHANGE_FEED_ENABLED'):
+        install_change_capture(db.engine)
+    else:
+        remove_change_capture(db.engine)
+    check_address_storage()
+
+
+def check_address_storage():
+    """Log an error when on-disk wallet_address columns don't match WALLET_ADDRESS_STORAGE"""
+    inspector = inspect(db.engine)
+    expected = get_storage_mode()
+    for table in ('contributions', 'holders'):
+        for column in inspector.get_columns(table):
+            if column['name'] != 'wallet_address':
+                continue
+            actual = 'blob' if isinstance(column['type'], LargeBinary) else 'text'
+            if actual != expected:
+                logger.error(
+                    f"{table}.wallet_address is stored as {actual} but WALLET_ADDRESS_STORAGE={expected}; "
+                    f"run tools/migrate_wallet_storage.py --to {expected}"
+                )
+
+
+# Amount columns that hold integer base units since the move off FLOAT
+AMOUNT_COLUMNS = {
+    'contributions': ('sol_amount', 'teos_amount'),
+    'holders': ('teos_balance',),
+    'pool_stats': ('total_sol_contributed', 'total_sol_locked', 'total_teos_distributed'),
+}
+
+
+def check_amount_storage(engine):
+    """Raise AmountStorageError when amount columns still hold floating-point SOL/TEOS values.
+
+    The app reads these columns as integer base units, so serving from an
+    unmigrated database would read 17350.0 SOL as 17350 lamports and write
+    lamport deltas into the float totals. Tables that don't exist yet pass.
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    for table, names in AMOUNT_COLUMNS.items():
+        if table not in existing:
+            continue
+        floats = [column['name'] for column in inspector.get_columns(table)
+                  if column['name'] in names and isinstance(column['type'], Float)]
+        if floats:
+            raise AmountStorageError(
+                f"{table} stores {', '.join(floats)} as floating point, but the app reads integer "
+                f"base units; stop the app and run tools/migrate_amounts.py"
+            )
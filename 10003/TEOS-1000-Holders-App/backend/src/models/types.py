@@ -0,0 +1,89 @@
+from sqlalchemy.types import TypeDecorator, String, LargeBinary
+import os
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+# Solana public keys are 32 raw bytes
+ADDRESS_BYTES = 32
+
+# 'text' keeps base58 strings (String(44)); 'blob' stores the raw 32-byte key
+STORAGE_MODES = ('text', 'blob')
+_storage_mode = os.environ.get('WALLET_ADDRESS_STORAGE', 'text').lower()
+if _storage_mode not in STORAGE_MODES:
+    raise ValueError(f'WALLET_ADDRESS_STORAGE must be one of {STORAGE_MODES}')
+
+
+def b58encode(data):
+    """Encode bytes as base58 (Bitcoin/Solana alphabet)"""
+    value = int.from_bytes(data, 'big')
+    chars = []
+    while value:
+        value, remainder = divmod(value, 58)
+        chars.append(BASE58_ALPHABET[remainder])
+    leading_zeros = len(data) - len(data.lstrip(b'\0'))
+    return '1' * leading_zeros + ''.join(reversed(chars))
+
+
+def b58decode(text):
+    """Decode a base58 string; raises ValueError on invalid characters"""
+    value = 0
+    try:
+        for char in text:
+            value = value * 58 + _BASE58_INDEX[char]
+    except KeyError:
+        raise ValueError(f'Invalid base58 character in {text!r}')
+    leading_zeros = len(text) - len(text.lstrip('1'))
+    body = value.to_bytes((value.bit_length() + 7) // 8, 'big') if value else b''
+    return b'\0' * leading_zeros + body
+
+
+def decode_address(address):
+    """Return the 32-byte public key for a base58 address or raise ValueError"""
+    raw = b58decode(address)
+    if len(raw) != ADDRESS_BYTES:
+        raise ValueError(f'Address {address!r} does not decode to {ADDRESS_BYTES} bytes')
+    return raw
+
+
+def get_storage_mode():
+    return _storage_mode
+
+
+def set_storage_mode(mode):
+    """Select the address storage mode; must run before any engine is used"""
+    global _storage_mode
+    if mode not in STORAGE_MODES:
+        raise ValueError(f'Storage mode must be one of {STORAGE_MODES}')
+    _storage_mode = mode
+
+
+def binary_addresses_enabled():
+    return _storage_mode == 'blob'
+
+
+class WalletAddress(TypeDecorator):
+    """Wallet address column stored as base58 text or as a 32-byte BLOB.
+
+    Python code always sees base58 strings; in blob mode conversion happens
+    only when values cross the database boundary, which halves index entries
+    and turns comparisons into fixed-length memcmp.
+    """
+
+    impl = String(44)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if binary_addresses_enabled():
+            return dialect.type_descriptor(LargeBinary(ADDRESS_BYTES))
+        return dialect.type_descriptor(String(44))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not binary_addresses_enabled():
+            return value
+        return decode_address(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return b58encode(bytes(value))
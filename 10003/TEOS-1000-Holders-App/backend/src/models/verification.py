@@ -0,0 +1,18 @@
+from src.models.user import db
+from datetime import datetime
+
+class WalletVerification(db.Model):
+    """On-chain verification handed back as 202, readable by every worker that serves the status poll"""
+    __tablename__ = 'wallet_verifications'
+
+    wallet_address = db.Column(db.String(44), primary_key=True)
+    # pending, done or error
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_wallet_verifications_expires_at', 'expires_at'),
+    )
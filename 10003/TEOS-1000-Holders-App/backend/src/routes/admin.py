@@ -1,43 +1,51 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, url_for, current_app
 from src.models.contribution import db, Contribution, PoolStats, Holder
-from src.models.user import User
-from datetime import datetime
+from src.models.amounts import sol_to_lamports, teos_to_base_units
+from src.models.routing import READ_BIND
+from src.routes.wallet import is_valid_solana_address
+from src.routes.auth import admin_required
+from src.services import bulk_verify, bulk_delete
+from src.services.pool_stats import apply_contribution_deltas
+from src.services.log_buffer import get_ring_buffer
+from src.services.system_status import get_cached_counts, ping_database, storage_metrics, pool_metrics
+from src.services.backup import get_backup_manager, DEFAULT_PAGES_PER_STEP
+from src.services.jobs import get_job_runner, JobQueueFull, FINISHED_STATUSES
+from src.services.change_feed import get_change_feed, TABLES as REPLICATED_TABLES, DEFAULT_BATCH_SIZE
+from datetime import datetime, timezone
 import logging
-import os
 
 admin_bp = Blueprint('admin', __name__)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Simple admin authentication (in production, use proper JWT or session management)
-def verify_admin_token(token):
-    """Verify admin authentication token"""
-    # In production, implement proper token verification
-    return token == "admin_secret_token_2025"
-
-def admin_required(f):
-    """Decorator to require admin authentication"""
-    def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({
-                'success': False,
-                'error': 'Admin authentication required'
-            }), 401
-        
-        token = auth_header.split(' ')[1]
-        if not verify_admin_token(token):
-            return jsonify({
-                'success': False,
-                'error': 'Invalid admin token'
-            }), 401
-        
-        return f(*args, **kwargs)
+def submit_job(kind, params, message, status_endpoint=None):
+    """Queue a background job and build the 202 response for it"""
+    try:
+        job = get_job_runner().submit(kind, params)
+    except JobQueueFull as e:
+        return jsonify({
+            'success': False,
+            'error': f'Job queue is full: {str(e)}'
+        }), 503
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': f'A {kind} job is already running'
+        }), 409
+    
+    if status_endpoint:
+        status_url = url_for(status_endpoint, backup_id=job['job_id'])
+    else:
+        status_url = url_for('admin.get_job', job_id=job['job_id'])
+    logger.info(f"Admin started {kind} job {job['job_id']}")
     
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+    return jsonify({
+        'success': True,
+        'message': message,
+        'data': job,
+        'job_url': url_for('admin.get_job', job_id=job['job_id']),
+        'status_url': status_url
+    }), 202
 
 @admin_bp.route('/system/status', methods=['GET'])
 @admin_required
@@ -46,17 +54,14 @@ def get_system_status():
     try:
         # Database status
         try:
-            db.session.execute('SELECT 1')
+            db_ping_ms = ping_database()
             db_status = 'healthy'
         except Exception as e:
+            db_ping_ms = None
             db_status = f'error: {str(e)}'
         
-        # Get counts
-        total_contributions = Contribution.query.count()
-        verified_contributions = Contribution.query.filter_by(verified=True).count()
-        total_holders = Holder.query.count()
-        verified_holders = Holder.query.filter_by(verified=True).count()
-        total_users = User.query.count()
+        # Row counts come from one aggregate query cached for SYSTEM_STATUS_TTL seconds
+        counts, counts_computed_at = get_cached_counts().get()
         
         # Pool stats
         pool_stats = PoolStats.query.first()
@@ -64,16 +69,14 @@ def get_system_status():
         # System info
         system_info = {
             'database_status': db_status,
-            'total_contributions': total_contributions,
-            'verified_contributions': verified_contributions,
-            'total_holders': total_holders,
-            'verified_holders': verified_holders,
-            'total_users': total_users,
+            'database_ping_ms': db_ping_ms,
+            **counts,
+            'counts_computed_at': counts_computed_at.isoformat(),
             'pool_stats': pool_stats.to_dict() if pool_stats else None,
-            'server_time': datetime.utcnow().isoformat(),
-            'database_file_exists': os.path.exists(
-                os.path.join(os.path.dirname(__file__), '..', 'database', 'app.db')
-            )
+            'storage': storage_metrics(db.engine),
+            'connection_pool': pool_metrics(db.engine),
+            'read_connection_pool': pool_metrics(db.engines[READ_BIND]) if READ_BIND in db.engines else None,
+            'server_time': datetime.utcnow().isoformat()
         }
         
         return jsonify({
@@ -109,9 +112,9 @@ def reset_pool_stats():
         new_stats = PoolStats(
             total_contributors=0,
             verified_contributors=0,
-            total_sol_contributed=0.0,
-            total_sol_locked=0.0,
-            total_teos_distributed=0.0,
+            total_sol_contributed=0,
+            total_sol_locked=0,
+            total_teos_distributed=0,
             trading_unlocked=False,
             sol_unlocked=False
         )
@@ -134,60 +137,91 @@ def reset_pool_stats():
             'error': 'Failed to reset pool statistics'
         }), 500
 
+@admin_bp.route('/pool/reconcile', methods=['POST'])
+@admin_required
+def reconcile_pool():
+    """Recompute pool statistics from contributions in a background job"""
+    try:
+        data = request.get_json(silent=True) or {}
+        repair = bool(data.get('repair', False))
+        
+        return submit_job('reconcile', {'repair': repair}, 'Pool reconciliation started')
+        
+    except Exception as e:
+        logger.error(f"Error starting pool reconciliation: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to reconcile pool statistics'
+        }), 500
+
 @admin_bp.route('/contributions/bulk-verify', methods=['POST'])
 @admin_required
 def bulk_verify_contributions():
-    """Bulk verify contributions"""
+    """Bulk verify contributions in a background job"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
+        contribution_ids = [int(i) for i in data.get('contribution_ids', [])]
+        chunk_size = max(int(data.get('chunk_size', bulk_verify.DEFAULT_CHUNK_SIZE)), 1)
         
-        if not data:
-            # Verify all unverified contributions
-            unverified = Contribution.query.filter_by(verified=False).all()
-        else:
-            contribution_ids = data.get('contribution_ids', [])
-            if contribution_ids:
-                unverified = Contribution.query.filter(
-                    Contribution.id.in_(contribution_ids)
-                ).all()
-            else:
-                unverified = Contribution.query.filter_by(verified=False).all()
-        
-        verified_count = 0
-        for contribution in unverified:
-            if not contribution.verified:
-                contribution.verified = True
-                contribution.updated_at = datetime.utcnow()
-                verified_count += 1
-        
-        # Update pool stats
-        pool_stats = PoolStats.query.first()
-        if pool_stats:
-            pool_stats.verified_contributors += verified_count
-            
-            # Check unlock conditions
-            if pool_stats.verified_contributors >= 500 and not pool_stats.trading_unlocked:
-                pool_stats.trading_unlocked = True
-            
-            if pool_stats.verified_contributors >= 10000 and not pool_stats.sol_unlocked:
-                pool_stats.sol_unlocked = True
-                pool_stats.total_sol_locked = 0.0
+        return submit_job(
+            'bulk_verify', {'contribution_ids': contribution_ids, 'chunk_size': chunk_size},
+            'Bulk verification started'
+        )
         
-        db.session.commit()
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': 'contribution_ids and chunk_size must be integers'
+        }), 400
+    except Exception as e:
+        logger.error(f"Error starting bulk verification: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to bulk verify contributions'
+        }), 500
+
+@admin_bp.route('/contributions/bulk-delete', methods=['POST'])
+@admin_required
+def bulk_delete_contributions():
+    """Bulk delete contributions by ids or filter in a background job"""
+    try:
+        data = request.get_json(silent=True) or {}
+        criteria = {
+            'contribution_ids': [int(i) for i in data.get('contribution_ids') or []],
+            'wallet_addresses': [str(w).strip() for w in data.get('wallet_addresses') or []],
+            'created_from': data.get('created_from'),
+            'created_to': data.get('created_to'),
+            'unverified_older_than_days': data.get('unverified_older_than_days')
+        }
+        invalid = [w for w in criteria['wallet_addresses'] if not is_valid_solana_address(w)]
+        if invalid:
+            return jsonify({
+                'success': False,
+                'error': f'Invalid wallet addresses: {invalid[:10]}'
+            }), 400
+        chunk_size = max(int(data.get('chunk_size', bulk_delete.DEFAULT_CHUNK_SIZE)), 1)
+        conditions = bulk_delete.build_filters(**criteria)
         
-        logger.info(f"Admin bulk verified {verified_count} contributions")
+        if data.get('dry_run'):
+            return jsonify({
+                'success': True,
+                'dry_run': True,
+                'data': bulk_delete.preview_bulk_delete(conditions)
+            }), 200
         
-        return jsonify({
-            'success': True,
-            'message': f'Successfully verified {verified_count} contributions',
-            'verified_count': verified_count
-        }), 200
+        return submit_job('bulk_delete', {**criteria, 'chunk_size': chunk_size}, 'Bulk deletion started')
         
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
-        logger.error(f"Error in bulk verification: {str(e)}")
+        db.session.rollback()
+        logger.error(f"Error starting bulk deletion: {str(e)}")
         return jsonify({
             'success': False,
-            'error': 'Failed to bulk verify contributions'
+            'error': 'Failed to bulk delete contributions'
         }), 500
 
 @admin_bp.route('/contributions/<int:contribution_id>/delete', methods=['DELETE'])
@@ -197,15 +231,13 @@ def delete_contribution(contribution_id):
     try:
         contribution = Contribution.query.get_or_404(contribution_id)
         
-        # Update pool stats before deletion
-        pool_stats = PoolStats.query.first()
-        if pool_stats:
-            pool_stats.total_contributors -= 1
-            if contribution.verified:
-                pool_stats.verified_contributors -= 1
-            pool_stats.total_sol_contributed -= contribution.sol_amount
-            pool_stats.total_sol_locked -= contribution.sol_amount / 2
-            pool_stats.total_teos_distributed -= contribution.teos_amount
+        # Take the contribution back out of the pool counters in one UPDATE
+        apply_contribution_deltas(
+            total_contributors=-1,
+            verified_contributors=-int(bool(contribution.verified)),
+            sol_amount=-contribution.sol_amount,
+            teos_amount=-contribution.teos_amount
+        )
         
         wallet_address = contribution.wallet_address
         db.session.delete(contribution)
@@ -245,13 +277,13 @@ def update_pool_stats():
             pool_stats.verified_contributors = int(data['verified_contributors'])
         
         if 'total_sol_contributed' in data:
-            pool_stats.total_sol_contributed = float(data['total_sol_contributed'])
+            pool_stats.total_sol_contributed = sol_to_lamports(data['total_sol_contributed'])
         
         if 'total_sol_locked' in data:
-            pool_stats.total_sol_locked = float(data['total_sol_locked'])
+            pool_stats.total_sol_locked = sol_to_lamports(data['total_sol_locked'])
         
         if 'total_teos_distributed' in data:
-            pool_stats.total_teos_distributed = float(data['total_teos_distributed'])
+            pool_stats.total_teos_distributed = teos_to_base_units(data['total_teos_distributed'])
         
         if 'trading_unlocked' in data:
             pool_stats.trading_unlocked = bool(data['trading_unlocked'])
@@ -280,76 +312,245 @@ def update_pool_stats():
 @admin_bp.route('/database/backup', methods=['POST'])
 @admin_required
 def backup_database():
-    """Create a backup of the database"""
+    """Start an online backup of the database in a background job"""
+    try:
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode', 'full')
+        if mode not in ('full', 'incremental'):
+            raise ValueError('mode must be "full" or "incremental"')
+        
+        params = {
+            'mode': mode,
+            'compress': bool(data.get('compress', False)),
+            'verify': bool(data.get('verify', True)),
+            'pages_per_step': max(int(data.get('pages_per_step', DEFAULT_PAGES_PER_STEP)), 1)
+        }
+        return submit_job('backup', params, 'Database backup started', status_endpoint='admin.get_backup_status')
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error creating database backup: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to create database backup'
+        }), 500
+
+@admin_bp.route('/database/backup/<backup_id>', methods=['GET'])
+@admin_required
+def get_backup_status(backup_id):
+    """Get progress and result of a database backup"""
+    job = get_job_runner().get(backup_id)
+    if not job or job['kind'] != 'backup':
+        return jsonify({
+            'success': False,
+            'error': 'Backup not found'
+        }), 404
+    
+    progress = dict(job['progress'])
+    phase = progress.pop('phase', None)
+    return jsonify({
+        'success': True,
+        'data': {
+            'backup_id': job['job_id'],
+            'mode': job['params'].get('mode', 'full'),
+            'compressed': job['params'].get('compress', False),
+            **progress,
+            **(job['result'] or {}),
+            'status': phase if job['status'] == 'running' and phase else job['status'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'error': job['error']
+        }
+    }), 200
+
+@admin_bp.route('/database/backups/points', methods=['GET'])
+@admin_required
+def list_restore_points():
+    """List recorded incremental backup points available for restore"""
     try:
-        import shutil
-        from datetime import datetime
+        manifests = get_backup_manager().incremental_store.manifests()
         
-        db_path = os.path.join(os.path.dirname(__file__), '..', 'database', 'app.db')
-        backup_dir = os.path.join(os.path.dirname(__file__), '..', 'backups')
+        return jsonify({
+            'success': True,
+            'data': {
+                'points': manifests,
+                'total_points': len(manifests)
+            }
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error listing restore points: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to list restore points'
+        }), 500
+
+@admin_bp.route('/jobs', methods=['GET'])
+@admin_required
+def list_jobs():
+    """List recent background jobs"""
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        jobs = get_job_runner().list(
+            kind=request.args.get('kind'),
+            status=request.args.get('status'),
+            limit=limit
+        )
         
-        # Create backup directory if it doesn't exist
-        os.makedirs(backup_dir, exist_ok=True)
+        return jsonify({
+            'success': True,
+            'data': {
+                'jobs': jobs,
+                'total_jobs': len(jobs)
+            }
+        }), 200
         
-        # Create backup filename with timestamp
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f'app_backup_{timestamp}.db'
-        backup_path = os.path.join(backup_dir, backup_filename)
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to list jobs'
+        }), 500
+
+@admin_bp.route('/jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_job(job_id):
+    """Get status, progress and result of a background job"""
+    job = get_job_runner().get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': job
+    }), 200
+
+@admin_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_job(job_id):
+    """Request cancellation of a queued or running background job"""
+    try:
+        runner = get_job_runner()
+        job = runner.get(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
         
-        # Copy database file
-        shutil.copy2(db_path, backup_path)
+        if job['status'] in FINISHED_STATUSES:
+            return jsonify({
+                'success': False,
+                'error': f"Job already {job['status']}",
+                'data': job
+            }), 409
         
-        logger.info(f"Database backup created: {backup_filename}")
+        job = runner.cancel(job_id)
+        logger.info(f"Admin requested cancellation of job {job_id}")
         
         return jsonify({
             'success': True,
-            'message': 'Database backup created successfully',
-            'backup_filename': backup_filename,
-            'backup_path': backup_path
-        }), 200
+            'message': 'Cancellation requested',
+            'data': job
+        }), 202
         
     except Exception as e:
-        logger.error(f"Error creating database backup: {str(e)}")
+        logger.error(f"Error cancelling job: {str(e)}")
         return jsonify({
             'success': False,
-            'error': 'Failed to create database backup'
+            'error': 'Failed to cancel job'
         }), 500
 
+@admin_bp.route('/profiler/requests', methods=['GET'])
+@admin_required
+def get_profiled_requests():
+    """Get recent per-request SQL profiles (requires SQL_PROFILER_ENABLED)"""
+    profiler = current_app.extensions.get('sql_profiler')
+    if profiler is None:
+        return jsonify({
+            'success': False,
+            'error': 'SQL profiler is not enabled'
+        }), 404
+    
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    details = request.args.get('details', 'false').lower() == 'true'
+    repeated_only = request.args.get('repeated', 'false').lower() == 'true'
+    
+    profiles = profiler.recent(limit=profiler.profiles.maxlen, details=details)
+    if repeated_only:
+        profiles = [p for p in profiles if p['repeated_shapes']]
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'requests': profiles[:limit],
+            'total_requests': len(profiles[:limit])
+        }
+    }), 200
+
+def utc_timestamp(value):
+    """Epoch seconds for an ISO 8601 timestamp; one without an offset is taken as UTC"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).timestamp()
+
 @admin_bp.route('/logs/recent', methods=['GET'])
 @admin_required
 def get_recent_logs():
-    """Get recent system logs (mock implementation)"""
+    """Get recent log records from the in-memory ring buffer"""
     try:
-        # In a real implementation, you would read from actual log files
-        mock_logs = [
-            {
-                'timestamp': datetime.utcnow().isoformat(),
-                'level': 'INFO',
-                'message': 'System status check completed',
-                'module': 'admin'
-            },
-            {
-                'timestamp': (datetime.utcnow()).isoformat(),
-                'level': 'INFO',
-                'message': 'New contribution processed',
-                'module': 'contribution'
-            },
-            {
-                'timestamp': (datetime.utcnow()).isoformat(),
-                'level': 'WARNING',
-                'message': 'High contribution volume detected',
-                'module': 'analytics'
-            }
-        ]
+        ring = get_ring_buffer()
+        if ring is None:
+            return jsonify({
+                'success': False,
+                'error': 'Log buffer is not configured'
+            }), 503
+        
+        level_name = request.args.get('level', 'NOTSET').upper()
+        min_level = logging.getLevelName(level_name)
+        if not isinstance(min_level, int):
+            return jsonify({
+                'success': False,
+                'error': f'Unknown log level: {level_name}'
+            }), 400
+        
+        since = request.args.get('since')
+        until = request.args.get('until')
+        since = utc_timestamp(since) if since else None
+        until = utc_timestamp(until) if until else None
+        
+        logs, next_cursor, truncated = ring.query(
+            after=request.args.get('after', 0, type=int),
+            min_level=min_level,
+            module=request.args.get('module'),
+            since=since,
+            until=until,
+            limit=min(max(request.args.get('limit', 100, type=int), 1), 1000)
+        )
         
         return jsonify({
             'success': True,
             'data': {
-                'logs': mock_logs,
-                'total_logs': len(mock_logs)
+                'logs': logs,
+                'total_logs': len(logs),
+                'next_cursor': next_cursor,
+                'truncated': truncated
             }
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': 'since and until must be ISO 8601 timestamps'
+        }), 400
     except Exception as e:
         logger.error(f"Error getting recent logs: {str(e)}")
         return jsonify({
@@ -357,3 +558,62 @@ def get_recent_logs():
             'error': 'Failed to retrieve recent logs'
         }), 500
 
+def change_feed_disabled():
+    return jsonify({
+        'success': False,
+        'error': 'Change feed is not enabled'
+    }), 404
+
+@admin_bp.route('/replication/changes', methods=['GET'])
+@admin_required
+def get_changes():
+    """Get change log entries after a sequence number, with the current state of each changed row"""
+    if not current_app.config.get('CHANGE_FEED_ENABLED'):
+        return change_feed_disabled()
+    try:
+        data = get_change_feed().changes(
+            after=max(request.args.get('after', 0, type=int), 0),
+            limit=max(request.args.get('limit', DEFAULT_BATCH_SIZE, type=int), 1)
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error reading change feed: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to read change feed'
+        }), 500
+
+@admin_bp.route('/replication/snapshot/<table_name>', methods=['GET'])
+@admin_required
+def get_snapshot(table_name):
+    """Get one page of a replicated table by id, for seeding a replica"""
+    if not current_app.config.get('CHANGE_FEED_ENABLED'):
+        return change_feed_disabled()
+    if table_name not in REPLICATED_TABLES:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown table; expected one of: {', '.join(REPLICATED_TABLES)}"
+        }), 404
+    try:
+        data = get_change_feed().snapshot(
+            table_name,
+            after_id=max(request.args.get('after_id', 0, type=int), 0),
+            limit=max(request.args.get('limit', DEFAULT_BATCH_SIZE, type=int), 1)
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error reading snapshot of {table_name}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to read snapshot'
+        }), 500
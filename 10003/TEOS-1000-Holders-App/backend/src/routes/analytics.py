@@ -1,16 +1,22 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from src.models.contribution import db, Contribution, PoolStats, Holder
 from src.models.user import User
+from src.models.amounts import TEOS_BASE_UNITS, lamports_to_sol, base_units_to_teos
+from src.models.dialects import day_bucket
+from src.models.routing import use_read_engine
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, select
 import logging
 
 analytics_bp = Blueprint('analytics', __name__)
+# Every analytics endpoint only reads, so the whole blueprint uses the read engine
+analytics_bp.before_request(use_read_engine)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Contributions fetched and written per chunk of a streamed export
+EXPORT_BATCH_SIZE = 1000
+
 @analytics_bp.route('/dashboard', methods=['GET'])
 def get_dashboard_stats():
     """Get comprehensive dashboard statistics"""
@@ -26,21 +32,24 @@ def get_dashboard_stats():
             Contribution.created_at >= thirty_days_ago
         ).count()
         
-        # Get daily contribution counts for the last 7 days
+        # Get daily contribution counts for the last 7 days in one grouped query
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        day = day_bucket(Contribution.created_at)
+        daily_counts = {
+            str(row.date): row.count
+            for row in db.session.query(
+                day.label('date'),
+                func.count(Contribution.id).label('count')
+            ).filter(
+                Contribution.created_at >= today - timedelta(days=6)
+            ).group_by(day).all()
+        }
         daily_stats = []
         for i in range(7):
-            date = datetime.utcnow() - timedelta(days=i)
-            start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_day = start_of_day + timedelta(days=1)
-            
-            daily_count = Contribution.query.filter(
-                Contribution.created_at >= start_of_day,
-                Contribution.created_at < end_of_day
-            ).count()
-            
+            date = (today - timedelta(days=i)).strftime('%Y-%m-%d')
             daily_stats.append({
-                'date': start_of_day.strftime('%Y-%m-%d'),
-                'contributions': daily_count
+                'date': date,
+                'contributions': daily_counts.get(date, 0)
             })
         
         # Calculate progress percentages
@@ -86,40 +95,37 @@ def get_contribution_trends():
         start_date = datetime.utcnow() - timedelta(days=days)
         
         # Get contributions grouped by day
+        day = day_bucket(Contribution.created_at)
         daily_contributions = db.session.query(
-            func.date(Contribution.created_at).label('date'),
+            day.label('date'),
             func.count(Contribution.id).label('count'),
             func.sum(Contribution.sol_amount).label('total_sol'),
             func.sum(Contribution.teos_amount).label('total_teos')
         ).filter(
             Contribution.created_at >= start_date
-        ).group_by(
-            func.date(Contribution.created_at)
-        ).order_by('date').all()
+        ).group_by(day).order_by('date').all()
         
-        # Format the data
+        # Format the data; sums stay in exact base units until the response
         trends = []
-        for row in daily_contributions:
-            trends.append({
-                'date': row.date.strftime('%Y-%m-%d'),
-                'contributions': row.count,
-                'sol_amount': float(row.total_sol or 0),
-                'teos_amount': float(row.total_teos or 0)
-            })
-        
-        # Calculate cumulative stats
         cumulative_contributions = 0
         cumulative_sol = 0
         cumulative_teos = 0
         
-        for trend in trends:
-            cumulative_contributions += trend['contributions']
-            cumulative_sol += trend['sol_amount']
-            cumulative_teos += trend['teos_amount']
+        for row in daily_contributions:
+            cumulative_contributions += row.count
+            cumulative_sol += row.total_sol or 0
+            cumulative_teos += row.total_teos or 0
             
-            trend['cumulative_contributions'] = cumulative_contributions
-            trend['cumulative_sol'] = cumulative_sol
-            trend['cumulative_teos'] = cumulative_teos
+            trends.append({
+                # SQLite buckets to a 'YYYY-MM-DD' string, other backends to a date
+                'date': str(row.date),
+                'contributions': row.count,
+                'sol_amount': lamports_to_sol(row.total_sol or 0),
+                'teos_amount': base_units_to_teos(row.total_teos or 0),
+                'cumulative_contributions': cumulative_contributions,
+                'cumulative_sol': lamports_to_sol(cumulative_sol),
+                'cumulative_teos': base_units_to_teos(cumulative_teos)
+            })
         
         return jsonify({
             'success': True,
@@ -127,8 +133,8 @@ def get_contribution_trends():
                 'trends': trends,
                 'period_days': days,
                 'total_period_contributions': cumulative_contributions,
-                'total_period_sol': cumulative_sol,
-                'total_period_teos': cumulative_teos
+                'total_period_sol': lamports_to_sol(cumulative_sol),
+                'total_period_teos': base_units_to_teos(cumulative_teos)
             }
         }), 200
         
@@ -157,14 +163,14 @@ def get_holder_distribution():
         for min_balance, max_balance in balance_ranges:
             if max_balance == float('inf'):
                 count = Holder.query.filter(
-                    Holder.teos_balance >= min_balance,
+                    Holder.teos_balance >= min_balance * TEOS_BASE_UNITS,
                     Holder.verified == True
                 ).count()
                 range_label = f"{min_balance:,}+"
             else:
                 count = Holder.query.filter(
-                    Holder.teos_balance >= min_balance,
-                    Holder.teos_balance < max_balance,
+                    Holder.teos_balance >= min_balance * TEOS_BASE_UNITS,
+                    Holder.teos_balance < max_balance * TEOS_BASE_UNITS,
                     Holder.verified == True
                 ).count()
                 range_label = f"{min_balance:,} - {max_balance:,}"
@@ -279,47 +285,72 @@ def get_pool_health():
             'error': 'Failed to retrieve pool health metrics'
         }), 500
 
+def stream_export(contributions, to_record, leading, trailer):
+    """Yield the export's JSON document a batch at a time.
+
+    The body is the same compact, key-sorted document ``jsonify`` builds:
+    ``data`` comes first, so ``trailer(count)`` supplies the keys after it
+    once every row has been written.
+    """
+    dumps = current_app.json.dumps
+    separators = (',', ':')
+    yield '{"data":[' + ','.join(dumps(record, separators=separators) for record in leading)
+    count = 0
+    try:
+        for batch in contributions.partitions():
+            records = ','.join(dumps(to_record(contrib), separators=separators) for contrib in batch)
+            yield (',' if count or leading else '') + records
+            count += len(batch)
+    except Exception as e:
+        # Headers are already sent; the truncated body tells the client the export failed
+        logger.error(f"Error exporting contributions: {str(e)}")
+        raise
+    yield '],' + dumps(trailer(count), separators=separators)[1:] + '\n'
+
 @analytics_bp.route('/export/contributions', methods=['GET'])
 def export_contributions():
-    """Export contributions data (admin endpoint)"""
+    """Export contributions data (admin endpoint)
+
+    Rows are streamed EXPORT_BATCH_SIZE at a time, so memory stays flat
+    however many contributions there are.
+    """
     try:
         format_type = request.args.get('format', 'json')
         verified_only = request.args.get('verified', 'false').lower() == 'true'
         
-        query = Contribution.query
+        query = select(Contribution)
         if verified_only:
             query = query.filter_by(verified=True)
         
-        contributions = query.order_by(Contribution.created_at.desc()).all()
+        contributions = db.session.execute(
+            query.order_by(Contribution.created_at.desc()).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        ).scalars()
         
         if format_type == 'csv':
             # For CSV export, you would typically use pandas or csv module
             # For now, returning JSON with CSV-like structure
-            csv_data = []
-            csv_data.append(['Wallet Address', 'SOL Amount', 'TEOS Amount', 'Verified', 'Created At'])
-            
-            for contrib in contributions:
-                csv_data.append([
+            body = stream_export(
+                contributions,
+                lambda contrib: [
                     contrib.wallet_address,
-                    contrib.sol_amount,
-                    contrib.teos_amount,
+                    lamports_to_sol(contrib.sol_amount),
+                    base_units_to_teos(contrib.teos_amount),
                     contrib.verified,
                     contrib.created_at.isoformat() if contrib.created_at else ''
-                ])
-            
-            return jsonify({
-                'success': True,
-                'data': csv_data,
-                'format': 'csv_array'
-            }), 200
+                ],
+                [['Wallet Address', 'SOL Amount', 'TEOS Amount', 'Verified', 'Created At']],
+                lambda count: {'success': True, 'format': 'csv_array'}
+            )
         
         else:  # JSON format
-            return jsonify({
-                'success': True,
-                'data': [contrib.to_dict() for contrib in contributions],
-                'format': 'json',
-                'total_records': len(contributions)
-            }), 200
+            body = stream_export(
+                contributions,
+                lambda contrib: contrib.to_dict(),
+                [],
+                lambda count: {'success': True, 'format': 'json', 'total_records': count}
+            )
+        
+        return Response(stream_with_context(body), mimetype='application/json'), 200
         
     except Exception as e:
         logger.error(f"Error exporting contributions: {str(e)}")
@@ -0,0 +1,29 @@
+from flask import jsonify, request
+
+# Simple admin authentication (in production, use proper JWT or session management)
+def verify_admin_token(token):
+    """Verify admin authentication token"""
+    # In production, implement proper token verification
+    return token == "admin_secret_token_2025"
+
+def admin_required(f):
+    """Decorator to require admin authentication"""
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({
+                'success': False,
+                'error': 'Admin authentication required'
+            }), 401
+        
+        token = auth_header.split(' ')[1]
+        if not verify_admin_token(token):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid admin token'
+            }), 401
+        
+        return f(*args, **kwargs)
+    
+    decorated_function.__name__ = f.__name__
+    return decorated_function
@@ -1,12 +1,17 @@
 from flask import Blueprint, request, jsonify
 from src.models.contribution import db, Contribution, PoolStats, Holder
+from src.routes.wallet import is_valid_solana_address
+from src.models.amounts import sol_to_lamports
+from src.models.routing import read_only
+from src.services.pool_stats import (
+    apply_contribution_deltas, increment_verified_contributors, CONTRIBUTION_LAMPORTS, CONTRIBUTION_TEOS_UNITS
+)
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import logging
 
 contribution_bp = Blueprint('contribution', __name__)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @contribution_bp.route('/pool/stats', methods=['GET'])
@@ -19,9 +24,9 @@ def get_pool_stats():
             stats = PoolStats(
                 total_contributors=347,  # Mock data matching frontend
                 verified_contributors=347,
-                total_sol_contributed=17350.0,  # 347 * 50
-                total_sol_locked=8675.0,  # 50% locked
-                total_teos_distributed=3470000.0,  # 347 * 10000
+                total_sol_contributed=347 * CONTRIBUTION_LAMPORTS,
+                total_sol_locked=347 * CONTRIBUTION_LAMPORTS // 2,  # 50% locked
+                total_teos_distributed=347 * CONTRIBUTION_TEOS_UNITS,
                 trading_unlocked=False,
                 sol_unlocked=False
             )
@@ -55,10 +60,18 @@ def contribute():
                 }), 400
         
         wallet_address = data['wallet_address']
-        sol_amount = float(data['sol_amount'])
+        if isinstance(wallet_address, str):
+            wallet_address = wallet_address.strip()
+        sol_amount = sol_to_lamports(data['sol_amount'])
+        
+        if not is_valid_solana_address(wallet_address):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid Solana wallet address format'
+            }), 400
         
         # Validate SOL amount (should be $50 equivalent)
-        if sol_amount != 50.0:
+        if sol_amount != CONTRIBUTION_LAMPORTS:
             return jsonify({
                 'success': False,
                 'error': 'Contribution must be exactly $50 worth of SOL'
@@ -72,41 +85,50 @@ def contribute():
                 'error': 'Wallet has already contributed to the pool'
             }), 400
         
+        # Contributions carrying a transaction signature stay pending until the
+        # confirmation worker sees it on-chain; others are auto-verified for demo purposes
+        transaction_hash = data.get('transaction_hash')
+        verified = not transaction_hash
+        
         # Create new contribution
-        teos_amount = 10000.0  # Fixed amount of TEOS tokens
+        teos_amount = CONTRIBUTION_TEOS_UNITS  # Fixed amount of TEOS tokens
         contribution = Contribution(
             wallet_address=wallet_address,
             sol_amount=sol_amount,
             teos_amount=teos_amount,
-            transaction_hash=data.get('transaction_hash'),
-            verified=True  # Auto-verify for demo purposes
+            transaction_hash=transaction_hash,
+            verified=verified
         )
         
         db.session.add(contribution)
         
-        # Update pool stats
-        stats = PoolStats.query.first()
-        if not stats:
-            stats = PoolStats()
-            db.session.add(stats)
-        
-        stats.total_contributors += 1
-        stats.verified_contributors += 1
-        stats.total_sol_contributed += sol_amount
-        stats.total_sol_locked += sol_amount / 2  # 50% locked
-        stats.total_teos_distributed += teos_amount
-        
-        # Check if trading should be unlocked (500 contributors)
-        if stats.verified_contributors >= 500 and not stats.trading_unlocked:
-            stats.trading_unlocked = True
-        
-        # Check if SOL should be unlocked (10,000 holders)
-        if stats.verified_contributors >= 10000 and not stats.sol_unlocked:
-            stats.sol_unlocked = True
-            stats.total_sol_locked = 0.0  # Unlock all SOL
-        
-        db.session.commit()
+        # Reused signatures are caught by the unique transaction_hash index when
+        # the contribution is flushed rather than by a separate lookup
+        try:
+            # Pool counters move in one UPDATE, so concurrent contributions on a
+            # multi-writer database can't overwrite each other's increments
+            deltas = dict(total_contributors=1, verified_contributors=int(verified),
+                          sol_amount=sol_amount, teos_amount=teos_amount)
+            if not apply_contribution_deltas(**deltas):
+                # Column defaults only apply on INSERT, so start the counters explicitly
+                db.session.add(PoolStats(total_contributors=0, verified_contributors=0, total_sol_contributed=0,
+                                         total_sol_locked=0, total_teos_distributed=0,
+                                         trading_unlocked=False, sol_unlocked=False))
+                db.session.flush()
+                apply_contribution_deltas(**deltas)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if 'transaction_hash' in str(e.orig):
+                error = 'Transaction has already been used for a contribution'
+            else:
+                error = 'Wallet has already contributed to the pool'
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
         
+        stats = PoolStats.query.first()
         return jsonify({
             'success': True,
             'data': {
@@ -128,6 +150,7 @@ def contribute():
         }), 500
 
 @contribution_bp.route('/contributions', methods=['GET'])
+@read_only
 def get_contributions():
     """Get all contributions with optional filtering"""
     try:
@@ -165,10 +188,39 @@ def get_contributions():
             'error': 'Failed to retrieve contributions'
         }), 500
 
+@contribution_bp.route('/contributions/by-tx/<transaction_hash>', methods=['GET'])
+def get_contribution_by_transaction(transaction_hash):
+    """Look up a contribution by its on-chain transaction signature"""
+    try:
+        contribution = Contribution.query.filter_by(transaction_hash=transaction_hash).first()
+        if not contribution:
+            return jsonify({
+                'success': False,
+                'error': 'Contribution not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': contribution.to_dict()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting contribution by transaction: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to retrieve contribution'
+        }), 500
+
 @contribution_bp.route('/verify/<wallet_address>', methods=['POST'])
 def verify_contribution(wallet_address):
     """Verify a contribution (admin endpoint)"""
     try:
+        if not is_valid_solana_address(wallet_address):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid Solana wallet address format'
+            }), 400
+        
         contribution = Contribution.query.filter_by(wallet_address=wallet_address).first()
         if not contribution:
             return jsonify({
@@ -185,18 +237,8 @@ def verify_contribution(wallet_address):
         contribution.verified = True
         contribution.updated_at = datetime.utcnow()
         
-        # Update pool stats
-        stats = PoolStats.query.first()
-        if stats:
-            stats.verified_contributors += 1
-            
-            # Check unlock conditions
-            if stats.verified_contributors >= 500 and not stats.trading_unlocked:
-                stats.trading_unlocked = True
-            
-            if stats.verified_contributors >= 10000 and not stats.sol_unlocked:
-                stats.sol_unlocked = True
-                stats.total_sol_locked = 0.0
+        # Update pool stats and check unlock conditions
+        increment_verified_contributors(1)
         
         db.session.commit()
         
@@ -213,6 +255,7 @@ def verify_contribution(wallet_address):
         }), 500
 
 @contribution_bp.route('/holders', methods=['GET'])
+@read_only
 def get_holders():
     """Get all verified holders"""
     try:
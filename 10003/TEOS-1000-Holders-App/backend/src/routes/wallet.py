@@ -1,23 +1,63 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response, stream_with_context, url_for, current_app
 from src.models.contribution import db, Contribution, Holder
+from src.models.types import binary_addresses_enabled, decode_address
+from src.models.amounts import teos_to_base_units, base_units_to_teos
+from src.models.routing import read_only
+from src.routes.auth import admin_required
+from src.services.eligibility import get_eligibility_engine, EligibilityBusy
+from src.services.pool_stats import increment_verified_contributors
+from src.services.solana_rpc import RpcError
+from src.services.holder_import import (
+    detect_format, iter_rows, import_holders, DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY
+)
 from datetime import datetime
+import json
 import logging
 import re
 
 wallet_bp = Blueprint('wallet', __name__)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def is_valid_solana_address(address):
     """Validate Solana wallet address format"""
-    if not address or len(address) < 32 or len(address) > 44:
+    if not isinstance(address, str) or len(address) < 32 or len(address) > 44:
         return False
     
     # Basic pattern check for base58 characters
     pattern = r'^[1-9A-HJ-NP-Za-km-z]+$'
-    return bool(re.match(pattern, address))
+    if not re.match(pattern, address):
+        return False
+    
+    # Binary storage keeps the raw key, so the address must decode to exactly 32 bytes
+    if binary_addresses_enabled():
+        try:
+            decode_address(address)
+        except ValueError:
+            return False
+    return True
+
+def build_verification_details(wallet_address, result, existing_holder):
+    """Shape an eligibility engine result into the verify response"""
+    return {
+        'wallet_address': wallet_address,
+        'is_eligible': result['is_eligible'],
+        'verification_score': result['verification_score'],
+        'checks': {
+            'valid_format': True,
+            'not_duplicate': True,
+            'sufficient_activity': result['checks']['sufficient_activity'],
+            'not_blacklisted': True,
+            'account_exists': result['checks']['account_exists'],
+            'funded': result['checks']['funded']
+        },
+        'on_chain': {
+            'lamports': result['lamports'],
+            'signature_count': result['signature_count'],
+            'account_age_days': result['account_age_days']
+        },
+        'existing_holder': existing_holder.to_dict() if existing_holder else None
+    }
 
 @wallet_bp.route('/verify', methods=['POST'])
 def verify_wallet():
@@ -31,7 +71,9 @@ def verify_wallet():
                 'error': 'Wallet address is required'
             }), 400
         
-        wallet_address = data['wallet_address'].strip()
+        wallet_address = data['wallet_address']
+        if isinstance(wallet_address, str):
+            wallet_address = wallet_address.strip()
         
         # Validate wallet address format
         if not is_valid_solana_address(wallet_address):
@@ -57,28 +99,39 @@ def verify_wallet():
             wallet_address=wallet_address
         ).first()
         
-        # Mock verification logic (in production, this would check on-chain data)
-        verification_score = 85  # Mock score
-        is_eligible = verification_score >= 70
+        # On-chain checks run on the eligibility engine; wait briefly, else hand back a status URL.
+        # ?wait= can only shorten the wait, so clients can't hold request threads
+        max_wait = current_app.config.get('ELIGIBILITY_WAIT_TIMEOUT', 2.0)
+        wait = request.args.get('wait', max_wait, type=float)
+        result = get_eligibility_engine().verify(wallet_address, timeout=min(max(wait, 0), max_wait))
         
-        verification_details = {
-            'wallet_address': wallet_address,
-            'is_eligible': is_eligible,
-            'verification_score': verification_score,
-            'checks': {
-                'valid_format': True,
-                'not_duplicate': True,
-                'sufficient_activity': verification_score >= 70,
-                'not_blacklisted': True
-            },
-            'existing_holder': existing_holder.to_dict() if existing_holder else None
-        }
+        if result is None:
+            return jsonify({
+                'success': True,
+                'data': {
+                    'wallet_address': wallet_address,
+                    'status': 'pending',
+                    'status_url': url_for('wallet.get_verification_status', wallet_address=wallet_address)
+                }
+            }), 202
         
         return jsonify({
             'success': True,
-            'data': verification_details
+            'data': build_verification_details(wallet_address, result, existing_holder)
         }), 200
         
+    except EligibilityBusy as e:
+        logger.warning(f"On-chain verification refused: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'On-chain verification is busy, please retry shortly'
+        }), 503
+    except RpcError as e:
+        logger.error(f"On-chain verification failed: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'On-chain verification is currently unavailable'
+        }), 502
     except Exception as e:
         logger.error(f"Error verifying wallet: {str(e)}")
         return jsonify({
@@ -86,6 +139,50 @@ def verify_wallet():
             'error': 'Failed to verify wallet address'
         }), 500
 
+@wallet_bp.route('/verify/status/<wallet_address>', methods=['GET'])
+def get_verification_status(wallet_address):
+    """Poll the result of a pending on-chain wallet verification"""
+    try:
+        state, result = get_eligibility_engine().status(wallet_address)
+        
+        if state == 'unknown':
+            return jsonify({
+                'success': False,
+                'error': 'No verification in progress for this wallet'
+            }), 404
+        
+        if state == 'pending':
+            return jsonify({
+                'success': True,
+                'data': {
+                    'wallet_address': wallet_address,
+                    'status': 'pending'
+                }
+            }), 202
+        
+        if state == 'error':
+            logger.error(f"On-chain verification failed: {result}")
+            return jsonify({
+                'success': False,
+                'error': 'On-chain verification is currently unavailable'
+            }), 502
+        
+        existing_holder = Holder.query.filter_by(
+            wallet_address=wallet_address
+        ).first()
+        
+        return jsonify({
+            'success': True,
+            'data': build_verification_details(wallet_address, result, existing_holder)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting verification status: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to retrieve verification status'
+        }), 500
+
 @wallet_bp.route('/balance/<wallet_address>', methods=['GET'])
 def get_wallet_balance(wallet_address):
     """Get TEOS balance for a specific wallet"""
@@ -108,8 +205,8 @@ def get_wallet_balance(wallet_address):
         
         balance_info = {
             'wallet_address': wallet_address,
-            'teos_balance': 0.0,
-            'contribution_amount': 0.0,
+            'teos_balance': 0,
+            'contribution_amount': 0,
             'verified': False,
             'last_updated': None
         }
@@ -130,6 +227,10 @@ def get_wallet_balance(wallet_address):
         elif contribution and not holder:
             balance_info['teos_balance'] = contribution.teos_amount
         
+        # Stored in base units; the response is in TEOS
+        balance_info['teos_balance'] = base_units_to_teos(balance_info['teos_balance'])
+        balance_info['contribution_amount'] = base_units_to_teos(balance_info['contribution_amount'])
+        
         return jsonify({
             'success': True,
             'data': balance_info
@@ -156,8 +257,10 @@ def register_holder():
                     'error': f'Missing required field: {field}'
                 }), 400
         
-        wallet_address = data['wallet_address'].strip()
-        teos_balance = float(data['teos_balance'])
+        wallet_address = data['wallet_address']
+        if isinstance(wallet_address, str):
+            wallet_address = wallet_address.strip()
+        teos_balance = teos_to_base_units(data['teos_balance'])
         verification_method = data.get('verification_method', 'manual')
         
         # Validate wallet address
@@ -216,7 +319,80 @@ def register_holder():
             'error': 'Failed to register holder'
         }), 500
 
+@wallet_bp.route('/holders/import', methods=['POST'])
+@admin_required
+def import_holders_bulk():
+    """Stream-import holders from CSV or NDJSON with native upserts"""
+    fmt = detect_format(request.content_type, request.args.get('format'))
+    if fmt is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unsupported format. Send text/csv or application/x-ndjson'
+        }), 400
+
+    batch_size = max(request.args.get('batch_size', DEFAULT_BATCH_SIZE, type=int), 1)
+    commit_every = max(request.args.get('commit_every', DEFAULT_COMMIT_EVERY, type=int), batch_size)
+    max_rejects = max(request.args.get('max_rejects', 1000, type=int), 0)
+    stream_events = request.args.get('stream', 'false').lower() == 'true'
+
+    def events():
+        rows = iter_rows(request.stream, fmt)
+        return import_holders(
+            rows, is_valid_solana_address,
+            batch_size=batch_size, commit_every=commit_every
+        )
+
+    if stream_events:
+        # One JSON event per line: rejects, progress after each commit, final summary
+        def generate():
+            try:
+                for event in events():
+                    if event['type'] == 'progress':
+                        logger.info(f"Holder import progress: {event['processed']} rows processed")
+                    yield json.dumps(event) + '\n'
+            except Exception as e:
+                logger.error(f"Error importing holders: {str(e)}")
+                yield json.dumps({'type': 'error', 'error': 'Failed to import holders'}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    try:
+        rejects = []
+        summary = None
+        for event in events():
+            if event['type'] == 'reject':
+                if len(rejects) < max_rejects:
+                    rejects.append({k: v for k, v in event.items() if k != 'type'})
+            elif event['type'] == 'progress':
+                logger.info(f"Holder import progress: {event['processed']} rows processed")
+            elif event['type'] == 'summary':
+                summary = {k: v for k, v in event.items() if k != 'type'}
+
+        logger.info(f"Holder import finished: {summary['upserted']} upserted, {summary['rejected']} rejected")
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'summary': summary,
+                'rejects': rejects,
+                'rejects_truncated': summary['rejected'] > len(rejects)
+            }
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error importing holders: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to import holders'
+        }), 500
+
 @wallet_bp.route('/search', methods=['GET'])
+@read_only
 def search_wallets():
     """Search for wallets by address or partial match"""
     try:
@@ -230,6 +406,17 @@ def search_wallets():
                 'error': 'Search query must be at least 3 characters'
             }), 400
         
+        # Binary address storage has no base58 text to match substrings against
+        exact_only = binary_addresses_enabled()
+        if exact_only and not is_valid_solana_address(query):
+            return jsonify({
+                'success': False,
+                'error': 'Partial address search is unavailable with binary address storage; provide a full address'
+            }), 400
+        
+        def address_filter(column):
+            return column == query if exact_only else column.like(f'%{query}%')
+        
         results = {
             'contributors': [],
             'holders': [],
@@ -239,7 +426,7 @@ def search_wallets():
         # Search contributors
         if search_type in ['contributors', 'all']:
             contributors = Contribution.query.filter(
-                Contribution.wallet_address.like(f'%{query}%')
+                address_filter(Contribution.wallet_address)
             ).limit(limit).all()
             
             results['contributors'] = [
@@ -253,7 +440,7 @@ def search_wallets():
         # Search holders
         if search_type in ['holders', 'all']:
             holders = Holder.query.filter(
-                Holder.wallet_address.like(f'%{query}%')
+                address_filter(Holder.wallet_address)
             ).limit(limit).all()
             
             results['holders'] = [
@@ -336,6 +523,7 @@ def bulk_verify_wallets():
             else:
                 results['not_found'].append(wallet_address)
         
+        increment_verified_contributors(len(results['verified']))
         db.session.commit()
         
         return jsonify({
@@ -0,0 +1,233 @@
+from datetime import datetime
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pages copied per backup step and pause between steps; with 4 KiB pages this
+# copies 4 MiB at a time and hands the database back to writers in between
+DEFAULT_PAGES_PER_STEP = 1024
+DEFAULT_STEP_PAUSE = 0.005
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def sqlite_path(engine):
+    """Return the database file behind a SQLAlchemy SQLite engine"""
+    if engine.dialect.name != 'sqlite' or not engine.url.database:
+        raise ValueError('Online backup requires a file-based SQLite database')
+    return os.path.abspath(engine.url.database)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def online_backup(source_path, dest_path, pages_per_step=DEFAULT_PAGES_PER_STEP,
+                  step_pause=DEFAULT_STEP_PAUSE, progress=None, should_cancel=None):
+    """Copy a live SQLite database with the online backup API.
+
+    The copy proceeds ``pages_per_step`` pages at a time and sleeps
+    ``step_pause`` seconds between steps, so writers are never blocked for
+    longer than one step. The result is a consistent snapshot even while
+    writes are in flight. ``progress(copied_pages, total_pages)`` is called
+    after every step. The copy is left in rollback journal mode.
+
+    In WAL mode the source connection pins a read snapshot for the whole
+    copy. Writers are unaffected, and the backup no longer restarts every
+    time another connection commits, which could otherwise keep it from
+    ever finishing on a busy database.
+    """
+    source = sqlite3.connect(source_path, timeout=30, isolation_level=None)
+    dest = sqlite3.connect(dest_path)
+    if source.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal':
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+
+    def on_step(status, remaining, total):
+        if should_cancel and should_cancel():
+            raise InterruptedError('Backup cancelled')
+        if progress:
+            progress(total - remaining, total)
+        if step_pause:
+            time.sleep(step_pause)
+
+    try:
+        source.backup(dest, pages=pages_per_step, progress=on_step)
+        # The copy inherits WAL mode from the source; without this, every
+        # later open of the file leaves -wal and -shm files next to it
+        dest.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        dest.close()
+        source.close()
+
+
+def use_rollback_journal(path):
+    """Switch a database file out of WAL mode so opening it creates no -wal/-shm files"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        conn.close()
+
+
+def integrity_check(path):
+    """Run PRAGMA integrity_check on a backup file; returns the problems found"""
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        rows = [row[0] for row in conn.execute('PRAGMA integrity_check')]
+    finally:
+        conn.close()
+    return [] if rows == ['ok'] else rows
+
+
+def gzip_file(source_path, dest_path, level=6):
+    """Stream a file through gzip in fixed-size chunks; returns the sha256 of the output"""
+    digest = hashlib.sha256()
+
+    class _HashingWriter:
+        def __init__(self, raw):
+            self.raw = raw
+
+        def write(self, data):
+            digest.update(data)
+            return self.raw.write(data)
+
+        def flush(self):
+            self.raw.flush()
+
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as raw:
+        with gzip.GzipFile(fileobj=_HashingWriter(raw), mode='wb', compresslevel=level) as out:
+            for chunk in iter(lambda: src.read(COPY_CHUNK_BYTES), b''):
+                out.write(chunk)
+    return digest.hexdigest()
+
+
+class BackupManager:
+    """Runs full and incremental backups of one database into a backup directory"""
+
+    def __init__(self, source_path, backup_dir, incremental_store=None):
+        self.source_path = source_path
+        self.backup_dir = backup_dir
+        self.incremental_store = incremental_store
+
+    @staticmethod
+    def _page_progress(progress):
+        def on_progress(copied, total):
+            progress(copied_pages=copied, total_pages=total,
+                     percent=round(100.0 * copied / total, 1) if total else 100.0)
+        return on_progress
+
+    def run_incremental(self, progress=None, should_cancel=None):
+        """Record an incremental restore point and return its summary"""
+        if self.incremental_store is None:
+            raise ValueError('Incremental backups are not configured')
+        progress = progress or (lambda **values: None)
+        started = time.perf_counter()
+        manifest = self.incremental_store.create(
+            self.source_path, progress=self._page_progress(progress), should_cancel=should_cancel
+        )
+        logger.info(f"Incremental backup recorded: {manifest['backup_id']} "
+                    f"({manifest['changed_pages']} of {manifest['page_count']} pages)")
+        return {
+            'backup_filename': manifest['data_file'],
+            'integrity': 'ok',
+            'size_bytes': manifest['data_bytes'],
+            'sha256': manifest['data_sha256'],
+            'manifest': manifest,
+            'duration_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def run_full(self, compress=False, verify=True, pages_per_step=DEFAULT_PAGES_PER_STEP,
+                 step_pause=DEFAULT_STEP_PAUSE, progress=None, should_cancel=None):
+        """Copy the database into a new backup file and return its summary.
+
+        ``progress(**values)`` receives page counts while copying and the
+        current ``phase``. Partial files are removed if the backup fails or
+        is cancelled.
+        """
+        progress = progress or (lambda **values: None)
+        started = time.perf_counter()
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        filename = f'app_backup_{timestamp}_{uuid.uuid4().hex[:6]}.db' + ('.gz' if compress else '')
+        os.makedirs(self.backup_dir, exist_ok=True)
+        final_path = os.path.join(self.backup_dir, filename)
+        db_path = final_path[:-3] if compress else final_path
+        partial_path = db_path + '.partial'
+
+        integrity = None
+        try:
+            progress(phase='copying', backup_filename=filename)
+            online_backup(self.source_path, partial_path, pages_per_step, step_pause,
+                          self._page_progress(progress), should_cancel)
+            if verify:
+                progress(phase='verifying')
+                problems = integrity_check(partial_path)
+                if problems:
+                    raise RuntimeError(f'Integrity check failed: {problems[:5]}')
+                integrity = 'ok'
+            if compress:
+                progress(phase='compressing')
+                sha256 = gzip_file(partial_path, final_path)
+                os.remove(partial_path)
+            else:
+                os.replace(partial_path, final_path)
+                sha256 = file_sha256(final_path)
+        except BaseException:
+            for path in (partial_path, final_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+
+        logger.info(f"Database backup created: {filename}")
+        return {
+            'backup_filename': filename,
+            'compressed': compress,
+            'integrity': integrity,
+            'size_bytes': os.path.getsize(final_path),
+            'sha256': sha256,
+            'duration_seconds': round(time.perf_counter() - started, 3)
+        }
+
+
+def backup_job(job, mode='full', compress=False, verify=True, pages_per_step=DEFAULT_PAGES_PER_STEP):
+    """Job handler for ``POST /api/admin/database/backup``"""
+    from src.services.jobs import JobCancelled
+
+    manager = get_backup_manager()
+    try:
+        if mode == 'incremental':
+            return manager.run_incremental(progress=job.progress, should_cancel=job.cancelled)
+        return manager.run_full(compress=compress, verify=verify, pages_per_step=pages_per_step,
+                                progress=job.progress, should_cancel=job.cancelled)
+    except InterruptedError:
+        raise JobCancelled()
+
+
+def get_backup_manager():
+    """Return the backup manager for the current app, creating it on first use"""
+    from flask import current_app
+    from src.models.user import db
+    from src.services.incremental_backup import IncrementalBackupStore
+
+    app = current_app._get_current_object()
+    manager = app.extensions.get('backup_manager')
+    if manager is None:
+        backup_dir = app.config.get('BACKUP_DIR') or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backups'
+        )
+        manager = BackupManager(
+            sqlite_path(db.engine), backup_dir,
+            incremental_store=IncrementalBackupStore(os.path.join(backup_dir, 'incremental'))
+        )
+        app.extensions['backup_manager'] = manager
+    return manager
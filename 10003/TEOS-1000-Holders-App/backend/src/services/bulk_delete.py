@@ -0,0 +1,136 @@
+from src.models.contribution import db, Contribution
+from src.models.amounts import lamports_to_sol, base_units_to_teos
+from src.services.pool_stats import apply_contribution_deltas
+from sqlalchemy import select, delete, func, case
+from datetime import datetime, timedelta
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _parse_datetime(value, field):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an ISO 8601 timestamp')
+
+
+def build_filters(contribution_ids=None, wallet_addresses=None, created_from=None, created_to=None,
+                  unverified_older_than_days=None):
+    """Translate bulk delete criteria into SQL conditions; all given criteria must match.
+
+    Raises ValueError for malformed criteria or when none are given, so a
+    request can never delete every contribution by accident.
+    """
+    conditions = []
+    if contribution_ids:
+        conditions.append(Contribution.id.in_(sorted(set(int(i) for i in contribution_ids))))
+    if wallet_addresses:
+        conditions.append(Contribution.wallet_address.in_(sorted(set(wallet_addresses))))
+    if created_from:
+        conditions.append(Contribution.created_at >= _parse_datetime(created_from, 'created_from'))
+    if created_to:
+        conditions.append(Contribution.created_at < _parse_datetime(created_to, 'created_to'))
+    if unverified_older_than_days is not None:
+        days = int(unverified_older_than_days)
+        if days < 0:
+            raise ValueError('unverified_older_than_days must not be negative')
+        conditions.append(Contribution.verified.is_(False))
+        conditions.append(Contribution.created_at < datetime.utcnow() - timedelta(days=days))
+    if not conditions:
+        raise ValueError('Provide contribution_ids, wallet_addresses, a date range or unverified_older_than_days')
+    return conditions
+
+
+def _aggregate(conditions):
+    verified = case((Contribution.verified.is_(True), 1), else_=0)
+    count, verified_count, sol, teos = db.session.execute(
+        select(
+            func.count(Contribution.id),
+            func.coalesce(func.sum(verified), 0),
+            func.coalesce(func.sum(Contribution.sol_amount), 0),
+            func.coalesce(func.sum(Contribution.teos_amount), 0)
+        ).where(*conditions)
+    ).one()
+    return {
+        'deleted_count': int(count),
+        'verified_deleted': int(verified_count),
+        'sol_removed': int(sol),
+        'teos_removed': int(teos)
+    }
+
+
+def _in_api_units(totals):
+    """Express removed amounts in SOL and TEOS for previews and job results"""
+    return {
+        **totals,
+        'sol_removed': lamports_to_sol(totals['sol_removed']),
+        'teos_removed': base_units_to_teos(totals['teos_removed'])
+    }
+
+
+def preview_bulk_delete(conditions):
+    """Return what a bulk delete would remove, from one aggregate query"""
+    result = _aggregate(conditions)
+    db.session.rollback()
+    return _in_api_units(result)
+
+
+def bulk_delete_contributions(conditions, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Delete matching contributions in chunks and adjust PoolStats by aggregated deltas.
+
+    Matching ids are walked in id order. Each chunk runs one DELETE that
+    re-applies the filter and returns the removed rows' amounts, and one
+    PoolStats UPDATE (milestones re-evaluated), then commits, so the
+    counters always match the rows that are gone and the write lock is
+    held for one chunk at a time. ``progress`` is called
+    with the running totals (amounts in base units) after every chunk.
+    """
+    totals = {'deleted_count': 0, 'verified_deleted': 0, 'sol_removed': 0, 'teos_removed': 0, 'chunks': 0}
+    last_id = 0
+    while True:
+        ids = db.session.execute(
+            select(Contribution.id).where(*conditions, Contribution.id > last_id)
+            .order_by(Contribution.id).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            db.session.rollback()
+            break
+        last_id = ids[-1]
+
+        # The filter is applied again: a row changed since the id SELECT (verified, say) is kept.
+        # Counters come from the rows the DELETE returns, so they match what was removed
+        deleted = db.session.execute(
+            delete(Contribution).where(Contribution.id.in_(ids), *conditions)
+            .returning(Contribution.verified, Contribution.sol_amount, Contribution.teos_amount)
+        ).all()
+        chunk = {
+            'deleted_count': len(deleted),
+            'verified_deleted': sum(1 for row in deleted if row.verified),
+            'sol_removed': sum(row.sol_amount for row in deleted),
+            'teos_removed': sum(row.teos_amount for row in deleted)
+        }
+        apply_contribution_deltas(
+            total_contributors=-chunk['deleted_count'],
+            verified_contributors=-chunk['verified_deleted'],
+            sol_amount=-chunk['sol_removed'],
+            teos_amount=-chunk['teos_removed']
+        )
+        db.session.commit()
+
+        for key, value in chunk.items():
+            totals[key] += value
+        totals['chunks'] += 1
+        if progress:
+            progress(dict(totals))
+    return totals
+
+
+def bulk_delete_job(job, chunk_size=DEFAULT_CHUNK_SIZE, **criteria):
+    """Job handler for ``POST /api/admin/contributions/bulk-delete``; stops between chunks when cancelled"""
+    def on_chunk(totals):
+        job.progress(**_in_api_units(totals))
+        job.check_cancelled()
+
+    return _in_api_units(
+        bulk_delete_contributions(build_filters(**criteria), chunk_size=chunk_size, progress=on_chunk)
+    )
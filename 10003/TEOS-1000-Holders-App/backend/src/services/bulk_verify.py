@@ -0,0 +1,67 @@
+from src.models.contribution import db, Contribution
+from src.services.pool_stats import increment_verified_contributors
+from sqlalchemy import select, update
+from datetime import datetime
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _verify_ids(ids):
+    """Flip one chunk of ids to verified and bump the pool counters in the same transaction"""
+    verified = db.session.execute(
+        update(Contribution).where(
+            Contribution.id.in_(ids),
+            Contribution.verified.is_(False)
+        ).values(verified=True, updated_at=datetime.utcnow())
+    ).rowcount
+    increment_verified_contributors(verified)
+    db.session.commit()
+    return verified
+
+
+def bulk_verify_contributions(contribution_ids=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Verify contributions with set-based UPDATEs, one short transaction per chunk.
+
+    With ``contribution_ids`` only those rows are considered, otherwise every
+    unverified contribution is walked in id order. No ORM objects are loaded.
+    Each chunk commits its UPDATE together with the matching PoolStats
+    increment, so the counters never drift even if the run stops midway, and
+    other writers get the database between chunks. ``progress`` is called
+    with the running totals after every chunk.
+    """
+    totals = {'verified_count': 0, 'chunks': 0}
+
+    def chunk_done(verified):
+        totals['verified_count'] += verified
+        totals['chunks'] += 1
+        if progress:
+            progress(dict(totals))
+
+    if contribution_ids:
+        ids = sorted(set(int(i) for i in contribution_ids))
+        for offset in range(0, len(ids), chunk_size):
+            chunk_done(_verify_ids(ids[offset:offset + chunk_size]))
+        return totals
+
+    last_id = 0
+    while True:
+        ids = db.session.execute(
+            select(Contribution.id).where(
+                Contribution.verified.is_(False),
+                Contribution.id > last_id
+            ).order_by(Contribution.id).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            break
+        last_id = ids[-1]
+        chunk_done(_verify_ids(ids))
+    return totals
+
+
+def bulk_verify_job(job, contribution_ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Job handler for ``POST /api/admin/contributions/bulk-verify``; stops between chunks when cancelled"""
+    def on_chunk(totals):
+        job.progress(**totals)
+        job.check_cancelled()
+
+    return bulk_verify_contributions(contribution_ids, chunk_size=chunk_size, progress=on_chunk)
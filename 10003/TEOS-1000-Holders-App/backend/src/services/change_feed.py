@@ -0,0 +1,137 @@
+from src.models.user import db
+from src.models.change_log import ChangeLog
+from src.models.contribution import Contribution, PoolStats, Holder
+from sqlalchemy import select, delete, func
+from datetime import datetime, timedelta
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 5000
+DEFAULT_RETENTION_HOURS = 72
+# Minimum seconds between retention passes triggered by feed reads
+PRUNE_INTERVAL = 300.0
+
+TABLES = {model.__tablename__: model.__table__ for model in (Contribution, Holder, PoolStats)}
+
+
+def serialize_row(row):
+    """Column values of a replicated row as JSON-safe values; amounts stay integer base units"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row._mapping.items()}
+
+
+class ChangeFeed:
+    """Serves the change_log to replicas and prunes it.
+
+    A page of changes carries each touched row's current state rather than
+    the state at change time: a replica that applies pages in order ends up
+    equal to the primary as of its last page, and rows touched many times
+    in one page are sent once. Rows missing from ``rows`` were deleted.
+    """
+
+    def __init__(self, retention_hours=DEFAULT_RETENTION_HOURS, prune_interval=PRUNE_INTERVAL):
+        self.retention_hours = retention_hours
+        self.prune_interval = prune_interval
+        self._pruned_at = None
+        self._prune_lock = threading.Lock()
+
+    def bounds(self):
+        """(oldest, newest) sequence numbers still in the log; both None when it is empty"""
+        return db.session.execute(select(func.min(ChangeLog.id), func.max(ChangeLog.id))).one()
+
+    def changes(self, after, limit=DEFAULT_BATCH_SIZE):
+        self.maybe_prune()
+        oldest, head = self.bounds()
+        if oldest is not None and after + 1 < oldest:
+            # Entries the replica hasn't seen were pruned; only a snapshot can catch it up
+            return {'changes': [], 'rows': {}, 'next_after': after, 'head_seq': head,
+                    'oldest_seq': oldest, 'snapshot_required': True}
+
+        changes = db.session.execute(
+            select(ChangeLog.id, ChangeLog.table_name, ChangeLog.row_id, ChangeLog.operation, ChangeLog.created_at)
+            .where(ChangeLog.id > after).order_by(ChangeLog.id).limit(min(limit, MAX_BATCH_SIZE))
+        ).all()
+        touched = {}
+        for change in changes:
+            touched.setdefault(change.table_name, set()).add(change.row_id)
+        rows = {}
+        for table_name, row_ids in touched.items():
+            table = TABLES[table_name]
+            rows[table_name] = [serialize_row(row) for row in db.session.execute(
+                select(table).where(table.c.id.in_(row_ids)).order_by(table.c.id)
+            )]
+        db.session.rollback()
+        next_after = changes[-1].id if changes else after
+
+        return {
+            'changes': [{
+                'seq': change.id,
+                'table': change.table_name,
+                'row_id': change.row_id,
+                'operation': change.operation,
+                'created_at': change.created_at.isoformat() if change.created_at else None
+            } for change in changes],
+            'rows': rows,
+            'next_after': next_after,
+            # Changes committed after the bounds were read can be on this page
+            'head_seq': max(head or 0, next_after),
+            'oldest_seq': oldest,
+            'snapshot_required': False
+        }
+
+    def snapshot(self, table_name, after_id=0, limit=DEFAULT_BATCH_SIZE):
+        """One page of a table by id. ``head_seq`` is read first, so changes after it cover anything the page misses"""
+        table = TABLES[table_name]
+        head = self.bounds()[1]
+        rows = [serialize_row(row) for row in db.session.execute(
+            select(table).where(table.c.id > after_id).order_by(table.c.id).limit(min(limit, MAX_BATCH_SIZE))
+        )]
+        db.session.rollback()
+        return {
+            'table': table_name,
+            'rows': rows,
+            'next_after_id': rows[-1]['id'] if rows else after_id,
+            'complete': len(rows) < min(limit, MAX_BATCH_SIZE),
+            'head_seq': head or 0
+        }
+
+    def maybe_prune(self):
+        """Prune at most once per ``prune_interval`` seconds in this process"""
+        if not self.retention_hours:
+            return 0
+        now = time.monotonic()
+        with self._prune_lock:
+            if self._pruned_at is not None and now - self._pruned_at < self.prune_interval:
+                return 0
+            self._pruned_at = now
+        return self.prune()
+
+    def prune(self):
+        """Delete entries older than the retention, always keeping the newest so ``head_seq`` survives"""
+        cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+        with db.engine.begin() as conn:
+            newest = conn.execute(select(func.max(ChangeLog.id))).scalar()
+            if newest is None:
+                return 0
+            pruned = conn.execute(delete(ChangeLog).where(
+                ChangeLog.created_at < cutoff, ChangeLog.id < newest
+            )).rowcount
+        if pruned:
+            logger.info(f"Pruned {pruned} change log entries older than {self.retention_hours:g} hours")
+        return pruned
+
+
+def get_change_feed():
+    """Return the change feed for the current app, creating it on first use"""
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    feed = app.extensions.get('change_feed')
+    if feed is None:
+        feed = ChangeFeed(retention_hours=app.config.get('CHANGE_LOG_RETENTION_HOURS', DEFAULT_RETENTION_HOURS))
+        app.extensions['change_feed'] = feed
+    return feed
@@ -0,0 +1,230 @@
+from src.models.contribution import db, Contribution, ContributionFailure
+from src.models.dialects import upsert_insert
+from src.services.pool_stats import increment_verified_contributors
+from src.services.solana_rpc import SolanaRpcClient, RpcError, DEFAULT_RPC_URL
+from sqlalchemy import select, update, exists
+from datetime import datetime
+import threading
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# getSignatureStatuses accepts at most 256 signatures per call
+MAX_SIGNATURES_PER_CALL = 256
+
+CONFIRMED_STATUSES = ('confirmed', 'finalized')
+
+# Checks of a signature that is not found or not yet confirmed before giving up;
+# with the default backoff this is a little over two hours
+DEFAULT_MAX_ATTEMPTS = 20
+
+
+class ConfirmationWorker:
+    """Confirms pending contributions by checking their transaction signatures.
+
+    Each pass walks unverified contributions in id order, checks up to 256
+    signatures per ``getSignatureStatuses`` call and flips confirmed rows plus
+    the pool counters in one transaction per batch. The ``verified = 0`` guard
+    on the UPDATE makes passes idempotent, so several workers (or a retried
+    pass) never double count. Signatures that are not found yet are retried
+    with exponential backoff, up to ``max_attempts`` checks. Contributions
+    whose transaction failed on-chain, or ran out of attempts, are recorded
+    in contribution_failures and no longer checked. Attempt counts are kept
+    in memory, so a restart starts them over.
+    """
+
+    def __init__(self, app, client, batch_size=MAX_SIGNATURES_PER_CALL, interval=5.0,
+                 retry_base=5.0, retry_max=600.0, error_backoff_max=300.0,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.app = app
+        self.client = client
+        self.batch_size = min(batch_size, MAX_SIGNATURES_PER_CALL)
+        self.interval = interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.error_backoff_max = error_backoff_max
+        self.max_attempts = max_attempts
+        self.totals = {'passes': 0, 'checked': 0, 'confirmed': 0, 'failed': 0, 'timed_out': 0, 'seconds': 0.0}
+        self._retry = {}  # contribution id -> (attempts, next_check_at)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _due(self, contribution_id, now):
+        entry = self._retry.get(contribution_id)
+        return entry is None or entry[1] <= now
+
+    def _defer(self, contribution_id, now):
+        attempts = self._retry.get(contribution_id, (0, 0))[0] + 1
+        delay = min(self.retry_base * (2 ** (attempts - 1)), self.retry_max)
+        self._retry[contribution_id] = (attempts, now + delay)
+        return attempts
+
+    def _check_batch(self, rows):
+        """Return (confirmed_ids, failed, pending_ids) for a batch of (id, signature).
+
+        ``failed`` holds (id, err) pairs with the on-chain error.
+        """
+        statuses = self.client.call('getSignatureStatuses', [
+            [signature for _, signature in rows],
+            {'searchTransactionHistory': True}
+        ])
+        values = (statuses or {}).get('value') or []
+
+        confirmed, failed, pending = [], [], []
+        for index, (contribution_id, _) in enumerate(rows):
+            status = values[index] if index < len(values) else None
+            if status is None:
+                pending.append(contribution_id)
+            elif status.get('err') is not None:
+                failed.append((contribution_id, status['err']))
+            elif status.get('confirmationStatus') in CONFIRMED_STATUSES:
+                confirmed.append(contribution_id)
+            else:
+                pending.append(contribution_id)
+        return confirmed, failed, pending
+
+    def _failure(self, contribution_id, signature, reason, error, attempts):
+        return {
+            'contribution_id': contribution_id, 'transaction_hash': signature, 'reason': reason,
+            'error': error, 'attempts': attempts, 'created_at': datetime.utcnow()
+        }
+
+    def _record_failures(self, failures):
+        """Insert failure rows; one already recorded by another worker is kept"""
+        stmt = upsert_insert(db.engine.dialect.name)(ContributionFailure.__table__)
+        db.session.execute(stmt.on_conflict_do_nothing(), failures)
+        db.session.commit()
+
+    def run_once(self):
+        """Run a single pass over pending contributions and return its counters"""
+        started = time.perf_counter()
+        result = {'checked': 0, 'confirmed': 0, 'failed': 0, 'timed_out': 0, 'pending': 0}
+        now = time.monotonic()
+        last_id = 0
+        seen = set()
+
+        with self.app.app_context():
+            while not self._stop.is_set():
+                rows = db.session.execute(
+                    select(Contribution.id, Contribution.transaction_hash).where(
+                        Contribution.verified.is_(False),
+                        Contribution.transaction_hash.is_not(None),
+                        Contribution.id > last_id,
+                        ~exists().where(
+                            ContributionFailure.contribution_id == Contribution.id,
+                            ContributionFailure.transaction_hash == Contribution.transaction_hash
+                        )
+                    ).order_by(Contribution.id).limit(self.batch_size * 4)
+                ).all()
+                db.session.rollback()  # release the read snapshot before RPC I/O
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                seen.update(row[0] for row in rows)
+
+                due = [(row[0], row[1]) for row in rows if self._due(row[0], now)]
+                for offset in range(0, len(due), self.batch_size):
+                    batch = due[offset:offset + self.batch_size]
+                    confirmed, failed, pending = self._check_batch(batch)
+
+                    if confirmed:
+                        flipped = db.session.execute(
+                            update(Contribution).where(
+                                Contribution.id.in_(confirmed),
+                                Contribution.verified.is_(False)
+                            ).values(verified=True, updated_at=datetime.utcnow())
+                        ).rowcount
+                        increment_verified_contributors(flipped)
+                        db.session.commit()
+                        result['confirmed'] += flipped
+
+                    signatures = dict(batch)
+                    failures = [
+                        self._failure(contribution_id, signatures[contribution_id], 'failed', json.dumps(err),
+                                      self._retry.get(contribution_id, (0, 0))[0] + 1)
+                        for contribution_id, err in failed
+                    ]
+                    checked_at = time.monotonic()
+                    for contribution_id in pending:
+                        attempts = self._defer(contribution_id, checked_at)
+                        if attempts >= self.max_attempts:
+                            failures.append(self._failure(
+                                contribution_id, signatures[contribution_id], 'timed_out',
+                                f'Not confirmed after {attempts} checks', attempts
+                            ))
+                    if failures:
+                        self._record_failures(failures)
+
+                    for contribution_id in confirmed:
+                        self._retry.pop(contribution_id, None)
+                    for failure in failures:
+                        self._retry.pop(failure['contribution_id'], None)
+
+                    timed_out = sum(1 for failure in failures if failure['reason'] == 'timed_out')
+                    result['checked'] += len(batch)
+                    result['failed'] += len(failed)
+                    result['timed_out'] += timed_out
+                    result['pending'] += len(pending) - timed_out
+
+            if not self._stop.is_set():
+                # Forget backoff state for rows that were verified or deleted elsewhere
+                self._retry = {k: v for k, v in self._retry.items() if k in seen}
+
+        elapsed = time.perf_counter() - started
+        result['seconds'] = round(elapsed, 4)
+        result['confirmations_per_second'] = round(result['confirmed'] / elapsed, 1) if elapsed else 0.0
+
+        self.totals['passes'] += 1
+        for key in ('checked', 'confirmed', 'failed', 'timed_out'):
+            self.totals[key] += result[key]
+        self.totals['seconds'] += elapsed
+        return result
+
+    def _loop(self):
+        backoff = self.interval
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                if result['confirmed']:
+                    logger.info(
+                        f"Confirmed {result['confirmed']} contributions "
+                        f"({result['confirmations_per_second']} confirmations/s)"
+                    )
+                backoff = self.interval
+            except RpcError as e:
+                backoff = min(backoff * 2, self.error_backoff_max)
+                logger.error(f"Confirmation pass failed, retrying in {backoff:.0f}s: {str(e)}")
+            except Exception as e:
+                backoff = min(backoff * 2, self.error_backoff_max)
+                logger.error(f"Error in confirmation worker: {str(e)}")
+            self._stop.wait(backoff)
+
+    def start(self):
+        """Start the background polling thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='confirmation-worker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+def create_confirmation_worker(app):
+    """Build a confirmation worker from the app configuration"""
+    client = SolanaRpcClient(
+        app.config.get('SOLANA_RPC_URL', DEFAULT_RPC_URL),
+        timeout=app.config.get('SOLANA_RPC_TIMEOUT', 10.0)
+    )
+    return ConfirmationWorker(
+        app, client,
+        batch_size=app.config.get('CONFIRMATION_BATCH_SIZE', MAX_SIGNATURES_PER_CALL),
+        interval=app.config.get('CONFIRMATION_INTERVAL', 5.0),
+        max_attempts=app.config.get('CONFIRMATION_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    )
@@ -0,0 +1,317 @@
+from src.models.user import db
+from src.models.verification import WalletVerification
+from src.models.dialects import upsert_insert
+from src.services.solana_rpc import SolanaRpcClient, RpcError, DEFAULT_RPC_URL
+from src.services.metrics import record_cache_lookup
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, delete
+import queue
+import json
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same pass mark the mock verification used
+ELIGIBILITY_THRESHOLD = 70
+
+# Scoring inputs
+MIN_FUNDED_LAMPORTS = 10_000_000  # 0.01 SOL
+ACTIVITY_TARGET_SIGNATURES = 50
+AGE_TARGET_DAYS = 90
+
+# Failed lookups are cached briefly so a flapping RPC isn't hammered
+ERROR_TTL_SECONDS = 5
+
+# Wallets waiting for a batch; further submissions are refused until it drains
+DEFAULT_MAX_QUEUE = 1000
+
+_engine_lock = threading.Lock()
+
+
+class EligibilityBusy(Exception):
+    """Raised by ``submit`` when the engine's queue is full"""
+
+
+def score_wallet(account_info, signatures, now=None):
+    """Compute the eligibility score and checks from raw RPC results"""
+    now = now or time.time()
+    account = (account_info or {}).get('value') if isinstance(account_info, dict) else None
+    lamports = account.get('lamports', 0) if account else 0
+    successful = [s for s in (signatures or []) if not s.get('err')]
+    block_times = [s['blockTime'] for s in successful if s.get('blockTime')]
+    age_days = (now - min(block_times)) / 86400 if block_times else 0
+
+    score = 0
+    if account:
+        score += 30
+    if lamports >= MIN_FUNDED_LAMPORTS:
+        score += 20
+    score += 30 * min(len(successful), ACTIVITY_TARGET_SIGNATURES) / ACTIVITY_TARGET_SIGNATURES
+    score += 20 * min(age_days, AGE_TARGET_DAYS) / AGE_TARGET_DAYS
+    score = int(round(score))
+
+    return {
+        'verification_score': score,
+        'is_eligible': score >= ELIGIBILITY_THRESHOLD,
+        'lamports': lamports,
+        'signature_count': len(successful),
+        'account_age_days': round(age_days, 1),
+        'checks': {
+            'account_exists': account is not None,
+            'funded': lamports >= MIN_FUNDED_LAMPORTS,
+            'sufficient_activity': len(successful) >= 5
+        }
+    }
+
+
+class VerificationStore:
+    """Verification states in the wallet_verifications table.
+
+    Only verifications handed back as 202 are recorded, so the status poll
+    can be answered by any worker process, not just the one running the
+    lookup. Rows expire with the engine's cache TTL; expired rows are
+    deleted whenever a new pending verification is recorded.
+    """
+
+    def __init__(self, app, ttl):
+        self.app = app
+        self.ttl = ttl
+
+    def track(self, wallet_address, future):
+        """Record a pending verification, then its outcome once ``future`` resolves"""
+        self._save(wallet_address, 'pending', self.ttl)
+        future.add_done_callback(lambda done: self._finish(wallet_address, done))
+
+    def _finish(self, wallet_address, future):
+        try:
+            error = future.exception()
+            if error is None:
+                self._save(wallet_address, 'done', self.ttl, result=json.dumps(future.result()))
+            else:
+                self._save(wallet_address, 'error', ERROR_TTL_SECONDS, error=str(error))
+        except Exception as e:
+            logger.error(f"Error recording verification for {wallet_address}: {str(e)}")
+
+    def _save(self, wallet_address, status, ttl, result=None, error=None):
+        now = datetime.utcnow()
+        values = {'status': status, 'result': result, 'error': error,
+                  'expires_at': now + timedelta(seconds=ttl), 'updated_at': now}
+        with self.app.app_context(), db.engine.begin() as conn:
+            stmt = upsert_insert(db.engine.dialect.name)(WalletVerification.__table__)
+            conn.execute(stmt.values(wallet_address=wallet_address, **values).on_conflict_do_update(
+                index_elements=[WalletVerification.__table__.c.wallet_address], set_=values
+            ))
+            if status == 'pending':
+                conn.execute(delete(WalletVerification).where(WalletVerification.expires_at < now))
+
+    def load(self, wallet_address):
+        """Return (state, result_or_error) as ``EligibilityEngine.status`` does"""
+        with self.app.app_context(), db.engine.connect() as conn:
+            row = conn.execute(select(WalletVerification).where(
+                WalletVerification.wallet_address == wallet_address
+            )).first()
+        if row is None or row.expires_at <= datetime.utcnow():
+            return 'unknown', None
+        if row.status == 'done':
+            return 'done', json.loads(row.result)
+        return row.status, row.error
+
+
+class EligibilityEngine:
+    """Verifies wallets on-chain off the request thread.
+
+    Submitted wallets are grouped into batched JSON-RPC requests and run on a
+    bounded worker pool. Results (and in-flight futures) are cached per wallet
+    with a TTL, so repeated checks of one wallet cost a single RPC round.
+    At most ``max_queue`` wallets wait for a batch and ``max_concurrency``
+    batches are handed to the pool at once; beyond that ``submit`` raises
+    EligibilityBusy. With a ``store``, verifications that outlive the
+    request are recorded for other worker processes.
+    """
+
+    def __init__(self, client, max_concurrency=4, batch_size=50, batch_wait=0.01,
+                 cache_ttl=300, cache_size=100000, signature_limit=100,
+                 max_queue=DEFAULT_MAX_QUEUE, store=None):
+        self.client = client
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.signature_limit = signature_limit
+        self.max_concurrency = max_concurrency
+        self.store = store
+        self._cache = OrderedDict()  # wallet -> (expires_at, future)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        # Batches handed to the pool; the dispatcher waits for a free slot
+        self._slots = threading.Semaphore(max_concurrency)
+        self._executor = None
+        self._dispatcher = None
+        self._closed = False
+
+    def _ensure_started(self):
+        # Threads are created on first use so the engine can be built before a
+        # pre-fork server forks its workers.
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix='eligibility'
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name='eligibility-dispatcher', daemon=True
+            )
+            self._dispatcher.start()
+
+    def submit(self, wallet_address):
+        """Return a future for the wallet's result, reusing cached or in-flight work"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(wallet_address)
+            if entry and entry[0] > now:
+                self._cache.move_to_end(wallet_address)
+                record_cache_lookup('eligibility', True)
+                return entry[1]
+            record_cache_lookup('eligibility', False)
+
+            future = Future()
+            self._cache[wallet_address] = (now + self.cache_ttl, future)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self._ensure_started()
+
+        try:
+            self._queue.put_nowait((wallet_address, future))
+        except queue.Full:
+            with self._lock:
+                entry = self._cache.get(wallet_address)
+                if entry and entry[1] is future:
+                    del self._cache[wallet_address]
+            error = EligibilityBusy(f'{self._queue.maxsize} wallets are already waiting for verification')
+            # Callers that picked the future up from the cache meanwhile fail the same way
+            future.set_exception(error)
+            raise error
+        return future
+
+    def verify(self, wallet_address, timeout):
+        """Wait up to ``timeout`` seconds; returns the result or None if still pending"""
+        future = self.submit(wallet_address)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            if self.store is not None:
+                self.store.track(wallet_address, future)
+            return None
+
+    def status(self, wallet_address):
+        """Return (state, result_or_error) for a previously submitted wallet"""
+        with self._lock:
+            entry = self._cache.get(wallet_address)
+        if not entry or entry[0] <= time.monotonic():
+            # Submitted to another worker process, if at all
+            return self.store.load(wallet_address) if self.store is not None else ('unknown', None)
+        future = entry[1]
+        if not future.done():
+            return 'pending', None
+        error = future.exception()
+        if error is not None:
+            return 'error', str(error)
+        return 'done', future.result()
+
+    def _dispatch_loop(self):
+        while not self._closed:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._closed = True
+                    break
+                batch.append(item)
+            while not self._slots.acquire(timeout=0.1):
+                if self._closed:
+                    return
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch):
+        try:
+            self._verify_batch(batch)
+        finally:
+            self._slots.release()
+
+    def _verify_batch(self, batch):
+        calls = []
+        for wallet_address, _ in batch:
+            calls.append(('getAccountInfo', [wallet_address, {'encoding': 'base64'}]))
+            calls.append(('getSignaturesForAddress', [wallet_address, {'limit': self.signature_limit}]))
+
+        try:
+            results = self.client.batch(calls)
+        except Exception as e:
+            logger.error(f"Eligibility RPC batch failed: {str(e)}")
+            results = [e] * len(calls)
+
+        now = time.time()
+        for index, (wallet_address, future) in enumerate(batch):
+            account_info, signatures = results[2 * index], results[2 * index + 1]
+            error = next((r for r in (account_info, signatures) if isinstance(r, Exception)), None)
+            if error is not None:
+                self._expire_soon(wallet_address, future)
+                future.set_exception(error if isinstance(error, RpcError) else RpcError(str(error)))
+            else:
+                future.set_result(score_wallet(account_info, signatures, now))
+
+    def _expire_soon(self, wallet_address, future):
+        with self._lock:
+            entry = self._cache.get(wallet_address)
+            if entry and entry[1] is future:
+                self._cache[wallet_address] = (time.monotonic() + ERROR_TTL_SECONDS, future)
+
+    def shutdown(self):
+        """Stop the dispatcher and worker threads and close pooled connections"""
+        self._closed = True
+        if self._dispatcher is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # the dispatcher sees _closed once it takes the next wallet
+            self._dispatcher.join(timeout=1)
+            self._executor.shutdown(wait=True)
+        self.client.close()
+
+
+def get_eligibility_engine():
+    """Return the eligibility engine for the current app, creating it on first use"""
+    app = current_app._get_current_object()
+    engine = app.extensions.get('eligibility_engine')
+    if engine is None:
+        with _engine_lock:
+            engine = app.extensions.get('eligibility_engine')
+            if engine is None:
+                client = SolanaRpcClient(
+                    app.config.get('SOLANA_RPC_URL', DEFAULT_RPC_URL),
+                    pool_size=app.config.get('SOLANA_RPC_POOL_SIZE', 8),
+                    timeout=app.config.get('SOLANA_RPC_TIMEOUT', 10.0)
+                )
+                engine = EligibilityEngine(
+                    client,
+                    max_concurrency=app.config.get('ELIGIBILITY_MAX_CONCURRENCY', 4),
+                    batch_size=app.config.get('ELIGIBILITY_BATCH_SIZE', 50),
+                    cache_ttl=app.config.get('ELIGIBILITY_CACHE_TTL', 300),
+                    max_queue=app.config.get('ELIGIBILITY_MAX_QUEUE', DEFAULT_MAX_QUEUE),
+                    store=VerificationStore(app, app.config.get('ELIGIBILITY_CACHE_TTL', 300))
+                )
+                app.extensions['eligibility_engine'] = engine
+    return engine
@@ -0,0 +1,180 @@
+from src.models.contribution import db, Holder
+from src.models.amounts import teos_to_base_units
+from src.models.dialects import upsert_insert
+from datetime import datetime
+import csv
+import io
+import json
+
+# Rows are validated and written in batches of this size
+DEFAULT_BATCH_SIZE = 5000
+
+# A transaction is committed once at least this many rows were written
+DEFAULT_COMMIT_EVERY = 50000
+
+SUPPORTED_FORMATS = ('csv', 'ndjson')
+
+
+def detect_format(content_type, explicit=None):
+    """Pick the import format from an explicit value or the request content type"""
+    if explicit:
+        explicit = explicit.lower()
+        return explicit if explicit in SUPPORTED_FORMATS else None
+
+    content_type = (content_type or '').lower()
+    if 'csv' in content_type:
+        return 'csv'
+    if 'ndjson' in content_type or 'jsonlines' in content_type or 'json' in content_type:
+        return 'ndjson'
+    return None
+
+
+def iter_rows(stream, fmt):
+    """Yield (line_number, row_dict_or_None, error) tuples from a binary stream.
+
+    Only one line is held in memory at a time, so arbitrarily large uploads
+    are parsed in constant memory.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        missing = {'wallet_address', 'teos_balance'} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError('CSV header must include wallet_address and teos_balance')
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, 'Row must be a JSON object'
+            continue
+        yield line_number, row, None
+
+
+def _normalize_row(row, default_method):
+    """Convert a parsed row into holder column values or raise ValueError"""
+    wallet_address = row.get('wallet_address') or ''
+    if not isinstance(wallet_address, str):
+        raise ValueError('wallet_address must be a string')
+    wallet_address = wallet_address.strip()
+    if 'teos_balance' not in row or row['teos_balance'] in (None, ''):
+        raise ValueError('Missing required field: teos_balance')
+    try:
+        teos_balance = teos_to_base_units(row['teos_balance'])
+    except (TypeError, ValueError):
+        raise ValueError('Invalid numeric value for TEOS balance')
+    verification_method = row.get('verification_method') or default_method
+    return wallet_address, teos_balance, verification_method
+
+
+def _upsert_statement():
+    """INSERT ... ON CONFLICT(wallet_address) DO UPDATE for the holders table"""
+    stmt = upsert_insert(db.engine.dialect.name)(Holder.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[Holder.__table__.c.wallet_address],
+        set_={
+            'teos_balance': stmt.excluded.teos_balance,
+            'verification_method': stmt.excluded.verification_method,
+            'updated_at': stmt.excluded.updated_at,
+        }
+    )
+
+
+def _flush_batch(batch, validate, stats):
+    """Validate a batch of pending rows, upsert the valid ones and yield rejects"""
+    now = datetime.utcnow()
+    # Later rows for the same address win, matching sequential register-holder calls
+    values = {}
+    for line_number, wallet_address, teos_balance, verification_method in batch:
+        if not validate(wallet_address):
+            stats['rejected'] += 1
+            yield {
+                'line': line_number,
+                'wallet_address': wallet_address,
+                'reason': 'Invalid Solana wallet address format'
+            }
+            continue
+        values[wallet_address] = {
+            'wallet_address': wallet_address,
+            'teos_balance': teos_balance,
+            'verified': True,
+            'verification_method': verification_method,
+            'created_at': now,
+            'updated_at': now
+        }
+
+    if values:
+        db.session.execute(_upsert_statement(), list(values.values()))
+        stats['upserted'] += len(values)
+        stats['pending_commit'] += len(values)
+
+
+def import_holders(rows, validate, batch_size=DEFAULT_BATCH_SIZE,
+                   commit_every=DEFAULT_COMMIT_EVERY, default_method='import'):
+    """Upsert holders from an iterator of parsed rows.
+
+    Yields event dicts: ``reject`` for every rejected row, ``progress`` after
+    each committed transaction and a final ``summary``. Memory use is bounded
+    by ``batch_size`` regardless of the input size.
+    """
+    stats = {'processed': 0, 'upserted': 0, 'rejected': 0, 'pending_commit': 0, 'transactions': 0}
+    batch = []
+
+    def progress():
+        return {
+            'type': 'progress',
+            'processed': stats['processed'],
+            'upserted': stats['upserted'],
+            'rejected': stats['rejected']
+        }
+
+    try:
+        for line_number, row, error in rows:
+            stats['processed'] += 1
+            if error is None:
+                try:
+                    batch.append((line_number, *_normalize_row(row, default_method)))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                stats['rejected'] += 1
+                yield {'type': 'reject', 'line': line_number, 'reason': error}
+                continue
+
+            if len(batch) >= batch_size:
+                for reject in _flush_batch(batch, validate, stats):
+                    yield {'type': 'reject', **reject}
+                batch = []
+                if stats['pending_commit'] >= commit_every:
+                    db.session.commit()
+                    stats['transactions'] += 1
+                    stats['pending_commit'] = 0
+                    yield progress()
+
+        if batch:
+            for reject in _flush_batch(batch, validate, stats):
+                yield {'type': 'reject', **reject}
+        db.session.commit()
+        if stats['pending_commit']:
+            stats['transactions'] += 1
+    except Exception:
+        db.session.rollback()
+        raise
+
+    yield {
+        'type': 'summary',
+        'processed': stats['processed'],
+        'upserted': stats['upserted'],
+        'rejected': stats['rejected'],
+        'transactions': stats['transactions']
+    }
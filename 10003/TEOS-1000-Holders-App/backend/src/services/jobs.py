@@ -0,0 +1,279 @@
+from src.models.user import db
+from src.models.job import Job, OPEN_STATUSES
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+import socket
+import json
+import time
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 100
+DEFAULT_RETENTION_DAYS = 30
+
+# Minimum seconds between progress writes for one job
+PROGRESS_INTERVAL = 1.0
+
+_runner_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler to stop after a cancellation request"""
+
+
+class JobQueueFull(Exception):
+    """Raised by ``submit`` when this process already holds ``max_pending`` jobs"""
+
+
+class JobContext:
+    """Handed to a job handler to report progress and observe cancellation.
+
+    ``progress(**values)`` merges values into the job's progress and writes
+    them to the jobs table at most once per ``PROGRESS_INTERVAL``; each write
+    also picks up a cancellation requested from another process.
+    """
+
+    def __init__(self, runner, job_id, params):
+        self.runner = runner
+        self.job_id = job_id
+        self.params = params
+        self.values = {}
+        self._cancel = threading.Event()
+        self._flushed_at = 0.0
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, **values):
+        self.values.update(values)
+        if time.monotonic() - self._flushed_at >= self.runner.progress_interval:
+            self.flush()
+
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        try:
+            if self.runner._write(self.job_id, progress=json.dumps(self.values)):
+                self._cancel.set()
+        except Exception as e:
+            # Progress is best effort; never fail the job because of it
+            logger.error(f"Error recording progress for job {self.job_id}: {str(e)}")
+
+
+class JobRunner:
+    """Runs long admin operations on a bounded thread pool, tracked in the jobs table.
+
+    Request threads only insert a ``queued`` row and hand the work to the
+    pool, so heavy operations never hold request-serving capacity. Handlers
+    are registered per kind, and a kind runs at most once at a time across
+    every process sharing the database: a unique partial index on open jobs
+    rejects a second one, however the submissions race.
+    """
+
+    def __init__(self, app, max_workers=DEFAULT_MAX_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 progress_interval=PROGRESS_INTERVAL):
+        self.app = app
+        self.max_pending = max_pending
+        self.progress_interval = progress_interval
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._handlers = {}  # kind -> handler
+        self._active = {}  # job id -> (future, context)
+        self._lock = threading.Lock()
+
+    def register(self, kind, handler):
+        """Register ``handler(context, **params)``; its return value becomes the job result"""
+        self._handlers[kind] = handler
+
+    def _write(self, job_id, **values):
+        """Update one job row on its own connection; returns its cancel_requested flag"""
+        values['updated_at'] = datetime.utcnow()
+        with db.engine.begin() as conn:
+            conn.execute(update(Job).where(Job.id == job_id).values(**values))
+            return bool(conn.execute(select(Job.cancel_requested).where(Job.id == job_id)).scalar())
+
+    def submit(self, kind, params=None):
+        """Queue a job; returns its dict, or None if a job of this kind is open"""
+        if kind not in self._handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+        handler = self._handlers[kind]
+        params = params or {}
+
+        with self._lock:
+            if len(self._active) >= self.max_pending:
+                raise JobQueueFull(f'{len(self._active)} jobs are already queued or running')
+            job_id = uuid.uuid4().hex[:12]
+            try:
+                with db.engine.begin() as conn:
+                    if conn.execute(
+                        select(Job.id).where(Job.kind == kind, Job.status.in_(OPEN_STATUSES)).limit(1)
+                    ).first():
+                        return None
+                    now = datetime.utcnow()
+                    conn.execute(Job.__table__.insert().values(
+                        id=job_id, kind=kind, status='queued', params=json.dumps(params),
+                        cancel_requested=False, owner=self.owner, created_at=now, updated_at=now
+                    ))
+            except IntegrityError:
+                # Another process queued this kind between the check and the insert
+                return None
+            context = JobContext(self, job_id, params)
+            future = self._executor.submit(self._run, context, handler)
+            self._active[job_id] = (future, context)
+
+        logger.info(f"Job {job_id} ({kind}) queued")
+        return self.get(job_id)
+
+    def _run(self, context, handler):
+        job_id = context.job_id
+        try:
+            with self.app.app_context():
+                if self._write(job_id, status='running', started_at=datetime.utcnow()):
+                    raise JobCancelled()
+                try:
+                    result = handler(context, **context.params)
+                    status, values = 'completed', {'result': json.dumps(result)}
+                except JobCancelled:
+                    db.session.rollback()
+                    status, values = 'cancelled', {}
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Job {job_id} failed: {str(e)}")
+                    status, values = 'failed', {'error': str(e)}
+                self._write(job_id, status=status, progress=json.dumps(context.values),
+                            finished_at=datetime.utcnow(), **values)
+                logger.info(f"Job {job_id} {status}")
+        except JobCancelled:
+            with self.app.app_context():
+                self._write(job_id, status='cancelled', finished_at=datetime.utcnow())
+        except Exception as e:
+            logger.error(f"Error running job {job_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+
+    def get(self, job_id):
+        job = db.session.get(Job, job_id)
+        return job.to_dict() if job else None
+
+    def list(self, kind=None, status=None, limit=50):
+        query = select(Job).order_by(Job.created_at.desc()).limit(limit)
+        if kind:
+            query = query.where(Job.kind == kind)
+        if status:
+            query = query.where(Job.status == status)
+        return [job.to_dict() for job in db.session.execute(query).scalars()]
+
+    def cancel(self, job_id):
+        """Request cancellation; returns the job dict or None if it doesn't exist.
+
+        A job still waiting in this process's queue is cancelled at once. A
+        running job stops at its next cancellation check, including jobs
+        owned by another process, which see the flag on their next progress
+        write.
+        """
+        with self._lock:
+            entry = self._active.get(job_id)
+        if entry:
+            future, context = entry
+            context._cancel.set()
+            if future.cancel():
+                with self._lock:
+                    self._active.pop(job_id, None)
+                self._write(job_id, status='cancelled', cancel_requested=True, finished_at=datetime.utcnow())
+                return self.get(job_id)
+
+        with db.engine.begin() as conn:
+            conn.execute(update(Job).where(
+                Job.id == job_id, Job.status.in_(OPEN_STATUSES)
+            ).values(cancel_requested=True, updated_at=datetime.utcnow()))
+        return self.get(job_id)
+
+    def recover(self, retention_days=DEFAULT_RETENTION_DAYS):
+        """Fail jobs orphaned by a dead process on this host and prune old finished jobs"""
+        hostname = socket.gethostname()
+        orphaned = []
+        for job_id, owner in db.session.execute(
+            select(Job.id, Job.owner).where(Job.status.in_(OPEN_STATUSES))
+        ).all():
+            host, _, pid = (owner or '').rpartition(':')
+            if host == hostname and pid.isdigit() and not _pid_alive(int(pid)):
+                orphaned.append(job_id)
+        db.session.rollback()
+
+        with db.engine.begin() as conn:
+            if orphaned:
+                conn.execute(update(Job).where(
+                    Job.id.in_(orphaned), Job.status.in_(OPEN_STATUSES)
+                ).values(status='failed', error='Interrupted by a server restart',
+                         finished_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+                logger.info(f"Marked {len(orphaned)} interrupted jobs as failed")
+            if retention_days:
+                conn.execute(delete(Job).where(
+                    Job.status.in_(FINISHED_STATUSES),
+                    Job.created_at < datetime.utcnow() - timedelta(days=retention_days)
+                ))
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            contexts = [context for _, context in self._active.values()]
+        for context in contexts:
+            context._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _register_admin_jobs(runner):
+    from src.services.bulk_verify import bulk_verify_job
+    from src.services.bulk_delete import bulk_delete_job
+    from src.services.backup import backup_job
+    from src.services.reconcile import reconcile_job
+
+    runner.register('bulk_verify', bulk_verify_job)
+    runner.register('bulk_delete', bulk_delete_job)
+    runner.register('backup', backup_job)
+    runner.register('reconcile', reconcile_job)
+
+
+def get_job_runner():
+    """Return the job runner for the current app, creating it on first use"""
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    runner = app.extensions.get('job_runner')
+    if runner is None:
+        with _runner_lock:
+            runner = app.extensions.get('job_runner')
+            if runner is None:
+                runner = JobRunner(
+                    app,
+                    max_workers=app.config.get('JOB_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                    max_pending=app.config.get('JOB_MAX_PENDING', DEFAULT_MAX_PENDING)
+                )
+                _register_admin_jobs(runner)
+                runner.recover(app.config.get('JOB_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+                app.extensions['job_runner'] = runner
+    return runner
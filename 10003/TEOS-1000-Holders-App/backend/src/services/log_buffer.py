@@ -0,0 +1,180 @@
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import itertools
+import logging
+import os
+import queue
+import sys
+
+DEFAULT_CAPACITY = 5000
+
+# Records waiting for the listener thread; beyond this new records are dropped
+QUEUE_CAPACITY = 10000
+
+LOG_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records in a bounded in-memory ring.
+
+    Appends go to a ``deque(maxlen=...)`` and sequence numbers come from an
+    ``itertools.count``; both are atomic under the GIL, so ``handle`` skips
+    the per-handler lock entirely. Each record gets a sequence number that
+    readers use as a cursor for tailing.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=logging.NOTSET):
+        super().__init__(level)
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._sequence = itertools.count(1)
+
+    def createLock(self):
+        self.lock = None
+
+    def handle(self, record):
+        if self.filter(record):
+            self.emit(record)
+        return record
+
+    def emit(self, record):
+        self._records.append((
+            next(self._sequence),
+            record.created,
+            record.levelno,
+            record.levelname,
+            record.name,
+            record.module,
+            record.getMessage()
+        ))
+
+    def query(self, after=0, min_level=logging.NOTSET, module=None, since=None, until=None, limit=100):
+        """Return (records, next_cursor, truncated) for records with sequence > ``after``.
+
+        ``module`` matches the source module (``admin``) or a logger name
+        prefix (``src.routes``); ``since``/``until`` are epoch seconds.
+        ``truncated`` is True when records after the cursor were already
+        evicted from the ring.
+        """
+        snapshot = list(self._records)
+        truncated = bool(snapshot) and after > 0 and snapshot[0][0] > after + 1
+
+        results = []
+        next_cursor = after
+        for seq, created, levelno, levelname, name, source_module, message in snapshot:
+            if seq <= after:
+                continue
+            next_cursor = seq
+            if levelno < min_level:
+                continue
+            if module and source_module != module and not name.startswith(module):
+                continue
+            if since is not None and created < since:
+                continue
+            if until is not None and created > until:
+                continue
+            results.append({
+                'id': seq,
+                'timestamp': datetime.utcfromtimestamp(created).isoformat(),
+                'level': levelname,
+                'logger': name,
+                'module': source_module,
+                'message': message
+            })
+            if len(results) >= limit:
+                break
+        return results, next_cursor, truncated
+
+
+class LeanQueueHandler(QueueHandler):
+    """QueueHandler that does the minimum on the calling thread.
+
+    The stock ``prepare`` formats the record and copies it; here the message
+    is merged in place (this is the only root handler) and all formatting is
+    left to the listener thread.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record):
+        # Never block a request thread on a backed-up sink; count what was shed instead
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LeanQueueHandler.dropped += 1
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _BlockingStopListener(QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; wait for room rather than raising
+        self.queue.put(self._sentinel)
+
+
+_exception_formatter = logging.Formatter()
+_ring_handler = None
+_listener = None
+
+
+def _start_listener(log_queue, handlers):
+    global _listener
+    _listener = _BlockingStopListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def configure_logging(level=logging.INFO, capacity=DEFAULT_CAPACITY):
+    """Install the application's logging once.
+
+    The root logger gets a single ``QueueHandler``, so request threads only
+    enqueue records. A listener thread writes them to stderr and to the ring
+    buffer served by ``/api/admin/logs/recent``. Repeated calls are no-ops.
+    """
+    global _ring_handler
+    if _ring_handler is not None:
+        return _ring_handler
+
+    _ring_handler = RingBufferHandler(capacity)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = (stream_handler, _ring_handler)
+
+    queue_handler = LeanQueueHandler(queue.Queue(maxsize=QUEUE_CAPACITY))
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _start_listener(queue_handler.queue, handlers)
+    atexit.register(shutdown_logging)
+
+    def restart_in_child():
+        # The listener thread doesn't survive fork(), and the inherited queue's
+        # condition still lists the parent thread as a waiter, which would
+        # swallow a notification; give each forked worker a fresh queue and listener
+        queue_handler.queue = queue.Queue(maxsize=QUEUE_CAPACITY)
+        _start_listener(queue_handler.queue, handlers)
+
+    os.register_at_fork(after_in_child=restart_in_child)
+    return _ring_handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_ring_buffer():
+    """Return the installed ring buffer handler (None before configure_logging)"""
+    return _ring_handler
@@ -0,0 +1,297 @@
+from flask import request, Response, current_app, has_app_context
+from src.models.amounts import LAMPORTS_PER_SOL, TEOS_BASE_UNITS
+import threading
+import atexit
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+POOL_GAUGES = (
+    ('total_contributors', 'Contributors recorded in pool stats'),
+    ('verified_contributors', 'Verified contributors recorded in pool stats'),
+    ('total_sol_contributed', 'SOL contributed to the pool'),
+    ('total_sol_locked', 'SOL currently locked in the pool'),
+    ('total_teos_distributed', 'TEOS distributed to contributors'),
+    ('trading_unlocked', '1 once private trading is unlocked'),
+    ('sol_unlocked', '1 once locked SOL is released'),
+)
+# Amount counters are stored in base units and exported in SOL and TEOS
+GAUGE_DIVISORS = {
+    'total_sol_contributed': LAMPORTS_PER_SOL,
+    'total_sol_locked': LAMPORTS_PER_SOL,
+    'total_teos_distributed': TEOS_BASE_UNITS,
+}
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class _RequestMetrics:
+    """One app's Prometheus instruments, fed from a per-process buffer.
+
+    Request and SQL hooks only add to plain in-memory accumulators under
+    one lock. A flusher thread moves the totals into the Prometheus
+    instruments every ``flush_interval`` seconds, and so does every scrape.
+    That keeps the request path at a few dict updates even in multi-process
+    mode, where each instrument update is a locked write to a
+    memory-mapped file. Histogram samples are kept as raw values and
+    replayed through ``observe()`` when flushed. The instruments are
+    registered in ``registry``, so every app gets its own.
+    """
+
+    def __init__(self, prometheus_client, registry, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        Counter, Histogram, Gauge = (prometheus_client.Counter, prometheus_client.Histogram,
+                                     prometheus_client.Gauge)
+        self.requests = Counter(
+            'teos_http_requests_total', 'HTTP requests', ['blueprint', 'endpoint', 'method', 'status'],
+            registry=registry
+        )
+        self.latency = Histogram(
+            'teos_http_request_duration_seconds', 'HTTP request latency', ['blueprint', 'endpoint'],
+            buckets=LATENCY_BUCKETS, registry=registry
+        )
+        self.in_flight = Gauge(
+            'teos_http_requests_in_flight', 'HTTP requests being served', ['blueprint'],
+            multiprocess_mode='livesum', registry=registry
+        )
+        # Queries per request = teos_db_queries_total / teos_http_requests_total for an endpoint
+        self.queries = Counter(
+            'teos_db_queries_total', 'SQL statements executed (endpoint "background" outside requests)',
+            ['endpoint'], registry=registry
+        )
+        self.db_time = Histogram(
+            'teos_db_time_per_request_seconds', 'Time spent in SQL per request', ['endpoint'],
+            buckets=DB_TIME_BUCKETS, registry=registry
+        )
+        self.cache_lookups = Counter('teos_cache_lookups_total', 'Cache lookups', ['cache', 'result'],
+                                     registry=registry)
+        self.flush_interval = flush_interval
+        self.local = threading.local()
+        self._lock = threading.Lock()
+        self._in_flight = {}  # blueprint -> requests being served in this process
+        self._pending = {}
+        self._flusher_pid = None
+        self._stop = threading.Event()
+
+    def _observe(self, key, value):
+        # Caller holds the lock
+        values = self._pending.get(key)
+        if values is None:
+            self._pending[key] = [value]
+        else:
+            values.append(value)
+
+    def _add(self, key, amount=1):
+        # Caller holds the lock
+        self._pending[key] = self._pending.get(key, 0) + amount
+
+    def request_started(self, blueprint):
+        self._ensure_flusher()
+        with self._lock:
+            self._in_flight[blueprint] = self._in_flight.get(blueprint, 0) + 1
+
+    def request_finished(self, blueprint, endpoint, method, status, seconds, queries, db_seconds):
+        with self._lock:
+            self._in_flight[blueprint] -= 1
+            self._add(('requests', blueprint, endpoint, method, status))
+            self._observe(('latency', blueprint, endpoint), seconds)
+            self._observe(('db_time', endpoint), db_seconds)
+            if queries:
+                self._add(('queries', endpoint), queries)
+
+    def count(self, *key):
+        with self._lock:
+            self._add(key)
+
+    def flush(self):
+        """Move buffered samples into the Prometheus instruments"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            in_flight = dict(self._in_flight)
+
+        for key, value in pending.items():
+            kind, labels = key[0], key[1:]
+            if kind == 'requests':
+                self.requests.labels(*labels).inc(value)
+            elif kind == 'queries':
+                self.queries.labels(*labels).inc(value)
+            elif kind == 'cache':
+                self.cache_lookups.labels(*labels).inc(value)
+            else:
+                histogram = self.latency if kind == 'latency' else self.db_time
+                child = histogram.labels(*labels)
+                for sample in value:
+                    child.observe(sample)
+        for blueprint, count in in_flight.items():
+            self.in_flight.labels(blueprint).set(count)
+
+    def before_request(self):
+        req = request._get_current_object()
+        state = self.local
+        state.started = time.perf_counter()
+        state.queries = 0
+        state.db_time = 0.0
+        state.recorded = False
+        state.labels = (req.blueprint or 'app', req.endpoint or 'unmatched', req.method)
+        self.request_started(state.labels[0])
+
+    def _record(self, status):
+        state = self.local
+        if getattr(state, 'recorded', True):
+            return
+        state.recorded = True
+        blueprint, endpoint, method = state.labels
+        self.request_finished(blueprint, endpoint, method, status,
+                              time.perf_counter() - state.started, state.queries, state.db_time)
+
+    def after_request(self, response):
+        self._record(str(response.status_code))
+        return response
+
+    def teardown_request(self, error):
+        # after_request is skipped when a view raises; count those as 500s
+        self._record('500')
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.local.query_started = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        state = self.local
+        started = getattr(state, 'query_started', None)
+        if started is None:
+            return
+        state.query_started = None
+        if getattr(state, 'recorded', True):
+            # Outside a request (background jobs, workers)
+            self.count('queries', 'background')
+            return
+        state.queries += 1
+        state.db_time += time.perf_counter() - started
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing metrics: {str(e)}")
+
+    def _ensure_flusher(self):
+        # Started lazily, and again in each forked worker, which inherits no threads
+        pid = os.getpid()
+        if self._flusher_pid != pid:
+            with self._lock:
+                if self._flusher_pid != pid:
+                    self._flusher_pid = pid
+                    self._pending = {}
+                    self._in_flight = {}
+                    threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True).start()
+                    atexit.register(self.flush)
+
+
+def record_cache_lookup(cache, hit):
+    """Count a cache hit or miss for the current app; a no-op unless its metrics are enabled"""
+    metrics = current_app.extensions.get('metrics') if has_app_context() else None
+    if metrics is not None:
+        metrics.count('cache', cache, 'hit' if hit else 'miss')
+
+
+class PoolStatsCollector:
+    """Reads the PoolStats row at scrape time and exposes it as gauges"""
+
+    def __init__(self, app):
+        from prometheus_client.core import GaugeMetricFamily
+
+        self.app = app
+        self.GaugeMetricFamily = GaugeMetricFamily
+
+    def describe(self):
+        # Lets the registry learn the metric names without querying the database
+        return [self.GaugeMetricFamily(f'teos_pool_{field}', documentation)
+                for field, documentation in POOL_GAUGES]
+
+    def collect(self):
+        from src.models.contribution import db, PoolStats
+        from sqlalchemy import select
+
+        fields = [field for field, _ in POOL_GAUGES]
+        with self.app.app_context():
+            try:
+                row = db.session.execute(
+                    select(*(getattr(PoolStats, field) for field in fields)).limit(1)
+                ).first()
+            except Exception as e:
+                logger.error(f"Error reading pool stats for metrics: {str(e)}")
+                return
+            finally:
+                db.session.rollback()
+        if row is None:
+            return
+        for (field, documentation), value in zip(POOL_GAUGES, row):
+            gauge = self.GaugeMetricFamily(f'teos_pool_{field}', documentation)
+            gauge.add_metric([], (value or 0) / GAUGE_DIVISORS.get(field, 1))
+            yield gauge
+
+
+def init_metrics(app):
+    """Instrument requests and SQL and expose ``/metrics``; does nothing unless METRICS_ENABLED.
+
+    Under a pre-fork server set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+    directory shared by the workers. Each worker then writes its samples
+    to memory-mapped files there, and every scrape aggregates all of them
+    whichever worker answers it. Each app keeps its own registry and
+    instruments in ``app.extensions['metrics']``.
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return False
+
+    import prometheus_client
+    from prometheus_client import multiprocess
+    from sqlalchemy import event
+    from src.models.user import db
+
+    registry = prometheus_client.CollectorRegistry()
+    request_metrics = _RequestMetrics(
+        prometheus_client, registry,
+        flush_interval=app.config.get('METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+    )
+
+    app.before_request(request_metrics.before_request)
+    app.after_request(request_metrics.after_request)
+    app.teardown_request(request_metrics.teardown_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', request_metrics.before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', request_metrics.after_cursor_execute)
+
+    multiprocess_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiprocess_dir:
+        # Instruments write to the shared files; scrapes read every worker's files instead
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=multiprocess_dir)
+    else:
+        # What the default registry would have added
+        prometheus_client.ProcessCollector(registry=registry)
+        prometheus_client.PlatformCollector(registry=registry)
+        prometheus_client.GCCollector(registry=registry)
+    registry.register(PoolStatsCollector(app))
+    app.extensions['metrics'] = request_metrics
+
+    def metrics():
+        request_metrics.flush()
+        return Response(prometheus_client.generate_latest(registry),
+                        mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+    app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', metrics)
+    logger.info(f"Prometheus metrics enabled (multiprocess={'yes' if multiprocess_dir else 'no'})")
+    return True
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges; call from the server's child_exit hook"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,60 @@
+from src.models.contribution import db, PoolStats
+from src.models.amounts import LAMPORTS_PER_SOL, TEOS_BASE_UNITS
+from sqlalchemy import and_, case, update
+from datetime import datetime
+
+# Pool milestones
+TRADING_UNLOCK_THRESHOLD = 500
+SOL_UNLOCK_THRESHOLD = 10000
+
+# Every contribution is exactly 50 SOL for 10,000 TEOS, in base units
+CONTRIBUTION_LAMPORTS = 50 * LAMPORTS_PER_SOL
+CONTRIBUTION_TEOS_UNITS = 10000 * TEOS_BASE_UNITS
+
+
+def locked_share(lamports):
+    """Half of a lamport amount, truncated toward zero so a removal unlocks what its addition locked"""
+    return lamports // 2 if lamports >= 0 else -(-lamports // 2)
+
+
+def increment_verified_contributors(delta):
+    """Atomically add ``delta`` verified contributors and apply milestone unlocks.
+
+    Runs as a single UPDATE in the caller's transaction, so concurrent writers
+    can't lose increments the way read-modify-write on the ORM object can.
+    """
+    if not delta:
+        return 0
+    return apply_contribution_deltas(verified_contributors=delta)
+
+
+def apply_contribution_deltas(total_contributors=0, verified_contributors=0, sol_amount=0, teos_amount=0):
+    """Atomically add deltas to every pool counter and re-evaluate the milestones.
+
+    Amounts are base units. Half of ``sol_amount`` goes to the locked SOL,
+    as contribute() does.
+    Milestone unlocks are one-way: crossing a threshold sets its flag, and a
+    negative delta never clears one.
+    """
+    new_count = PoolStats.verified_contributors + verified_contributors
+    stmt = update(PoolStats).values(
+        total_contributors=PoolStats.total_contributors + total_contributors,
+        verified_contributors=new_count,
+        total_sol_contributed=PoolStats.total_sol_contributed + sol_amount,
+        total_teos_distributed=PoolStats.total_teos_distributed + teos_amount,
+        trading_unlocked=case(
+            (new_count >= TRADING_UNLOCK_THRESHOLD, True),
+            else_=PoolStats.trading_unlocked
+        ),
+        # SOL is released once, when the unlock milestone is first crossed
+        total_sol_locked=case(
+            (and_(new_count >= SOL_UNLOCK_THRESHOLD, PoolStats.sol_unlocked.is_not(True)), 0),
+            else_=PoolStats.total_sol_locked + locked_share(sol_amount)
+        ),
+        sol_unlocked=case(
+            (new_count >= SOL_UNLOCK_THRESHOLD, True),
+            else_=PoolStats.sol_unlocked
+        ),
+        updated_at=datetime.utcnow()
+    )
+    return db.session.execute(stmt).rowcount
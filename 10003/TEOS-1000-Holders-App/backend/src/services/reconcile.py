@@ -0,0 +1,203 @@
+from src.models.contribution import db, Contribution, PoolStats
+from src.services.pool_stats import TRADING_UNLOCK_THRESHOLD, SOL_UNLOCK_THRESHOLD, locked_share
+from sqlalchemy import case, func, select, update
+from datetime import datetime
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('total_contributors', 'verified_contributors', 'total_sol_contributed',
+                  'total_sol_locked', 'total_teos_distributed')
+
+
+def aggregate_contributions(created_after=None):
+    """Compute every pool counter input from contributions in one scan; amounts are base units"""
+    verified = case((Contribution.verified.is_(True), 1), else_=0)
+    query = select(
+        func.count(Contribution.id),
+        func.coalesce(func.sum(verified), 0),
+        func.coalesce(func.sum(Contribution.sol_amount), 0),
+        func.coalesce(func.sum(Contribution.teos_amount), 0)
+    )
+    if created_after is not None:
+        query = query.where(Contribution.created_at > created_after)
+    count, verified_count, sol, teos = db.session.execute(query).one()
+    return {
+        'total_contributors': int(count),
+        'verified_contributors': int(verified_count),
+        'total_sol_contributed': int(sol),
+        'total_teos_distributed': int(teos)
+    }
+
+
+def expected_stats(aggregates, stats):
+    """Derive the full PoolStats row implied by the contribution aggregates.
+
+    Milestone unlocks are one-way: a flag already set stays set, and a
+    threshold that has been reached must have its flag set.
+    """
+    verified = aggregates['verified_contributors']
+    trading_unlocked = bool(stats.trading_unlocked) or verified >= TRADING_UNLOCK_THRESHOLD
+    sol_unlocked = bool(stats.sol_unlocked) or verified >= SOL_UNLOCK_THRESHOLD
+    return {
+        **aggregates,
+        'total_sol_locked': 0 if sol_unlocked else locked_share(aggregates['total_sol_contributed']),
+        'trading_unlocked': trading_unlocked,
+        'sol_unlocked': sol_unlocked
+    }
+
+
+def diff_stats(stats, expected):
+    """Return {field: {stored, actual, delta}} for every drifted field"""
+    drift = {}
+    for field, actual in expected.items():
+        stored = getattr(stats, field)
+        if isinstance(actual, bool):
+            if bool(stored) != actual:
+                drift[field] = {'stored': bool(stored), 'actual': actual}
+        elif (stored or 0) != actual:
+            drift[field] = {'stored': stored, 'actual': actual, 'delta': actual - (stored or 0)}
+    return drift
+
+
+def reconcile_pool_stats(repair=False):
+    """Recompute pool counters from contributions and diff them against PoolStats.
+
+    With ``repair`` the drift is corrected by applying the deltas in a single
+    UPDATE, so increments made by concurrent writers between the scan and
+    the repair are preserved.
+    """
+    started = datetime.utcnow()
+    stats = PoolStats.query.first()
+    if stats is None:
+        stats = PoolStats(total_contributors=0, verified_contributors=0, total_sol_contributed=0,
+                          total_sol_locked=0, total_teos_distributed=0,
+                          trading_unlocked=False, sol_unlocked=False)
+        db.session.add(stats)
+        db.session.flush()
+
+    expected = expected_stats(aggregate_contributions(), stats)
+    drift = diff_stats(stats, expected)
+
+    repaired = False
+    if repair and drift:
+        values = {}
+        for field, change in drift.items():
+            column = getattr(PoolStats, field)
+            values[field] = change['actual'] if 'delta' not in change else column + change['delta']
+        values['updated_at'] = datetime.utcnow()
+        db.session.execute(update(PoolStats).where(PoolStats.id == stats.id).values(**values))
+        repaired = True
+        logger.warning(f"Pool stats drift repaired: {sorted(drift)}")
+    elif drift:
+        logger.warning(f"Pool stats drift detected: {sorted(drift)}")
+    db.session.commit()
+
+    return {
+        'mode': 'full',
+        'checked_at': started.isoformat(),
+        'in_sync': not drift,
+        'drift': drift,
+        'repaired': repaired,
+        'expected': expected
+    }
+
+
+def reconcile_job(job, repair=False):
+    """Job handler for ``POST /api/admin/pool/reconcile``"""
+    job.progress(phase='scanning')
+    return reconcile_pool_stats(repair=repair)
+
+
+class PoolStatsReconciler:
+    """Periodic drift check with a cheap high-water-mark mode.
+
+    A full run scans every contribution. Between full runs, the incremental
+    mode aggregates only rows whose ``updated_at`` is past the last run's
+    high-water mark and checks that the stored counters moved by exactly
+    that much. Any mismatch escalates to a full run. Deletions only show up
+    in full runs, which happen every ``full_every`` runs.
+    """
+
+    def __init__(self, app, interval=3600, repair=False, full_every=24):
+        self.app = app
+        self.interval = interval
+        self.repair = repair
+        self.full_every = full_every
+        self.last_report = None
+        self._high_water_mark = None
+        self._baseline = None
+        self._runs = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _snapshot(self):
+        stats = PoolStats.query.first()
+        return {field: getattr(stats, field) or 0 for field in ('total_contributors', 'verified_contributors',
+                                                                 'total_sol_contributed', 'total_teos_distributed')}
+
+    def _incremental(self, mark):
+        # Rows are new (created after the mark) or just verified (updated after the mark)
+        new = aggregate_contributions(created_after=mark)
+        newly_verified = db.session.execute(
+            select(func.count(Contribution.id)).where(
+                Contribution.updated_at > mark,
+                Contribution.created_at <= mark,
+                Contribution.verified.is_(True)
+            )
+        ).scalar()
+        expected_moves = {
+            'total_contributors': new['total_contributors'],
+            'verified_contributors': new['verified_contributors'] + newly_verified,
+            'total_sol_contributed': new['total_sol_contributed'],
+            'total_teos_distributed': new['total_teos_distributed']
+        }
+        current = self._snapshot()
+        mismatched = {
+            field: {'counter_moved': current[field] - self._baseline[field], 'rows_changed': moved}
+            for field, moved in expected_moves.items()
+            if current[field] - self._baseline[field] != moved
+        }
+        db.session.commit()
+        return current, mismatched
+
+    def run_once(self, force_full=False):
+        """Run one scheduled check inside an app context and return its report"""
+        with self.app.app_context():
+            mark = datetime.utcnow()
+            full = force_full or self._high_water_mark is None or self._runs % self.full_every == 0
+            report = None
+            if not full:
+                current, mismatched = self._incremental(self._high_water_mark)
+                if mismatched:
+                    logger.warning(f"Incremental pool check mismatch, escalating to full run: {sorted(mismatched)}")
+                    full = True
+                else:
+                    report = {'mode': 'incremental', 'checked_at': mark.isoformat(), 'in_sync': True,
+                              'since': self._high_water_mark.isoformat(), 'drift': {}, 'repaired': False}
+            if full:
+                report = reconcile_pool_stats(repair=self.repair)
+            self._baseline = self._snapshot()
+            db.session.commit()
+            self._high_water_mark = mark
+            self._runs += 1
+            self.last_report = report
+            return report
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error reconciling pool stats: {str(e)}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='pool-reconciler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
@@ -0,0 +1,300 @@
+from src.models.dialects import upsert_insert
+from src.models.engine import configure_sqlite
+from src.services.change_feed import TABLES, DEFAULT_BATCH_SIZE
+from sqlalchemy import create_engine, MetaData, Table, Column, String, Text, DateTime, select, delete
+from urllib.parse import urlsplit, urlencode
+from datetime import datetime
+import http.client
+import threading
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1.0
+FEED_PATH = '/api/admin/replication'
+
+# Replica bookkeeping lives in the copy itself, next to the rows it describes
+state_metadata = MetaData()
+replication_state = Table(
+    'replication_state', state_metadata,
+    Column('key', String(50), primary_key=True),
+    Column('value', Text, nullable=False),
+)
+
+
+class FeedError(Exception):
+    """Raised when the primary's change feed can't be reached or returns an error"""
+
+
+class FeedClient:
+    """Keep-alive HTTP client for the primary's /api/admin/replication endpoints"""
+
+    def __init__(self, base_url, token, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported primary URL scheme: {parts.scheme}')
+        self.base_url = base_url
+        self.timeout = timeout
+        self._https = parts.scheme == 'https'
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip('/') + FEED_PATH
+        self._headers = {'Authorization': f'Bearer {token}', 'Connection': 'keep-alive'}
+        self._conn = None
+
+    def get(self, path, **params):
+        # The primary may have closed an idle connection; retry once on a fresh one
+        for attempt in range(2):
+            if self._conn is None:
+                conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+                self._conn = conn_cls(self._host, self._port, timeout=self.timeout)
+            try:
+                self._conn.request('GET', f'{self._prefix}{path}?{urlencode(params)}', headers=self._headers)
+                response = self._conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                if attempt:
+                    raise FeedError(f'Primary unreachable: {str(e)}')
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise FeedError(f'HTTP {response.status} from primary')
+        if response.status != 200 or not payload.get('success'):
+            raise FeedError(payload.get('error') or f'HTTP {response.status} from primary')
+        return payload['data']
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _unique_columns(table):
+    """Single-column unique constraints other than the primary key"""
+    columns = [column for column in table.columns if column.unique]
+    columns += [list(index.columns)[0] for index in table.indexes if index.unique and len(index.columns) == 1]
+    return columns
+
+
+class Replica:
+    """Keeps a local copy of the replicated tables in step with a primary's change feed.
+
+    The cursor (last applied sequence number) is stored in the copy and
+    updated in the same transaction as each page of changes, so a replica
+    stopped at any point resumes where it left off. A new copy, or one
+    whose cursor fell behind the primary's retention, is seeded from table
+    snapshots first. The copy is a SQLite file in WAL mode, so the app's
+    read engine (DATABASE_READ_URL) can serve from it while pages apply.
+    """
+
+    def __init__(self, client, database_url, batch_size=DEFAULT_BATCH_SIZE):
+        self.client = client
+        self.batch_size = batch_size
+        self.engine = create_engine(database_url)
+        configure_sqlite(self.engine)
+        self.last_seq = None
+        self.head_seq = None
+        self.caught_up_at = None
+        self.totals = {'applied_changes': 0, 'snapshots': 0, 'errors': 0}
+        self._stop = threading.Event()
+        self._thread = None
+        self._datetime_columns = {
+            name: [column.name for column in table.columns if isinstance(column.type, DateTime)]
+            for name, table in TABLES.items()
+        }
+        self._unique_columns = {name: _unique_columns(table) for name, table in TABLES.items()}
+
+    def ensure_schema(self):
+        """Create the replicated tables (without capture triggers) and the cursor table"""
+        for table in TABLES.values():
+            table.create(self.engine, checkfirst=True)
+        replication_state.create(self.engine, checkfirst=True)
+        return self
+
+    def load_cursor(self):
+        with self.engine.connect() as conn:
+            value = conn.execute(
+                select(replication_state.c.value).where(replication_state.c.key == 'last_seq')
+            ).scalar()
+        return int(value) if value is not None else None
+
+    def _save_state(self, conn, **values):
+        insert = upsert_insert(self.engine.dialect.name)
+        stmt = insert(replication_state)
+        conn.execute(
+            stmt.on_conflict_do_update(index_elements=['key'], set_={'value': stmt.excluded.value}),
+            [{'key': key, 'value': str(value)} for key, value in values.items()]
+        )
+
+    def _decode(self, table_name, rows):
+        columns = self._datetime_columns[table_name]
+        for row in rows:
+            for name in columns:
+                if row[name] is not None:
+                    row[name] = datetime.fromisoformat(row[name])
+        return rows
+
+    def _upsert(self, conn, table_name, rows):
+        if not rows:
+            return
+        table = TABLES[table_name]
+        ids = [row['id'] for row in rows]
+        # A unique value may have moved to another row on the primary; that row's own
+        # change arrives later, so drop the stale local holder of the value now
+        for column in self._unique_columns[table_name]:
+            values = [row[column.name] for row in rows if row[column.name] is not None]
+            if values:
+                conn.execute(delete(table).where(column.in_(values), table.c.id.notin_(ids)))
+        stmt = upsert_insert(self.engine.dialect.name)(table)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={column.name: stmt.excluded[column.name] for column in table.columns if column.name != 'id'}
+        ), rows)
+
+    def snapshot(self):
+        """Copy every replicated table from the primary and return the sequence number to resume after.
+
+        The head sequence is read before the first page, so every change the
+        pages miss is replayed afterwards. Local rows absent from a page's id
+        range are deleted, which lets a resync run under a serving replica.
+        """
+        head = None
+        for table_name, table in TABLES.items():
+            after_id = 0
+            while True:
+                page = self.client.get(f'/snapshot/{table_name}', after_id=after_id, limit=self.batch_size)
+                if head is None:
+                    head = page['head_seq']
+                rows = self._decode(table_name, page['rows'])
+                with self.engine.begin() as conn:
+                    stale = delete(table).where(table.c.id > after_id, table.c.id.notin_([row['id'] for row in rows]))
+                    if not page['complete']:
+                        stale = stale.where(table.c.id <= page['next_after_id'])
+                    conn.execute(stale)
+                    self._upsert(conn, table_name, rows)
+                after_id = page['next_after_id']
+                if page['complete']:
+                    break
+        with self.engine.begin() as conn:
+            self._save_state(conn, last_seq=head, snapshot_at=datetime.utcnow().isoformat())
+        self.totals['snapshots'] += 1
+        logger.info(f"Replica seeded from snapshot; resuming after change {head}")
+        return head
+
+    def apply(self, page):
+        """Apply one page of changes and advance the cursor in a single transaction"""
+        touched = {}
+        for change in page['changes']:
+            touched.setdefault(change['table'], set()).add(change['row_id'])
+        rows = {name: self._decode(name, page['rows'].get(name, [])) for name in touched}
+        with self.engine.begin() as conn:
+            # Deletes first, so a unique value freed on the primary is free here too
+            for table_name, row_ids in touched.items():
+                gone = row_ids - {row['id'] for row in rows[table_name]}
+                if gone:
+                    table = TABLES[table_name]
+                    conn.execute(delete(table).where(table.c.id.in_(gone)))
+            for table_name, table_rows in rows.items():
+                self._upsert(conn, table_name, table_rows)
+            self._save_state(conn, last_seq=page['next_after'])
+        self.totals['applied_changes'] += len(page['changes'])
+
+    def run_once(self):
+        """Seed if needed, apply one page of changes and return the replication status"""
+        if self.last_seq is None:
+            self.last_seq = self.load_cursor()
+        if self.last_seq is None:
+            self.last_seq = self.snapshot()
+        page = self.client.get('/changes', after=self.last_seq, limit=self.batch_size)
+        if page['snapshot_required']:
+            logger.warning(f"Change log was pruned past {self.last_seq} (oldest {page['oldest_seq']}); resyncing")
+            self.last_seq = self.snapshot()
+        elif page['changes']:
+            self.apply(page)
+            self.last_seq = page['next_after']
+        self.head_seq = page['head_seq']
+        if self.last_seq >= self.head_seq:
+            self.caught_up_at = time.time()
+        return self.status()
+
+    def lag_changes(self):
+        if self.head_seq is None or self.last_seq is None:
+            return None
+        return max(self.head_seq - self.last_seq, 0)
+
+    def lag_seconds(self):
+        """Seconds since the replica last matched the primary's head; an upper bound on staleness"""
+        if self.caught_up_at is None:
+            return None
+        return max(time.time() - self.caught_up_at, 0.0)
+
+    def status(self):
+        lag_seconds = self.lag_seconds()
+        return {
+            'last_seq': self.last_seq,
+            'head_seq': self.head_seq,
+            'lag_changes': self.lag_changes(),
+            'lag_seconds': round(lag_seconds, 3) if lag_seconds is not None else None,
+            **self.totals
+        }
+
+    def start_metrics_server(self, port, addr='0.0.0.0'):
+        """Serve teos_replica_* gauges on ``port``; values are read at scrape time"""
+        import prometheus_client
+
+        registry = prometheus_client.CollectorRegistry()
+        gauges = (
+            ('teos_replica_last_applied_seq', 'Change sequence number applied last',
+             lambda: self.last_seq),
+            ('teos_replica_head_seq', 'Newest change sequence number on the primary at the last poll',
+             lambda: self.head_seq),
+            ('teos_replica_lag_changes', 'Changes on the primary not yet applied',
+             self.lag_changes),
+            ('teos_replica_lag_seconds', 'Seconds since the replica last matched the primary',
+             self.lag_seconds),
+            ('teos_replica_applied_changes', 'Changes applied by this process',
+             lambda: self.totals['applied_changes']),
+            ('teos_replica_snapshots', 'Snapshots taken by this process',
+             lambda: self.totals['snapshots']),
+            ('teos_replica_errors', 'Failed replication passes in this process',
+             lambda: self.totals['errors']),
+        )
+        for name, documentation, read in gauges:
+            gauge = prometheus_client.Gauge(name, documentation, registry=registry)
+            gauge.set_function(lambda read=read: float('nan') if read() is None else read())
+        prometheus_client.start_http_server(port, addr=addr, registry=registry)
+
+    def _loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                status = self.run_once()
+            except Exception as e:
+                self.totals['errors'] += 1
+                logger.error(f"Replication pass failed: {str(e)}")
+                self._stop.wait(interval)
+                continue
+            # Keep pulling pages without pausing while behind
+            if not status['lag_changes']:
+                self._stop.wait(interval)
+
+    def run(self, interval=DEFAULT_INTERVAL):
+        """Poll in the calling thread until ``stop``"""
+        self._stop.clear()
+        self._loop(interval)
+
+    def start(self, interval=DEFAULT_INTERVAL):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name='replica', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.client.close()
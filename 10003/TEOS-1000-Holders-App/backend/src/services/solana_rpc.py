@@ -0,0 +1,154 @@
+from urllib.parse import urlsplit
+import http.client
+import itertools
+import json
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPC_URL = 'https://api.mainnet-beta.solana.com'
+
+
+class RpcError(Exception):
+    """Raised when the RPC endpoint fails or returns an error object"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class SolanaRpcClient:
+    """Thread-safe JSON-RPC client with a pool of keep-alive connections.
+
+    Connections are reused across calls so each request costs one round trip
+    instead of a TCP (and TLS) handshake, and ``batch`` sends many calls in a
+    single HTTP request.
+    """
+
+    def __init__(self, url=DEFAULT_RPC_URL, pool_size=8, timeout=10.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported RPC URL scheme: {parts.scheme}')
+        self.url = url
+        self.timeout = timeout
+        self._https = parts.scheme == 'https'
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or '/'
+        if parts.query:
+            self._path += '?' + parts.query
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+
+    def _new_connection(self):
+        conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return conn_cls(self._host, self._port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _next_id(self):
+        with self._ids_lock:
+            return next(self._ids)
+
+    def _post(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request('POST', self._path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest,
+                    http.client.BadStatusLine) as e:
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise RpcError(f'RPC connection failed: {str(e)}')
+            except OSError as e:
+                conn.close()
+                raise RpcError(f'RPC request failed: {str(e)}')
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            if response.status != 200:
+                raise RpcError(f'RPC endpoint returned HTTP {response.status}', code=response.status)
+            try:
+                return json.loads(data)
+            except ValueError:
+                raise RpcError('RPC endpoint returned invalid JSON')
+
+    def call(self, method, params=None):
+        """Send a single JSON-RPC call and return its result"""
+        response = self._post({
+            'jsonrpc': '2.0',
+            'id': self._next_id(),
+            'method': method,
+            'params': params or []
+        })
+        if 'error' in response:
+            error = response['error']
+            raise RpcError(error.get('message', 'RPC error'), code=error.get('code'))
+        return response.get('result')
+
+    def batch(self, calls):
+        """Send (method, params) pairs in one HTTP request.
+
+        Returns a list aligned with ``calls`` holding each result, or an
+        ``RpcError`` instance for calls that failed individually.
+        """
+        if not calls:
+            return []
+        requests = []
+        for method, params in calls:
+            requests.append({
+                'jsonrpc': '2.0',
+                'id': self._next_id(),
+                'method': method,
+                'params': params or []
+            })
+        responses = self._post(requests)
+        if isinstance(responses, dict):
+            # Some endpoints answer a rejected batch with a single error object
+            error = responses.get('error') or {}
+            raise RpcError(error.get('message', 'RPC batch rejected'), code=error.get('code'))
+
+        by_id = {r.get('id'): r for r in responses}
+        results = []
+        for req in requests:
+            response = by_id.get(req['id'])
+            if response is None:
+                results.append(RpcError('Missing response in RPC batch'))
+            elif 'error' in response:
+                error = response['error']
+                results.append(RpcError(error.get('message', 'RPC error'), code=error.get('code')))
+            else:
+                results.append(response.get('result'))
+        return results
+
+    def close(self):
+        """Close every idle pooled connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
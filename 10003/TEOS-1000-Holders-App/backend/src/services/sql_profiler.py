@@ -0,0 +1,219 @@
+from flask import request, g
+from sqlalchemy import event
+from collections import deque, Counter
+import contextlib
+import itertools
+import threading
+import time
+import sys
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A statement shape seen this many times in one request is reported as a likely N+1
+DEFAULT_REPEAT_THRESHOLD = 5
+DEFAULT_HISTORY = 200
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SKIP_PATHS = (os.path.abspath(__file__), os.sep + 'sqlalchemy' + os.sep, os.sep + 'flask_sqlalchemy' + os.sep)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAMETER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by ``query_budget`` when a block runs more statements than allowed"""
+
+
+def statement_shape(statement):
+    """Normalize SQL so statements differing only in literals or IN-list length compare equal"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PARAMETER_LIST.sub('(?...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+def call_site():
+    """Return 'path:line function' of the innermost application frame issuing the query"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(_SOURCE_ROOT) and not any(skip in path for skip in _SKIP_PATHS):
+            return f'{os.path.relpath(path, _SOURCE_ROOT)}:{frame.f_lineno} {frame.f_code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, 'captures', None):
+        _local.started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    captures = getattr(_local, 'captures', None)
+    if not captures:
+        return
+    entry = {
+        'statement': statement,
+        'duration_ms': round((time.perf_counter() - _local.started) * 1000, 3),
+        'call_site': call_site(),
+        'executemany': executemany
+    }
+    for capture in captures:
+        capture.append(entry)
+
+
+def install(engine):
+    """Attach the statement recorder to an engine (idempotent)"""
+    if not event.contains(engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextlib.contextmanager
+def capture_queries():
+    """Collect the statements this thread executes inside the block into the yielded list"""
+    captured = []
+    if not hasattr(_local, 'captures'):
+        _local.captures = []
+    _local.captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _local.captures.remove(captured)
+
+
+@contextlib.contextmanager
+def query_budget(max_queries, engine=None):
+    """Fail with QueryBudgetExceeded if the block runs more than ``max_queries`` statements.
+
+    Meant for tests and CI checks around a test client call::
+
+        with query_budget(3):
+            client.get('/api/analytics/dashboard')
+
+    ``engine`` defaults to every engine of the current app, including the read engine.
+    """
+    if engine is None:
+        from src.models.user import db
+        engines = list(db.engines.values())
+    else:
+        engines = [engine]
+    for engine in engines:
+        install(engine)
+    with capture_queries() as captured:
+        yield captured
+    if len(captured) > max_queries:
+        raise QueryBudgetExceeded(
+            f'{len(captured)} queries exceed the budget of {max_queries}:\n' +
+            '\n'.join(f"  {q['call_site']}: {statement_shape(q['statement'])[:160]}" for q in captured)
+        )
+
+
+def summarize(queries, repeat_threshold=DEFAULT_REPEAT_THRESHOLD):
+    """Return totals and the statement shapes repeated at least ``repeat_threshold`` times"""
+    shapes = Counter()
+    sites = {}
+    for query in queries:
+        shape = statement_shape(query['statement'])
+        shapes[shape] += 1
+        sites.setdefault(shape, set()).add(query['call_site'])
+    repeated = [
+        {'shape': shape, 'count': count, 'call_sites': sorted(sites[shape])}
+        for shape, count in shapes.most_common() if count >= repeat_threshold
+    ]
+    return {
+        'query_count': len(queries),
+        'db_time_ms': round(sum(q['duration_ms'] for q in queries), 3),
+        'distinct_shapes': len(shapes),
+        'repeated_shapes': repeated
+    }
+
+
+class SqlProfiler:
+    """Records every statement per request and keeps the most recent profiles.
+
+    Adds ``X-Query-Count`` and ``X-DB-Time`` (milliseconds) to each response
+    and ``X-Query-Repeats`` when a statement shape repeats often enough to
+    look like an N+1; those requests are also logged with their call sites.
+    """
+
+    def __init__(self, repeat_threshold=DEFAULT_REPEAT_THRESHOLD, history=DEFAULT_HISTORY):
+        self.repeat_threshold = repeat_threshold
+        self.profiles = deque(maxlen=history)
+        self._ids = itertools.count(1)
+
+    def before_request(self):
+        g._sql_profile = capture_queries()
+        g._sql_queries = g._sql_profile.__enter__()
+
+    def after_request(self, response):
+        context = g.pop('_sql_profile', None)
+        if context is None:
+            return response
+        queries = g.pop('_sql_queries')
+        context.__exit__(None, None, None)
+
+        summary = summarize(queries, self.repeat_threshold)
+        response.headers['X-Query-Count'] = str(summary['query_count'])
+        response.headers['X-DB-Time'] = f"{summary['db_time_ms']:.3f}"
+        if summary['repeated_shapes']:
+            response.headers['X-Query-Repeats'] = str(len(summary['repeated_shapes']))
+            worst = summary['repeated_shapes'][0]
+            logger.warning(
+                f"Possible N+1 on {request.method} {request.path}: {worst['count']}x "
+                f"{worst['shape'][:160]} at {', '.join(worst['call_sites'])}"
+            )
+
+        self.profiles.append({
+            'id': next(self._ids),
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'timestamp': time.time(),
+            **summary,
+            'queries': queries
+        })
+        return response
+
+    def teardown_request(self, error):
+        # after_request is skipped when a view raises; don't leave the capture active
+        context = g.pop('_sql_profile', None)
+        if context is not None:
+            g.pop('_sql_queries', None)
+            context.__exit__(None, None, None)
+
+    def recent(self, limit=50, details=False):
+        profiles = list(self.profiles)[-limit:][::-1]
+        if details:
+            return profiles
+        return [{k: v for k, v in profile.items() if k != 'queries'} for profile in profiles]
+
+
+def init_sql_profiler(app):
+    """Profile every request's SQL when SQL_PROFILER_ENABLED is set; returns the profiler or None"""
+    if not app.config.get('SQL_PROFILER_ENABLED'):
+        return None
+
+    from src.models.user import db
+
+    profiler = SqlProfiler(
+        repeat_threshold=app.config.get('SQL_PROFILER_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD),
+        history=app.config.get('SQL_PROFILER_HISTORY', DEFAULT_HISTORY)
+    )
+    with app.app_context():
+        for engine in db.engines.values():
+            install(engine)
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
+    app.teardown_request(profiler.teardown_request)
+    app.extensions['sql_profiler'] = profiler
+    logger.warning("SQL profiler enabled; every statement is recorded per request")
+    return profiler
@@ -0,0 +1,132 @@
+from src.services.compression import DEFAULT_ENCODINGS, SUFFIXES, available_encodings, parse_encodings
+from flask import request, current_app
+from werkzeug.wsgi import wrap_file
+from datetime import datetime, timezone
+import mimetypes
+import os
+import re
+
+# Vite emits bundles as assets/<name>-<content hash>.<ext>: a new build gets new URLs,
+# so browsers and CDNs may keep these forever
+HASHED_ASSET = re.compile(r'(^|/)assets/[^/]+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Everything else (index.html above all) is revalidated against its ETag on each use
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024
+
+
+class StaticFile:
+    """One stored representation of an asset: the file itself or a precompressed copy"""
+
+    __slots__ = ('path', 'size', 'etag', 'body')
+
+    def __init__(self, path, stat, encoding=None):
+        self.path = path
+        self.size = stat.st_size
+        self.etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}' + (f'-{encoding}' if encoding else '')
+        self.body = None
+
+
+class StaticAsset:
+    __slots__ = ('mimetype', 'cache_control', 'last_modified', 'identity', 'variants', 'encodings')
+
+    def __init__(self, relative_path, identity, stat):
+        self.mimetype = mimetypes.guess_type(relative_path)[0] or 'application/octet-stream'
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.search(relative_path) else REVALIDATE_CACHE_CONTROL
+        self.last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+        self.identity = identity
+        self.variants = {}
+        self.encodings = ()
+
+
+class StaticManifest:
+    """Index of the static folder built once at startup.
+
+    Requests are answered from the index without touching the filesystem
+    for metadata: no ``exists`` or ``stat`` per request. Each file's
+    ``.zst``, ``.br`` and ``.gz`` siblings (written by
+    ``tools/precompress_static.py``) are served to clients that accept that
+    encoding, if they are newer than the file and smaller. Bodies up to
+    ``cache_max_bytes`` are kept in memory after their first request.
+    Unknown paths fall back to ``index.html`` for client-side routing.
+    Restart (or ``scan``) after deploying new assets.
+    """
+
+    def __init__(self, root, encodings=DEFAULT_ENCODINGS, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.root = root
+        self.encodings = available_encodings(encodings)
+        self.cache_max_bytes = cache_max_bytes
+        self.assets = {}
+        self.scan()
+
+    def scan(self):
+        assets = {}
+        suffixes = tuple(SUFFIXES.values())
+        for directory, _, filenames in os.walk(self.root):
+            names = set(filenames)
+            for name in filenames:
+                if name.endswith(suffixes) and os.path.splitext(name)[0] in names:
+                    continue
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                relative_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+                asset = StaticAsset(relative_path, StaticFile(path, stat), stat)
+                for encoding in self.encodings:
+                    sibling = name + SUFFIXES[encoding]
+                    if sibling not in names:
+                        continue
+                    sibling_stat = os.stat(path + SUFFIXES[encoding])
+                    if sibling_stat.st_mtime_ns >= stat.st_mtime_ns and sibling_stat.st_size < stat.st_size:
+                        asset.variants[encoding] = StaticFile(path + SUFFIXES[encoding], sibling_stat, encoding)
+                asset.encodings = tuple(encoding for encoding in self.encodings if encoding in asset.variants)
+                assets[relative_path] = asset
+        self.assets = assets
+        return self
+
+    @property
+    def index(self):
+        return self.assets.get('index.html')
+
+    def lookup(self, path):
+        """The asset for a URL path, the SPA index for unknown paths, or None without an index"""
+        return self.assets.get(path) or self.index
+
+    def _body(self, static_file):
+        if static_file.body is not None:
+            return static_file.body
+        if static_file.size > self.cache_max_bytes:
+            return wrap_file(request.environ, open(static_file.path, 'rb'))
+        with open(static_file.path, 'rb') as f:
+            static_file.body = f.read()
+        return static_file.body
+
+    def send(self, asset):
+        """Response for an asset in the best encoding the client accepts, honouring conditional and range requests"""
+        encoding = request.accept_encodings.best_match(asset.encodings) if asset.encodings else None
+        static_file = asset.variants[encoding] if encoding else asset.identity
+        response = current_app.response_class(
+            self._body(static_file), mimetype=asset.mimetype, direct_passthrough=True
+        )
+        response.content_length = static_file.size
+        response.set_etag(static_file.etag)
+        response.last_modified = asset.last_modified
+        response.headers['Cache-Control'] = asset.cache_control
+        if asset.encodings:
+            response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response.make_conditional(request, accept_ranges=True, complete_length=static_file.size)
+
+
+def init_static_manifest(app):
+    """Index the app's static folder; returns the manifest or None without a static folder"""
+    if app.static_folder is None or not os.path.isdir(app.static_folder):
+        return None
+    manifest = StaticManifest(
+        app.static_folder,
+        encodings=parse_encodings(app.config.get('COMPRESSION_ENCODINGS', ','.join(DEFAULT_ENCODINGS))),
+        cache_max_bytes=app.config.get('STATIC_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES)
+    )
+    app.extensions['static_manifest'] = manifest
+    return manifest
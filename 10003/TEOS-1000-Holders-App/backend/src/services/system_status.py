@@ -0,0 +1,138 @@
+from src.models.contribution import db, Contribution, Holder
+from src.models.user import User
+from src.services.metrics import record_cache_lookup
+from sqlalchemy import select, func, case, text
+from datetime import datetime
+import threading
+import time
+import os
+
+DEFAULT_COUNTS_TTL = 10.0
+
+
+def _count_with_verified(model, name):
+    """One-row subquery with (total, verified) of a table, counted in one scan"""
+    return select(
+        func.count().label('total'),
+        func.coalesce(func.sum(case((model.verified.is_(True), 1), else_=0)), 0).label('verified')
+    ).select_from(model).subquery(name)
+
+
+def entity_counts():
+    """Return row counts for the status page from a single SELECT"""
+    contributions = _count_with_verified(Contribution, 'contribution_counts')
+    holders = _count_with_verified(Holder, 'holder_counts')
+    users = select(func.count()).select_from(User).scalar_subquery()
+
+    # Each subquery is one row, so joining them is a cross join of single rows
+    row = db.session.execute(select(
+        contributions.c.total, contributions.c.verified, holders.c.total, holders.c.verified, users
+    ).select_from(contributions).join(holders, db.true())).one()
+    return {
+        'total_contributions': row[0],
+        'verified_contributions': row[1],
+        'total_holders': row[2],
+        'verified_holders': row[3],
+        'total_users': row[4]
+    }
+
+
+class CachedCounts:
+    """Serves ``entity_counts()`` from memory for ``ttl`` seconds.
+
+    Refreshes are single-flight: concurrent callers that find the entry
+    stale wait on the lock and reuse the result of the one that ran the
+    query, so a burst of status checks costs one aggregate query.
+    """
+
+    def __init__(self, ttl=DEFAULT_COUNTS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counts = None
+        self._computed_at = None
+        self._expires = 0.0
+
+    def get(self):
+        """Return (counts, computed_at datetime)"""
+        if time.monotonic() < self._expires:
+            record_cache_lookup('status_counts', True)
+            return self._counts, self._computed_at
+        with self._lock:
+            hit = time.monotonic() < self._expires
+            record_cache_lookup('status_counts', hit)
+            if not hit:
+                self._counts = entity_counts()
+                self._computed_at = datetime.utcnow()
+                self._expires = time.monotonic() + self.ttl
+            return self._counts, self._computed_at
+
+    def invalidate(self):
+        self._expires = 0.0
+
+
+def ping_database():
+    """Round-trip a trivial query and return its latency in milliseconds"""
+    started = time.perf_counter()
+    db.session.execute(text('SELECT 1'))
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def storage_metrics(engine):
+    """Return file, page and WAL metrics for a SQLite database, or the database size on PostgreSQL"""
+    if engine.dialect.name == 'postgresql':
+        return {
+            'dialect': 'postgresql',
+            'database_size_bytes': db.session.execute(text('SELECT pg_database_size(current_database())')).scalar()
+        }
+    if engine.dialect.name != 'sqlite':
+        return {'dialect': engine.dialect.name}
+
+    pragma = lambda name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+    page_size = pragma('page_size')
+    page_count = pragma('page_count')
+    freelist_count = pragma('freelist_count')
+    metrics = {
+        'dialect': 'sqlite',
+        'journal_mode': pragma('journal_mode'),
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': freelist_count,
+        'free_percent': round(freelist_count * 100.0 / page_count, 2) if page_count else 0.0
+    }
+
+    if engine.url.database and engine.url.database != ':memory:':
+        path = os.path.abspath(engine.url.database)
+        metrics['file_exists'] = os.path.exists(path)
+        metrics['file_size_bytes'] = _file_size(path)
+        metrics['wal_size_bytes'] = _file_size(path + '-wal')
+    return metrics
+
+
+def pool_metrics(engine):
+    """Return connection pool usage for an engine"""
+    pool = engine.pool
+    metrics = {'pool_class': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            metrics[name] = method()
+    return metrics
+
+
+def get_cached_counts():
+    """Return the status counts cache for the current app, creating it on first use"""
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    cache = app.extensions.get('status_counts')
+    if cache is None:
+        cache = CachedCounts(ttl=app.config.get('SYSTEM_STATUS_TTL', DEFAULT_COUNTS_TTL))
+        app.extensions['status_counts'] = cache
+    return cache
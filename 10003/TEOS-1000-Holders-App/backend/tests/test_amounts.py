@@ -0,0 +1,108 @@
+from src.main import create_app
+from src.models.amounts import LAMPORTS_PER_SOL, sol_to_lamports, teos_to_base_units
+from src.models.schema import AmountStorageError
+from src.models.change_log import change_capture_statements
+from tools.migrate_amounts import migrate, to_base_units
+import sqlite3
+import pytest
+
+# Amount columns as they were before the move to integer base units
+LEGACY_SCHEMA = """
+CREATE TABLE contributions (
+    id INTEGER PRIMARY KEY, wallet_address VARCHAR(44) NOT NULL UNIQUE, sol_amount FLOAT NOT NULL,
+    teos_amount FLOAT NOT NULL, transaction_hash VARCHAR(88), verified BOOLEAN,
+    created_at DATETIME, updated_at DATETIME
+);
+CREATE TABLE pool_stats (
+    id INTEGER PRIMARY KEY, total_contributors INTEGER, verified_contributors INTEGER,
+    total_sol_contributed FLOAT, total_sol_locked FLOAT, total_teos_distributed FLOAT,
+    trading_unlocked BOOLEAN, sol_unlocked BOOLEAN, updated_at DATETIME
+);
+CREATE TABLE holders (
+    id INTEGER PRIMARY KEY, wallet_address VARCHAR(44) NOT NULL UNIQUE, teos_balance FLOAT NOT NULL,
+    verified BOOLEAN, verification_method VARCHAR(50), created_at DATETIME, updated_at DATETIME
+);
+"""
+
+WALLET = '44PMwfFs4tfN4ujLy5xwpiGxQfa9abP5HFYtub8vgHXn'
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO contributions (wallet_address, sol_amount, teos_amount, verified) "
+                 "VALUES (?, 0.1, 10000.0, 1)", (WALLET,))
+    conn.execute("INSERT INTO holders (wallet_address, teos_balance, verified) VALUES (?, 1234.56, 0)", (WALLET,))
+    conn.execute("INSERT INTO pool_stats (total_contributors, verified_contributors, total_sol_contributed, "
+                 "total_sol_locked, total_teos_distributed) VALUES (1, 1, 17350.0, 8675.0, 10000.0)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_to_base_units_reads_floats_as_written():
+    assert to_base_units(0.1, LAMPORTS_PER_SOL) == 100_000_000
+    assert to_base_units(17350.0, LAMPORTS_PER_SOL) == 17_350_000_000_000
+    assert to_base_units(1234.56, LAMPORTS_PER_SOL) == 1_234_560_000_000
+    assert to_base_units(None, LAMPORTS_PER_SOL) is None
+
+
+def test_to_base_units_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        to_base_units(1e12, LAMPORTS_PER_SOL)
+
+
+def test_api_amounts_parse_exactly():
+    assert sol_to_lamports(0.1) == 100_000_000
+    assert teos_to_base_units('10000') == 10_000 * LAMPORTS_PER_SOL
+    for bad in ('abc', True, 'nan', 0.0000000001):
+        with pytest.raises(ValueError):
+            sol_to_lamports(bad)
+
+
+def test_migrate_amounts_converts_float_rows(legacy_db):
+    migrate(legacy_db)
+
+    conn = sqlite3.connect(legacy_db)
+    assert conn.execute('SELECT sol_amount, teos_amount FROM contributions').fetchone() == (
+        100_000_000, 10_000_000_000_000)
+    assert conn.execute('SELECT teos_balance FROM holders').fetchone() == (1_234_560_000_000,)
+    assert conn.execute(
+        'SELECT total_sol_contributed, total_sol_locked, total_teos_distributed FROM pool_stats'
+    ).fetchone() == (17_350_000_000_000, 8_675_000_000_000, 10_000_000_000_000)
+    types = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(contributions)')}
+    assert 'INT' in types['sol_amount'].upper()
+
+
+def test_migrate_amounts_dry_run_keeps_floats(legacy_db):
+    migrate(legacy_db, dry_run=True)
+
+    conn = sqlite3.connect(legacy_db)
+    assert conn.execute('SELECT sol_amount FROM contributions').fetchone() == (0.1,)
+
+
+def test_migrate_amounts_keeps_change_capture(legacy_db):
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("CREATE TABLE change_log (id INTEGER PRIMARY KEY AUTOINCREMENT, table_name VARCHAR(32), "
+                 "row_id INTEGER, operation VARCHAR(6), created_at DATETIME)")
+    for statement in change_capture_statements():
+        conn.execute(statement)
+    conn.commit()
+
+    migrate(legacy_db)
+
+    triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+    assert triggers == len(change_capture_statements())
+    conn.execute("UPDATE holders SET verified = 1")
+    conn.commit()
+    assert conn.execute("SELECT table_name, operation FROM change_log").fetchall() == [('holders', 'update')]
+
+
+def test_startup_refuses_float_amounts(legacy_db):
+    with pytest.raises(AmountStorageError):
+        create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{legacy_db}'})
+
+    migrate(legacy_db)
+    create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{legacy_db}'})
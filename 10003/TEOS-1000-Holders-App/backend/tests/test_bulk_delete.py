@@ -0,0 +1,86 @@
+from src.models.contribution import db, Contribution, PoolStats
+from src.services.bulk_delete import build_filters, bulk_delete_contributions, preview_bulk_delete
+from src.services.pool_stats import CONTRIBUTION_LAMPORTS, CONTRIBUTION_TEOS_UNITS, increment_verified_contributors
+from src.services.reconcile import reconcile_pool_stats
+from benchmarks.loadtest import synthetic_address
+from datetime import datetime, timedelta
+import pytest
+
+ROWS = 25
+
+
+@pytest.fixture
+def seeded(app):
+    """ROWS contributions; even ids are verified and odd ids are unverified and a week old"""
+    with app.app_context():
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Contribution), [{
+            'wallet_address': synthetic_address(f'delete-{i}'),
+            'sol_amount': CONTRIBUTION_LAMPORTS, 'teos_amount': CONTRIBUTION_TEOS_UNITS,
+            'verified': i % 2 == 0,
+            'created_at': now - timedelta(days=7 if i % 2 else 0)
+        } for i in range(ROWS)])
+        db.session.commit()
+        reconcile_pool_stats(repair=True)
+        yield
+
+
+def stats():
+    row = db.session.execute(db.select(PoolStats)).scalar_one()
+    return row.total_contributors, row.verified_contributors, row.total_sol_contributed, row.total_teos_distributed
+
+
+def test_preview_matches_delete(seeded):
+    conditions = build_filters(unverified_older_than_days=1)
+    preview = preview_bulk_delete(conditions)
+    totals = bulk_delete_contributions(conditions, chunk_size=4)
+
+    assert preview['deleted_count'] == totals['deleted_count'] == ROWS // 2
+    assert totals['verified_deleted'] == 0
+    assert totals['chunks'] == 3
+
+
+def test_counter_deltas_match_deleted_rows(seeded):
+    before = stats()
+    totals = bulk_delete_contributions(build_filters(contribution_ids=range(1, 11)), chunk_size=3)
+
+    assert totals['deleted_count'] == 10
+    assert totals['verified_deleted'] == 5
+    assert totals['sol_removed'] == 10 * CONTRIBUTION_LAMPORTS
+    assert stats() == (
+        before[0] - 10, before[1] - 5,
+        before[2] - 10 * CONTRIBUTION_LAMPORTS, before[3] - 10 * CONTRIBUTION_TEOS_UNITS
+    )
+    assert reconcile_pool_stats()['in_sync']
+
+
+def test_row_changed_after_selection_is_kept(seeded, monkeypatch):
+    conditions = build_filters(unverified_older_than_days=1)
+    original_execute = db.session.execute
+
+    def verify_first_match(statement, *args, **kwargs):
+        # Verify a matching row between the id SELECT and the DELETE of the first chunk
+        result = original_execute(statement, *args, **kwargs)
+        if statement.is_select and not getattr(verify_first_match, 'done', False):
+            verify_first_match.done = True
+            ids = result.scalars().all()
+            original_execute(db.update(Contribution).where(Contribution.id == ids[0]).values(verified=True))
+            increment_verified_contributors(1)
+            verify_first_match.kept = ids[0]
+            return original_execute(
+                db.select(Contribution.id).where(Contribution.id.in_(ids)).order_by(Contribution.id)
+            )
+        return result
+
+    monkeypatch.setattr(db.session, 'execute', verify_first_match)
+    totals = bulk_delete_contributions(conditions, chunk_size=4)
+    monkeypatch.undo()
+
+    assert totals['deleted_count'] == ROWS // 2 - 1
+    assert db.session.get(Contribution, verify_first_match.kept) is not None
+    assert reconcile_pool_stats()['in_sync']
+
+
+def test_filters_are_required():
+    with pytest.raises(ValueError):
+        build_filters()
@@ -0,0 +1,58 @@
+from conftest import ADMIN_HEADERS
+from src.models.contribution import db, Holder
+from benchmarks.loadtest import synthetic_address
+import json
+
+FIRST = synthetic_address('holder-1')
+SECOND = synthetic_address('holder-2')
+
+
+def import_csv(client, body, headers=ADMIN_HEADERS):
+    return client.post('/api/wallet/holders/import', data=body, content_type='text/csv', headers=headers)
+
+
+def holders(app):
+    with app.app_context():
+        return {h.wallet_address: h.to_dict() for h in db.session.execute(db.select(Holder)).scalars()}
+
+
+def test_import_requires_admin(client):
+    response = import_csv(client, f'wallet_address,teos_balance\n{FIRST},10\n', headers={})
+    assert response.status_code == 401
+
+
+def test_import_inserts_then_upserts(app, client):
+    response = import_csv(client, f'wallet_address,teos_balance\n{FIRST},10\n{SECOND},20.5\n')
+    assert response.status_code == 200
+    assert response.get_json()['data']['summary']['upserted'] == 2
+
+    response = import_csv(client, f'wallet_address,teos_balance,verification_method\n{FIRST},99,snapshot\n')
+    assert response.status_code == 200
+
+    rows = holders(app)
+    assert len(rows) == 2
+    assert rows[FIRST]['teos_balance'] == 99
+    assert rows[FIRST]['verification_method'] == 'snapshot'
+    assert rows[SECOND]['teos_balance'] == 20.5
+
+
+def test_import_rejects_bad_rows_only(app, client):
+    body = '\n'.join(json.dumps(row) for row in (
+        {'wallet_address': FIRST, 'teos_balance': 1},
+        {'wallet_address': 5, 'teos_balance': 1},
+        {'wallet_address': 'not-an-address', 'teos_balance': 1},
+        {'wallet_address': SECOND, 'teos_balance': 'lots'},
+    ))
+    response = client.post('/api/wallet/holders/import', data=body,
+                           content_type='application/x-ndjson', headers=ADMIN_HEADERS)
+    data = response.get_json()['data']
+
+    assert response.status_code == 200
+    assert data['summary']['upserted'] == 1
+    assert sorted(reject['line'] for reject in data['rejects']) == [2, 3, 4]
+    assert list(holders(app)) == [FIRST]
+
+
+def test_import_checks_csv_header(client):
+    response = import_csv(client, f'wallet_address\n{FIRST}\n')
+    assert response.status_code == 400
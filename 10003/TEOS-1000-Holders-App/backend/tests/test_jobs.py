@@ -0,0 +1,68 @@
+from conftest import ADMIN_HEADERS, wait_finished
+from src.models.user import db
+from src.models.job import Job
+from src.services.jobs import get_job_runner
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def runner(app):
+    with app.app_context():
+        runner = get_job_runner()
+        started = threading.Event()
+
+        def wait_for_cancel(job):
+            started.set()
+            while not job.cancelled():
+                time.sleep(0.01)
+            job.check_cancelled()
+
+        runner.register('wait', wait_for_cancel)
+        runner.started = started
+        yield runner
+
+
+def test_one_open_job_per_kind(runner):
+    first = runner.submit('wait')
+    assert first is not None
+    assert runner.submit('wait') is None
+
+    runner.cancel(first['job_id'])
+    assert wait_finished(runner, first['job_id'])['status'] == 'cancelled'
+    second = runner.submit('wait')
+    assert second is not None
+    runner.cancel(second['job_id'])
+    wait_finished(runner, second['job_id'])
+
+
+def test_open_job_index_rejects_a_second_open_row(runner):
+    now = datetime.utcnow()
+    row = dict(kind='wait', status='queued', params='{}', cancel_requested=False, created_at=now, updated_at=now)
+    with db.engine.begin() as conn:
+        conn.execute(Job.__table__.insert().values(id='a' * 12, **row))
+    with pytest.raises(IntegrityError):
+        with db.engine.begin() as conn:
+            conn.execute(Job.__table__.insert().values(id='b' * 12, **row))
+    assert runner.submit('wait') is None
+
+
+def test_cancel_running_job_through_api(app, runner):
+    client = app.test_client()
+    job = runner.submit('wait')
+    assert runner.started.wait(5)
+
+    response = client.post(f"/api/admin/jobs/{job['job_id']}/cancel", headers=ADMIN_HEADERS)
+    assert response.status_code == 202
+    assert wait_finished(runner, job['job_id'])['status'] == 'cancelled'
+
+    response = client.post(f"/api/admin/jobs/{job['job_id']}/cancel", headers=ADMIN_HEADERS)
+    assert response.status_code == 409
+
+
+def test_cancel_unknown_job(client):
+    response = client.post('/api/admin/jobs/missing/cancel', headers=ADMIN_HEADERS)
+    assert response.status_code == 404
@@ -0,0 +1,25 @@
+from conftest import ADMIN_HEADERS
+from src.services.sql_profiler import query_budget, QueryBudgetExceeded
+from tools.check_query_budgets import run_checks
+import os
+import json
+import pytest
+
+BUDGETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools', 'query_budgets.json')
+
+
+def test_endpoints_stay_within_query_budgets(tmp_path):
+    with open(BUDGETS) as f:
+        budgets = json.load(f)
+
+    results = run_checks(budgets, f"sqlite:///{tmp_path / 'budgets.db'}", rows=200, seed=1)
+
+    assert len(results) == len(budgets)
+    assert [result['error'] for result in results if not result['ok']] == []
+
+
+def test_query_budget_raises_when_exceeded(app, client):
+    with app.app_context():
+        with pytest.raises(QueryBudgetExceeded):
+            with query_budget(0):
+                client.get('/api/pool/stats', headers=ADMIN_HEADERS)
@@ -0,0 +1,112 @@
+from conftest import ADMIN_HEADERS, make_app, close_app, wait_finished
+from src.models.contribution import db
+from src.services.change_feed import TABLES
+from src.services.replication import Replica, FeedError, FEED_PATH
+from src.services.jobs import get_job_runner
+from benchmarks.loadtest import seed_database, synthetic_address
+from tools.migrate_wallet_storage import migrate
+from sqlalchemy import select
+import sqlite3
+import pytest
+
+
+class InProcessFeed:
+    """FeedClient stand-in that calls the primary app in-process"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path, **params):
+        response = self.client.get(FEED_PATH + path, query_string=params, headers=ADMIN_HEADERS)
+        payload = response.get_json()
+        if response.status_code != 200:
+            raise FeedError(payload.get('error'))
+        return payload['data']
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def primary(tmp_path):
+    app = make_app(tmp_path / 'primary.db', CHANGE_FEED_ENABLED=True)
+    with app.app_context():
+        seed_database(30, 1)
+    yield app
+    close_app(app)
+
+
+def catch_up(replica):
+    for _ in range(100):
+        status = replica.run_once()
+        if status['lag_changes'] == 0:
+            return status
+    raise AssertionError('Replica did not catch up')
+
+
+def table_contents(engine):
+    with engine.connect() as conn:
+        return {name: conn.execute(select(table).order_by(table.c.id)).all() for name, table in TABLES.items()}
+
+
+def assert_converged(primary, replica):
+    with primary.app_context():
+        expected = table_contents(db.engine)
+    assert table_contents(replica.engine) == expected
+
+
+def test_replica_converges(primary, tmp_path):
+    replica = Replica(InProcessFeed(primary), f"sqlite:///{tmp_path / 'replica.db'}", batch_size=7).ensure_schema()
+    catch_up(replica)
+    assert replica.totals['snapshots'] == 1
+    assert_converged(primary, replica)
+
+    client = primary.test_client()
+    new_wallet = synthetic_address('replica-new')
+    assert client.post('/api/contribute', json={'wallet_address': new_wallet, 'sol_amount': 50}).status_code == 201
+    assert client.post('/api/wallet/register-holder',
+                       json={'wallet_address': new_wallet, 'teos_balance': 42}).status_code in (200, 201)
+    response = client.post('/api/admin/contributions/bulk-delete', json={'contribution_ids': [1, 2, 3]},
+                           headers=ADMIN_HEADERS)
+    assert response.status_code == 202
+    with primary.app_context():
+        assert wait_finished(get_job_runner(), response.get_json()['data']['job_id'])['status'] == 'completed'
+
+    status = catch_up(replica)
+    assert status['applied_changes'] > 0
+    assert_converged(primary, replica)
+
+
+def test_replica_resumes_from_stored_cursor(primary, tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    first = Replica(InProcessFeed(primary), url).ensure_schema()
+    catch_up(first)
+    first.engine.dispose()
+
+    primary.test_client().post('/api/contribute', json={
+        'wallet_address': synthetic_address('replica-resume'), 'sol_amount': 50
+    })
+    second = Replica(InProcessFeed(primary), url).ensure_schema()
+    catch_up(second)
+    assert second.totals['snapshots'] == 0
+    assert_converged(primary, second)
+
+
+def test_storage_migration_keeps_change_capture(primary):
+    with primary.app_context():
+        path = db.engine.url.database
+        db.engine.dispose()
+
+    def trigger_count():
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+        finally:
+            conn.close()
+
+    before = trigger_count()
+    assert before == 9
+    migrate(path, 'blob')
+    assert trigger_count() == before
+    migrate(path, 'text')
+    assert trigger_count() == before
@@ -0,0 +1,39 @@
+"""Run the contribution confirmation worker outside the web process.
+
+Usage:
+    python tools/confirm_contributions.py            # poll forever
+    python tools/confirm_contributions.py --once     # single pass, print counters
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.services.confirmation import create_confirmation_worker
+import argparse
+import json
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Confirm pending contributions on-chain')
+    parser.add_argument('--once', action='store_true', help='Run a single pass and exit')
+    args = parser.parse_args()
+
+    worker = create_confirmation_worker(create_app())
+    if args.once:
+        print(json.dumps(worker.run_once(), indent=2))
+        return
+
+    worker.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        worker.stop()
+        print(json.dumps(worker.totals, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""Generate a synthetic contributions/holders dataset straight into SQLite.
+
+Every wallet becomes a holder and a share of them also contributed.
+Addresses and transaction signatures are valid base58 keys, holder
+balances follow a power law, and arrival times come in bursts. Output is
+reproducible for a given seed. Tables are created from the models with
+their indexes built after the load, and PoolStats is rebuilt from the
+loaded contributions with the same rules reconciliation uses.
+
+Usage:
+    python tools/generate_dataset.py --preset 1m --db /tmp/teos_1m.db
+    python tools/generate_dataset.py --wallets 250000 --seed 7 --db /tmp/teos.db --force
+    DATABASE_URL=sqlite:////tmp/teos_1m.db python src/main.py
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.types import BASE58_ALPHABET, set_storage_mode, get_storage_mode, STORAGE_MODES
+from src.models.amounts import LAMPORTS_PER_SOL, TEOS_BASE_UNITS
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import argparse
+import sqlite3
+import random
+import time
+
+PRESETS = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Amounts are written in integer base units, as the app stores them
+CONTRIBUTION_TEOS = 10000
+CONTRIBUTION_LAMPORTS = 50 * LAMPORTS_PER_SOL
+CONTRIBUTION_TEOS_UNITS = CONTRIBUTION_TEOS * TEOS_BASE_UNITS
+# Holder balances are drawn to a hundredth of a TEOS
+TEOS_CENT_UNITS = TEOS_BASE_UNITS // 100
+
+# Map every byte to a base58 digit; the slight bias toward the first 24 digits is fine for test data
+_BASE58_TABLE = bytes((BASE58_ALPHABET * 5)[:256], 'ascii')
+# A 44-digit address whose first digit is 2..H lies in [58**43, 17 * 58**43), i.e. exactly 32 bytes
+_ADDRESS_LEAD = BASE58_ALPHABET[1:17]
+# Likewise an 88-digit signature whose first digit is 2..5 is exactly 64 bytes
+_SIGNATURE_LEAD = BASE58_ALPHABET[1:5]
+
+
+class DatasetGenerator:
+    """Builds wallet rows in fixed-size batches.
+
+    Batch ``i`` draws from its own generator seeded with ``(seed, i)``, so
+    batches can be built in any order or in parallel and the output only
+    depends on the seed and batch size. Arrivals are a two-state process:
+    quiet periods with occasional bursts at ``burst_factor`` times the rate,
+    with the base gap scaled so ``wallets`` arrivals span roughly ``days``
+    days ending now.
+    """
+
+    def __init__(self, wallets, seed=1, days=180, batch_size=50000, contribution_ratio=0.6,
+                 verified_ratio=0.85, holder_verified_ratio=0.7, pareto_alpha=1.16, min_balance=100.0,
+                 max_balance=50_000_000.0, burst_factor=20.0, burst_start=0.0005, burst_end=0.002, blob=False):
+        self.wallets = wallets
+        self.seed = seed
+        self.batch_size = batch_size
+        self.contribution_ratio = contribution_ratio
+        self.verified_ratio = verified_ratio
+        self.holder_verified_ratio = holder_verified_ratio
+        self.pareto_alpha = pareto_alpha
+        self.min_balance = min_balance
+        self.max_balance = max_balance
+        self.burst_factor = burst_factor
+        self.burst_start = burst_start
+        self.burst_end = burst_end
+        self.blob = blob
+
+        # Share of arrivals inside bursts, from the stationary distribution of the two states
+        burst_share = burst_start / (burst_start + burst_end)
+        self.mean_gap = days * 86400.0 / max(wallets, 1)
+        self.base_gap = self.mean_gap / ((1 - burst_share) + burst_share / burst_factor)
+        self.start = datetime.utcnow().replace(microsecond=0) - timedelta(days=days)
+
+    @property
+    def batch_count(self):
+        return -(-self.wallets // self.batch_size)
+
+    @staticmethod
+    def _base58(rng, count, length, lead):
+        """``count`` random base58 strings of ``length`` digits with a leading digit from ``lead``"""
+        digits = rng.randbytes(count * length).translate(_BASE58_TABLE).decode('ascii')
+        leads = rng.randbytes(count).translate(bytes((lead * 256)[:256], 'ascii')).decode('ascii')
+        return [leads[i] + digits[i * length + 1:(i + 1) * length] for i in range(count)]
+
+    def batch(self, index):
+        """Return (contribution_rows, holder_rows) for batch ``index``, ready for executemany"""
+        rng = random.Random(f'{self.seed}:{index}')
+        random_, expovariate, pareto = rng.random, rng.expovariate, rng.paretovariate
+        count = min(self.batch_size, self.wallets - index * self.batch_size)
+
+        if self.blob:
+            # Raw keys; a non-zero first byte keeps the base58 form at 43-44 digits
+            raw = rng.randbytes(count * 32)
+            addresses = [bytes((raw[i * 32] | 1,)) + raw[i * 32 + 1:(i + 1) * 32] for i in range(count)]
+        else:
+            addresses = self._base58(rng, count, 44, _ADDRESS_LEAD)
+        contributes = [random_() < self.contribution_ratio for _ in range(count)]
+        signatures = iter(self._base58(rng, sum(contributes), 88, _SIGNATURE_LEAD))
+
+        clock = index * self.batch_size * self.mean_gap
+        quiet_gap, burst_gap = self.base_gap, self.base_gap / self.burst_factor
+        in_burst = False
+        days = {}  # day offset -> 'YYYY-MM-DD '
+        contributions, holders = [], []
+        for address, contributed in zip(addresses, contributes):
+            if in_burst:
+                clock += expovariate(1.0) * burst_gap
+                in_burst = random_() >= self.burst_end
+            else:
+                clock += expovariate(1.0) * quiet_gap
+                in_burst = random_() < self.burst_start
+            day, micros = divmod(int(clock * 1_000_000), 86_400_000_000)
+            prefix = days.get(day)
+            if prefix is None:
+                prefix = days[day] = (self.start + timedelta(days=day)).strftime('%Y-%m-%d ')
+            seconds, micros = divmod(micros, 1_000_000)
+            minutes, seconds = divmod(seconds, 60)
+            # SQLAlchemy's SQLite DateTime storage format
+            created = f'{prefix}{minutes // 60:02d}:{minutes % 60:02d}:{seconds:02d}.{micros:06d}'
+
+            tail = pareto(self.pareto_alpha)
+            if contributed:
+                # Contributors hold at least the TEOS their contribution paid out
+                verified = random_() < self.verified_ratio
+                balance = round(min(CONTRIBUTION_TEOS * tail, self.max_balance) * 100) * TEOS_CENT_UNITS
+                contributions.append((address, CONTRIBUTION_LAMPORTS, CONTRIBUTION_TEOS_UNITS, next(signatures),
+                                      verified, created, created))
+                holders.append((address, balance, verified, 'contribution', created, created))
+            else:
+                method = 'snapshot' if random_() < 0.5 else 'manual'
+                balance = round(min(self.min_balance * tail, self.max_balance) * 100) * TEOS_CENT_UNITS
+                holders.append((address, balance, random_() < self.holder_verified_ratio, method,
+                                created, created))
+        return contributions, holders
+
+    def batches(self, workers=1):
+        """Yield every batch in order, building them in ``workers`` processes when above 1"""
+        if workers <= 1:
+            for index in range(self.batch_count):
+                yield self.batch(index)
+            return
+        import multiprocessing
+        with multiprocessing.Pool(workers) as pool:
+            yield from pool.imap(self.batch, range(self.batch_count))
+
+
+def model_ddl():
+    """Return ({table: CREATE TABLE}, [CREATE INDEX ...]) for every model table"""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateTable, CreateIndex
+    from src.models.user import db
+    import src.models.contribution  # noqa: F401 registers the tables
+    import src.models.job  # noqa: F401
+
+    dialect = sqlite.dialect()
+    tables, indexes = {}, []
+    for table in db.metadata.sorted_tables:
+        tables[table.name] = str(CreateTable(table).compile(dialect=dialect))
+        indexes += [str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes]
+    return tables, indexes
+
+
+def rebuild_pool_stats(conn):
+    """Replace the pool_stats row with one derived from the contributions table"""
+    from src.services.reconcile import expected_stats
+
+    count, verified, sol, teos = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(verified), 0), COALESCE(SUM(sol_amount), 0), '
+        'COALESCE(SUM(teos_amount), 0) FROM contributions'
+    ).fetchone()
+    expected = expected_stats({
+        'total_contributors': count,
+        'verified_contributors': verified,
+        'total_sol_contributed': int(sol),
+        'total_teos_distributed': int(teos)
+    }, SimpleNamespace(trading_unlocked=False, sol_unlocked=False))
+    conn.execute('DELETE FROM pool_stats')
+    conn.execute(
+        'INSERT INTO pool_stats (total_contributors, verified_contributors, total_sol_contributed, '
+        'total_sol_locked, total_teos_distributed, trading_unlocked, sol_unlocked, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (expected['total_contributors'], expected['verified_contributors'], expected['total_sol_contributed'],
+         expected['total_sol_locked'], expected['total_teos_distributed'], expected['trading_unlocked'],
+         expected['sol_unlocked'], datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f'))
+    )
+    return expected
+
+
+def generate(args):
+    if os.path.exists(args.db):
+        if not args.force:
+            print(f'{args.db} already exists; pass --force to replace it')
+            sys.exit(1)
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+
+    set_storage_mode(args.storage)
+    tables, indexes = model_ddl()
+    generator = DatasetGenerator(
+        args.wallets, seed=args.seed, days=args.days, batch_size=args.batch_size,
+        contribution_ratio=args.contribution_ratio, verified_ratio=args.verified_ratio,
+        pareto_alpha=args.pareto_alpha, blob=args.storage == 'blob'
+    )
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    # Nothing to protect until the file is complete, so skip journaling and fsyncs during the load
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -262144')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    for statement in tables.values():
+        conn.execute(statement)
+
+    started = time.perf_counter()
+    rows = 0
+    conn.execute('BEGIN')
+    for contributions, holders in generator.batches(args.workers):
+        conn.executemany(
+            'INSERT INTO contributions (wallet_address, sol_amount, teos_amount, transaction_hash, verified, '
+            'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)', contributions
+        )
+        conn.executemany(
+            'INSERT INTO holders (wallet_address, teos_balance, verified, verification_method, created_at, '
+            'updated_at) VALUES (?, ?, ?, ?, ?, ?)', holders
+        )
+        rows += len(contributions) + len(holders)
+        elapsed = time.perf_counter() - started
+        print(f'\r{rows:,} rows ({rows / elapsed:,.0f} rows/s)', end='', flush=True)
+    load_seconds = time.perf_counter() - started
+
+    for statement in indexes:
+        conn.execute(statement)
+    stats = rebuild_pool_stats(conn)
+    conn.execute('COMMIT')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('ANALYZE')
+    conn.close()
+
+    total = time.perf_counter() - started
+    print(f'\rLoaded {rows:,} rows in {load_seconds:.1f}s ({rows / load_seconds:,.0f} rows/s); '
+          f'{total:.1f}s including indexes')
+    print(f"Pool stats: {stats['total_contributors']:,} contributors, "
+          f"{stats['verified_contributors']:,} verified, trading_unlocked={stats['trading_unlocked']}, "
+          f"sol_unlocked={stats['sol_unlocked']}")
+    print(f'Serve it with DATABASE_URL=sqlite:///{os.path.abspath(args.db)} WALLET_ADDRESS_STORAGE={args.storage}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic TEOS dataset')
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--preset', choices=sorted(PRESETS), help='10k, 1m or 10m wallets')
+    size.add_argument('--wallets', type=int)
+    parser.add_argument('--db', required=True, help='SQLite file to create')
+    parser.add_argument('--force', action='store_true', help='Replace an existing file')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--days', type=int, default=180, help='Span of the arrival timestamps')
+    parser.add_argument('--contribution-ratio', type=float, default=0.6,
+                        help='Share of wallets that also contributed')
+    parser.add_argument('--verified-ratio', type=float, default=0.85, help='Share of contributions verified')
+    parser.add_argument('--pareto-alpha', type=float, default=1.16,
+                        help='Holder balance tail; 1.16 puts ~80%% of the supply in ~20%% of wallets')
+    parser.add_argument('--storage', choices=STORAGE_MODES, default=get_storage_mode(),
+                        help='wallet_address column type (defaults to WALLET_ADDRESS_STORAGE)')
+    parser.add_argument('--batch-size', type=int, default=50000,
+                        help='Rows per generated batch; part of what makes a dataset reproducible')
+    parser.add_argument('--workers', type=int, default=max((os.cpu_count() or 1) - 1, 1),
+                        help='Processes building batches while the main process inserts')
+    args = parser.parse_args()
+    if args.preset:
+        args.wallets = PRESETS[args.preset]
+    generate(args)
+
+
+if __name__ == '__main__':
+    main()
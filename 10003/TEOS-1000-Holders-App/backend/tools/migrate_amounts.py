@@ -0,0 +1,136 @@
+"""Convert FLOAT SOL/TEOS amount columns to integer base units.
+
+Rebuilds the contributions, holders and pool_stats tables in a single
+transaction. Every amount is multiplied by 10^9 (lamports for SOL, base
+units for the 9-decimal TEOS mint) and rounded to the nearest unit, reading
+each float as its shortest decimal form so 0.1 SOL becomes exactly
+100000000 lamports. Stop the app first, migrate, then restart it.
+
+Usage:
+    python tools/migrate_amounts.py
+    python tools/migrate_amounts.py --db /path/to/app.db --dry-run
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.amounts import LAMPORTS_PER_SOL, TEOS_BASE_UNITS, MAX_BASE_UNITS
+from src.models.schema import AMOUNT_COLUMNS
+from src.models.types import set_storage_mode
+from src.models.change_log import has_change_capture, change_capture_statements
+from decimal import Decimal, ROUND_HALF_EVEN
+import argparse
+import sqlite3
+import time
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'database', 'app.db')
+
+SCALES = {
+    'sol_amount': LAMPORTS_PER_SOL,
+    'total_sol_contributed': LAMPORTS_PER_SOL,
+    'total_sol_locked': LAMPORTS_PER_SOL,
+    'teos_amount': TEOS_BASE_UNITS,
+    'teos_balance': TEOS_BASE_UNITS,
+    'total_teos_distributed': TEOS_BASE_UNITS,
+}
+
+
+def to_base_units(value, scale):
+    if value is None:
+        return None
+    units = int((Decimal(repr(float(value))) * scale).to_integral_value(rounding=ROUND_HALF_EVEN))
+    if abs(units) > MAX_BASE_UNITS:
+        raise ValueError(f'{value} does not fit a 64-bit base unit column')
+    return units
+
+
+def column_types(conn, table):
+    return {row[1]: row[2].upper() for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def table_ddl(table_name):
+    """Return CREATE TABLE/INDEX statements for a model table with integer amounts"""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateTable, CreateIndex
+    from src.models.contribution import Contribution, Holder, PoolStats
+
+    table = {'contributions': Contribution, 'holders': Holder, 'pool_stats': PoolStats}[table_name].__table__
+    dialect = sqlite.dialect()
+    statements = [str(CreateTable(table).compile(dialect=dialect))]
+    statements += [str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes]
+    return statements
+
+
+def migrate(db_path, dry_run=False):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.create_function('to_base_units', 2, to_base_units, deterministic=True)
+
+    pending = {}
+    for table, names in AMOUNT_COLUMNS.items():
+        types = column_types(conn, table)
+        floats = [name for name in names if name in types and 'INT' not in types[name]]
+        if floats:
+            pending[table] = list(types)
+
+    if not pending:
+        print('Nothing to do: amounts already stored as integer base units')
+        return
+
+    # Keep the wallet_address columns in whatever storage mode they are in now
+    address_type = column_types(conn, 'contributions').get('wallet_address', '')
+    set_storage_mode('blob' if 'BLOB' in address_type else 'text')
+
+    # Dropping the old tables drops their triggers too, so capture is reinstalled below
+    capture = has_change_capture(conn)
+
+    started = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for table, columns in pending.items():
+            old = f'{table}_pre_migration'
+            # Index names are global in SQLite, so drop named indexes before the rename
+            for (index_name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            ).fetchall():
+                conn.execute(f'DROP INDEX {index_name}')
+            conn.execute(f'ALTER TABLE {table} RENAME TO {old}')
+            for statement in table_ddl(table):
+                conn.execute(statement)
+            select_list = ', '.join(
+                f'to_base_units({column}, {SCALES[column]})' if column in SCALES else column
+                for column in columns
+            )
+            conn.execute(f'INSERT INTO {table} ({", ".join(columns)}) SELECT {select_list} FROM {old}')
+            conn.execute(f'DROP TABLE {old}')
+            rows = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            print(f'Migrated {table} ({rows} rows) to integer base units')
+        if capture:
+            for statement in change_capture_statements():
+                conn.execute(statement)
+            print('Reinstalled change capture triggers')
+        if dry_run:
+            conn.execute('ROLLBACK')
+            print('Dry run: rolled back')
+            return
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+    conn.execute('VACUUM')
+    conn.close()
+    print(f'Done in {time.perf_counter() - started:.1f}s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate SOL/TEOS amounts to integer base units')
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--dry-run', action='store_true', help='Convert inside a transaction, then roll back')
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Convert wallet_address columns between base58 text and 32-byte BLOB storage.
+
+Rebuilds the contributions and holders tables in a single transaction. Stop
+the app first, migrate, then restart it with WALLET_ADDRESS_STORAGE set to
+the new mode.
+
+Usage:
+    python tools/migrate_wallet_storage.py --to blob
+    python tools/migrate_wallet_storage.py --to text --db /path/to/app.db
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.types import set_storage_mode, decode_address, b58encode
+from src.models.change_log import has_change_capture, change_capture_statements
+import argparse
+import sqlite3
+import time
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'database', 'app.db')
+
+TABLES = ('contributions', 'holders')
+
+
+def current_mode(conn, table):
+    for row in conn.execute(f'PRAGMA table_info({table})'):
+        if row[1] == 'wallet_address':
+            return 'blob' if 'BLOB' in row[2].upper() else 'text'
+    return None
+
+
+def to_blob(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return decode_address(value)
+
+
+def to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return b58encode(value)
+
+
+def table_ddl(table_name):
+    """Return CREATE TABLE/INDEX statements for a model table in the target mode"""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateTable, CreateIndex
+    from src.models.contribution import Contribution, Holder
+
+    table = {'contributions': Contribution, 'holders': Holder}[table_name].__table__
+    dialect = sqlite.dialect()
+    statements = [str(CreateTable(table).compile(dialect=dialect))]
+    statements += [str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes]
+    return statements
+
+
+def invalid_addresses(conn, table, limit=10):
+    bad = []
+    for row_id, address in conn.execute(f'SELECT id, wallet_address FROM {table}'):
+        if isinstance(address, bytes):
+            continue
+        try:
+            decode_address(address)
+        except ValueError:
+            bad.append((row_id, address))
+            if len(bad) >= limit:
+                break
+    return bad
+
+
+def migrate(db_path, target):
+    set_storage_mode(target)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.create_function('convert_address', 1, to_blob if target == 'blob' else to_text, deterministic=True)
+
+    pending = [t for t in TABLES if current_mode(conn, t) not in (None, target)]
+    if not pending:
+        print(f'Nothing to do: wallet addresses already stored as {target}')
+        return
+
+    if target == 'blob':
+        for table in pending:
+            bad = invalid_addresses(conn, table)
+            if bad:
+                print(f'Aborting: {table} has addresses that are not 32-byte base58 keys, e.g. {bad}')
+                sys.exit(1)
+
+    # Dropping the old tables drops their triggers too, so capture is reinstalled below
+    capture = has_change_capture(conn)
+
+    started = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for table in pending:
+            old = f'{table}_pre_migration'
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+            # Index names are global in SQLite, so drop named indexes before the rename
+            for (index_name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            ).fetchall():
+                conn.execute(f'DROP INDEX {index_name}')
+            conn.execute(f'ALTER TABLE {table} RENAME TO {old}')
+            for statement in table_ddl(table):
+                conn.execute(statement)
+            select_list = ', '.join(
+                'convert_address(wallet_address)' if column == 'wallet_address' else column
+                for column in columns
+            )
+            conn.execute(f'INSERT INTO {table} ({", ".join(columns)}) SELECT {select_list} FROM {old}')
+            conn.execute(f'DROP TABLE {old}')
+            print(f'Migrated {table} to {target} storage')
+        if capture:
+            for statement in change_capture_statements():
+                conn.execute(statement)
+            print('Reinstalled change capture triggers')
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+    conn.execute('VACUUM')
+    conn.close()
+    print(f'Done in {time.perf_counter() - started:.1f}s; restart the app with WALLET_ADDRESS_STORAGE={target}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate wallet address storage')
+    parser.add_argument('--to', choices=('blob', 'text'), required=True)
+    parser.add_argument('--db', default=DEFAULT_DB)
+    args = parser.parse_args()
+    migrate(args.db, args.to)
+
+
+if __name__ == '__main__':
+    main()
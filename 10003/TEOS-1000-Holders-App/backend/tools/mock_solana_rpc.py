@@ -0,0 +1,191 @@
+"""Local stand-in for a Solana JSON-RPC endpoint.
+
+Answers deterministically per address (derived from a hash of the input) so
+tests and benchmarks are reproducible without network access. Supports
+single and batched requests over keep-alive HTTP/1.1 connections.
+
+Usage:
+    python tools/mock_solana_rpc.py --port 8899 --latency-ms 50
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import hashlib
+import json
+import threading
+import time
+
+# Fixed reference time so generated block times don't drift between runs
+REFERENCE_TIME = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def _seed(value):
+    return int.from_bytes(hashlib.sha256(value.encode('utf-8')).digest()[:8], 'big')
+
+
+def get_account_info(address):
+    seed = _seed(address)
+    # Roughly one address in eight has never been funded
+    if seed % 8 == 0:
+        return {'context': {'slot': 1}, 'value': None}
+    return {
+        'context': {'slot': 1},
+        'value': {
+            'lamports': seed % 5_000_000_000,
+            'owner': '11111111111111111111111111111111',
+            'data': ['', 'base64'],
+            'executable': False,
+            'rentEpoch': 0
+        }
+    }
+
+
+def get_signatures_for_address(address, limit=1000):
+    seed = _seed(address)
+    count = min(seed % 120, limit)
+    age_days = (seed >> 8) % 365
+    signatures = []
+    for i in range(count):
+        signatures.append({
+            'signature': f'{address[:16]}{i:08d}',
+            'slot': 1000 + i,
+            'err': None if (seed >> (i % 48)) % 17 else {'InstructionError': [0, 'Custom']},
+            'memo': None,
+            'blockTime': REFERENCE_TIME - int(age_days * 86400 * (count - i) / max(count, 1))
+        })
+    return signatures
+
+
+def get_signature_statuses(signatures):
+    statuses = []
+    for signature in signatures:
+        seed = _seed(signature)
+        # ~5% not found yet, ~5% failed on-chain, the rest confirmed or finalized
+        if seed % 20 == 0:
+            statuses.append(None)
+            continue
+        statuses.append({
+            'slot': 1000 + seed % 1000,
+            'confirmations': None if seed % 3 else 10,
+            'err': {'InstructionError': [0, 'Custom']} if seed % 20 == 1 else None,
+            'confirmationStatus': 'finalized' if seed % 3 else 'confirmed'
+        })
+    return {'context': {'slot': 2000}, 'value': statuses}
+
+
+METHODS = {
+    'getHealth': lambda params: 'ok',
+    'getAccountInfo': lambda params: get_account_info(params[0]),
+    'getSignaturesForAddress': lambda params: get_signatures_for_address(
+        params[0], (params[1] if len(params) > 1 else {}).get('limit', 1000)
+    ),
+    'getSignatureStatuses': lambda params: get_signature_statuses(params[0][:256]),
+}
+
+
+def handle_call(call):
+    method = METHODS.get(call.get('method'))
+    if method is None:
+        return {'jsonrpc': '2.0', 'id': call.get('id'),
+                'error': {'code': -32601, 'message': 'Method not found'}}
+    try:
+        result = method(call.get('params') or [])
+    except (IndexError, TypeError, AttributeError):
+        return {'jsonrpc': '2.0', 'id': call.get('id'),
+                'error': {'code': -32602, 'message': 'Invalid params'}}
+    return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': result}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError:
+            payload = None
+
+        latency = self.server.latency
+        if latency:
+            time.sleep(latency)
+
+        if isinstance(payload, list):
+            self.server.count_request(len(payload))
+            response = [handle_call(call) for call in payload]
+        elif isinstance(payload, dict):
+            self.server.count_request(1)
+            response = handle_call(payload)
+        else:
+            response = {'jsonrpc': '2.0', 'id': None,
+                        'error': {'code': -32700, 'message': 'Parse error'}}
+
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockSolanaRpcServer(ThreadingHTTPServer):
+    """Threaded mock RPC server; use as a context manager in tests"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0):
+        super().__init__((host, port), _Handler)
+        self.latency = latency_ms / 1000.0
+        self.http_requests = 0
+        self.rpc_calls = 0
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def count_request(self, calls):
+        with self._stats_lock:
+            self.http_requests += 1
+            self.rpc_calls += calls
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock Solana JSON-RPC server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='Artificial delay added to every HTTP request')
+    args = parser.parse_args()
+
+    server = MockSolanaRpcServer(args.host, args.port, args.latency_ms)
+    print(f'Mock Solana RPC listening on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
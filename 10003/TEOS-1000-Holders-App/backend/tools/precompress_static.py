@@ -0,0 +1,89 @@
+"""Write .zst, .br and .gz copies of the static files, for the app to serve as they are.
+
+Run after copying a frontend build into ``src/static`` (``vite build``
+output) and before starting the app; the app indexes the copies at
+startup. Each compressible file of at least ``--min-size`` bytes gets one
+copy per encoding at the highest level, written only when missing or older
+than the file. Copies that don't shrink the file are removed.
+
+Usage:
+    python tools/precompress_static.py                     # src/static
+    python tools/precompress_static.py --root /srv/teos/static --encodings br,gzip
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.compression import (
+    DEFAULT_ENCODINGS, STATIC_LEVELS, SUFFIXES, available_encodings, compress, is_compressible, parse_encodings
+)
+import mimetypes
+import argparse
+import json
+import time
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'static')
+DEFAULT_MIN_SIZE = 256
+
+
+def precompress(root, encodings, min_size=DEFAULT_MIN_SIZE):
+    summary = {'files': 0, 'written': 0, 'up_to_date': 0, 'removed': 0, 'bytes': {}, 'compressed_bytes': {}}
+    suffixes = tuple(SUFFIXES.values())
+    for directory, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(suffixes):
+                continue
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            if stat.st_size < min_size or not is_compressible(mimetypes.guess_type(name)[0]):
+                continue
+            summary['files'] += 1
+            data = None
+            for encoding in encodings:
+                target = path + SUFFIXES[encoding]
+                summary['bytes'][encoding] = summary['bytes'].get(encoding, 0) + stat.st_size
+                if os.path.exists(target) and os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                    summary['up_to_date'] += 1
+                    summary['compressed_bytes'][encoding] = (summary['compressed_bytes'].get(encoding, 0)
+                                                             + os.path.getsize(target))
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                compressed = compress(data, encoding, STATIC_LEVELS[encoding])
+                if len(compressed) >= len(data):
+                    if os.path.exists(target):
+                        os.remove(target)
+                        summary['removed'] += 1
+                    summary['compressed_bytes'][encoding] = summary['compressed_bytes'].get(encoding, 0) + len(data)
+                    continue
+                # Write beside the target and rename, so a running app never reads a partial copy
+                with open(target + '.tmp', 'wb') as f:
+                    f.write(compressed)
+                os.replace(target + '.tmp', target)
+                summary['written'] += 1
+                summary['compressed_bytes'][encoding] = summary['compressed_bytes'].get(encoding, 0) + len(compressed)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompress static files for the app to serve')
+    parser.add_argument('--root', default=DEFAULT_ROOT, help='Static folder (default: src/static)')
+    parser.add_argument('--encodings', type=parse_encodings, default=list(DEFAULT_ENCODINGS),
+                        help='Comma-separated encodings (default: zstd,br,gzip)')
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE, help='Skip files smaller than this')
+    args = parser.parse_args()
+
+    encodings = available_encodings(args.encodings)
+    missing = set(args.encodings) - set(encodings)
+    if missing:
+        print(f"Skipping {', '.join(sorted(missing))}: library not installed", file=sys.stderr)
+    started = time.perf_counter()
+    summary = precompress(args.root, encodings, args.min_size)
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
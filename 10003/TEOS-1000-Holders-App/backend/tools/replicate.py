@@ -0,0 +1,62 @@
+"""Keep a local read-only copy of a primary's contributions, holders and pool stats.
+
+The primary must run with CHANGE_FEED_ENABLED=true (and ``flask --app
+src.main init-db`` after enabling it, to install the capture triggers). The
+copy is seeded from snapshots, then tails /api/admin/replication/changes.
+Its cursor is stored in the copy, so the process can be stopped and
+restarted at any time. Serve read-only routes from the copy with
+``DATABASE_READ_URL=sqlite:////path/to/replica.db``.
+
+Usage:
+    python tools/replicate.py --primary http://10.0.0.5:5000 --db /var/lib/teos/replica.db --metrics-port 9102
+    python tools/replicate.py --primary http://127.0.0.1:5000 --db replica.db --once   # one page, print status
+    python tools/replicate.py --primary http://127.0.0.1:5000 --db replica.db --resync # re-seed, then tail
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.replication import FeedClient, Replica, DEFAULT_INTERVAL
+from src.services.change_feed import DEFAULT_BATCH_SIZE
+import argparse
+import logging
+import signal
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replicate the primary into a local read-only copy')
+    parser.add_argument('--primary', required=True, help='Base URL of the primary, e.g. http://10.0.0.5:5000')
+    parser.add_argument('--db', required=True, help='SQLite file of the local copy (created if missing)')
+    parser.add_argument('--token', default=os.environ.get('ADMIN_TOKEN', 'admin_secret_token_2025'),
+                        help='Admin token for the primary (default: $ADMIN_TOKEN)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help='Seconds between polls once caught up')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Changes or rows per request')
+    parser.add_argument('--metrics-port', type=int, help='Serve teos_replica_* Prometheus gauges on this port')
+    parser.add_argument('--once', action='store_true', help='Apply a single page and exit')
+    parser.add_argument('--resync', action='store_true', help='Re-seed from snapshots before tailing')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    replica = Replica(FeedClient(args.primary, args.token), f'sqlite:///{os.path.abspath(args.db)}',
+                      batch_size=args.batch_size).ensure_schema()
+    if args.resync:
+        replica.last_seq = replica.snapshot()
+    if args.once:
+        print(json.dumps(replica.run_once(), indent=2))
+        return
+
+    if args.metrics_port:
+        replica.start_metrics_server(args.metrics_port)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        replica.run(args.interval)
+    except KeyboardInterrupt:
+        replica.stop()
+        print(json.dumps(replica.status(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Restore the database from an incremental backup point.
+
+Rebuilds the database as it was at a recorded point into --output. Each page
+is written once, from the newest delta that contains it, so a restore costs
+about one pass over the database regardless of how long the chain is. Stop
+the app and move the output over app.db to complete the restore.
+
+Usage:
+    python tools/restore_backup.py --list
+    python tools/restore_backup.py --point 20250125_120000_ab12cd --output restored.db
+    python tools/restore_backup.py --point 2025-01-25T12:30:00 --output restored.db
+"""
+import os
+import sys
+# Make the backend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.incremental_backup import IncrementalBackupStore
+from src.services.backup import integrity_check
+import argparse
+import json
+import time
+
+DEFAULT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'backups', 'incremental'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Restore from incremental backups')
+    parser.add_argument('--dir', default=DEFAULT_DIR, help='Incremental backup directory')
+    parser.add_argument('--list', action='store_true', help='List recorded points')
+    parser.add_argument('--point', help='Backup id or ISO timestamp to restore')
+    parser.add_argument('--output', help='Path of the restored database')
+    args = parser.parse_args()
+
+    store = IncrementalBackupStore(args.dir)
+    if args.list:
+        for manifest in store.manifests():
+            print(f"{manifest['backup_id']}  {manifest['created_at']}  {manifest['type']:<11}  "
+                  f"{manifest['changed_pages']}/{manifest['page_count']} pages")
+        return
+
+    if not args.point or not args.output:
+        parser.error('--point and --output are required to restore')
+    if os.path.exists(args.output):
+        parser.error(f'{args.output} already exists')
+
+    started = time.perf_counter()
+    manifest = store.restore(args.point, args.output)
+    problems = integrity_check(args.output)
+    print(json.dumps({
+        'restored_point': manifest['backup_id'],
+        'created_at': manifest['created_at'],
+        'chain_length': manifest['chain_length'],
+        'database_bytes': manifest['database_bytes'],
+        'seconds': round(time.perf_counter() - started, 3),
+        'integrity': 'ok' if not problems else problems[:5]
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()